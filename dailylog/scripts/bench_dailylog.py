@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+데일리로그 성능 측정 스크립트
+
+합성 Vault(N년, 하루 M개 항목, 한글 문장, [[링크]], 월/주차 헤더)를 임시 폴더에 생성하고
+dailylog.py의 주요 경로(parse_dailylog, DailylogDocument, insert_item, add_item, read_entries,
+generate_summary)를 여러 크기에서 측정한다. 결과는 측정 한 건당 JSON 한 줄로 출력한다.
+
+사용법:
+    uv run scripts/bench_dailylog.py
+    uv run scripts/bench_dailylog.py --sizes 1x4,5x8,10x8 --repeat 7
+    uv run scripts/bench_dailylog.py --output bench.jsonl     # 파일에 이어 쓰기 (추이 추적용)
+    uv run scripts/bench_dailylog.py --keep /tmp/vault        # 생성한 Vault 보존
+"""
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import dailylog
+
+# 합성 항목 문장 재료
+SUBJECTS = ["주간 회의", "코드 리뷰", "배포 준비", "운동", "독서", "장보기", "기획 문서", "고객 미팅",
+            "버그 수정", "산책", "블로그 글", "강의 수강", "가계부 정리", "디자인 검토", "면담"]
+PREDICATES = ["진행", "완료", "참석", "정리", "시작", "마무리", "검토", "공유", "계획 수립", "회고"]
+LINK_TARGETS = [f"프로젝트 {i}" for i in range(1, 41)] + [f"GeekNews/기사 {i}|기사 {i}" for i in range(1, 61)]
+
+# 하루를 건너뛸 확률 (기록하지 않은 날)
+SKIP_DAY_RATE = 0.1
+# 항목에 [[링크]]를 붙일 확률
+LINK_RATE = 0.25
+
+
+def make_item(rnd: random.Random, day: datetime) -> str:
+    """타임스탬프가 붙은 합성 항목 한 줄 생성"""
+    stamp = day.replace(hour=rnd.randint(6, 23), minute=rnd.randint(0, 59), second=rnd.randint(0, 59))
+    text = f"{rnd.choice(SUBJECTS)} {rnd.choice(PREDICATES)}"
+    if rnd.random() < LINK_RATE:
+        text += f" [[{rnd.choice(LINK_TARGETS)}]]"
+    return f"- {stamp.strftime('%Y-%m-%d %H:%M:%S')} {text}"
+
+
+def generate_year(year: int, items_per_day: int, rnd: random.Random) -> str:
+    """연도 파일 내용 생성 (월 > 주차 > 날짜 > 섹션, 최신 날짜가 위)"""
+    lines = [f"# 데일리로그 {year}", ""]
+
+    for month in range(12, 0, -1):
+        lines.extend([f"## {month}월", ""])
+
+        first = datetime(year, month, 1)
+        last = (first.replace(year=year + 1, month=1) if month == 12 else first.replace(month=month + 1)) - timedelta(days=1)
+
+        day = last
+        current_week = None
+        while day >= first:
+            week = (day.day - 1) // 7 + 1
+            if week != current_week:
+                current_week = week
+                week_start = day.replace(day=(week - 1) * 7 + 1)
+                week_end = min(week_start + timedelta(days=6), last)
+                lines.extend([
+                    f"### {month}월 {week}주차 ({week_start.strftime('%m/%d')} - {week_end.strftime('%m/%d')})",
+                    "",
+                ])
+
+            if rnd.random() >= SKIP_DAY_RATE:
+                lines.append(f"#### {day.strftime('%Y-%m-%d')} ({dailylog.WEEKDAYS_KO[day.weekday()]})")
+                lines.append("")
+                for section in dailylog.SECTIONS:
+                    lines.append(f"##### {section}")
+                    count = rnd.randint(0, items_per_day * 2 // len(dailylog.SECTIONS))
+                    lines.extend(make_item(rnd, day) for _ in range(count))
+                    if count == 0:
+                        lines.append("-")
+                    lines.append("")
+                lines.extend(["---", ""])
+
+            day -= timedelta(days=1)
+
+    return "\n".join(lines)
+
+
+def generate_vault(vault_path: Path, years: list[int], items_per_day: int, seed: int = 0) -> list[Path]:
+    """합성 Vault 생성 후 연도 파일 경로 목록 반환"""
+    rnd = random.Random(seed)
+    paths = []
+    for year in years:
+        file_path = dailylog.get_dailylog_path(vault_path, year)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(generate_year(year, items_per_day, rnd), encoding="utf-8")
+        paths.append(file_path)
+    return paths
+
+
+def measure(func, repeat: int, setup=None) -> list[float]:
+    """func를 repeat번 실행한 소요 시간(ms) 목록 (setup은 측정에서 제외)"""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def clear_cache(vault_path: Path) -> None:
+    """파싱 캐시 폴더 삭제 (콜드 측정용)"""
+    cache_dir = dailylog.get_dailylog_path(vault_path, 2000).parent / dailylog.CACHE_DIR_NAME
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def bench_size(base_dir: Path, num_years: int, items_per_day: int, repeat: int, seed: int) -> list[dict]:
+    """한 가지 Vault 크기에 대한 측정 결과 목록"""
+    last_year = datetime.now().year - 1
+    years = list(range(last_year - num_years + 1, last_year + 1))
+    vault_path = base_dir / f"vault-{num_years}y-{items_per_day}i"
+    paths = generate_vault(vault_path, years, items_per_day, seed)
+
+    latest = paths[-1]
+    content = latest.read_text(encoding="utf-8")
+    entries = dailylog.parse_dailylog(content)
+    # 측정마다 실제로 다루는 데이터 크기: 마지막 연도 파일(year) 또는 Vault 전체(vault)
+    sizes = {
+        "year": {"file_bytes": latest.stat().st_size, "days": len(entries)},
+        "vault": {"file_bytes": sum(path.stat().st_size for path in paths),
+                  "days": sum(len(dailylog.parse_dailylog(path.read_text(encoding="utf-8"))) for path in paths)},
+    }
+    # 연말(가장 불리한 시점)을 "오늘"로 가정
+    today = datetime(last_year, 12, 31)
+    existing_day = datetime.strptime(max(entries), "%Y-%m-%d")
+    missing_day = next(
+        (today - timedelta(days=i) for i in range(31)
+         if (today - timedelta(days=i)).strftime("%Y-%m-%d") not in entries),
+        None,
+    )
+    week_start, week_end = dailylog.get_week_range(today)
+    all_start = datetime(years[0], 1, 1)
+
+    # insert_item은 문서 트리를 수정하므로 측정마다 새로 파싱 (측정에서 제외)
+    doc = {}
+
+    def new_doc():
+        doc["value"] = dailylog.DailylogDocument(content)
+
+    cases = [
+        ("parse_dailylog", "year", lambda: dailylog.parse_dailylog(content), None),
+        ("DailylogDocument.parse", "year", lambda: dailylog.DailylogDocument(content), None),
+        ("insert_item.december", "year",
+         lambda: dailylog.insert_item(doc["value"], today, "회사", "벤치마크 항목"), new_doc),
+        ("insert_item.january", "year",
+         lambda: dailylog.insert_item(doc["value"], datetime(last_year, 1, 2), "회사", "벤치마크 항목"), new_doc),
+        ("read_entries.day.cold", "year", lambda: dailylog.read_entries(vault_path, today, today),
+         lambda: clear_cache(vault_path)),
+        ("read_entries.day.warm", "year", lambda: dailylog.read_entries(vault_path, today, today), None),
+        ("read_entries.year.cold", "year", lambda: dailylog.read_entries(vault_path, datetime(last_year, 1, 1), today),
+         lambda: clear_cache(vault_path)),
+        ("read_entries.year.warm", "year",
+         lambda: dailylog.read_entries(vault_path, datetime(last_year, 1, 1), today), None),
+        ("read_entries.year.nocache", "year",
+         lambda: dailylog.read_entries(vault_path, datetime(last_year, 1, 1), today, use_cache=False), None),
+        ("generate_summary.week.cold", "year", lambda: dailylog.generate_summary(vault_path, week_start, week_end),
+         lambda: clear_cache(vault_path)),
+        ("generate_summary.week.warm", "year",
+         lambda: dailylog.generate_summary(vault_path, week_start, week_end), None),
+        ("generate_summary.all.cold", "vault", lambda: dailylog.generate_summary(vault_path, all_start, today),
+         lambda: clear_cache(vault_path)),
+        ("generate_summary.all.warm", "vault",
+         lambda: dailylog.generate_summary(vault_path, all_start, today), None),
+        ("generate_summary.all.nocache", "vault",
+         lambda: dailylog.generate_summary(vault_path, all_start, today, use_cache=False), None),
+        # 파일을 수정하므로 마지막에 측정
+        ("add_item.existing_day", "year",
+         lambda: dailylog.add_item(vault_path, existing_day, "회사", "벤치마크 항목"),
+         lambda: latest.write_text(content, encoding="utf-8")),
+    ]
+    if missing_day:
+        cases.append(("add_item.new_day", "year",
+                      lambda: dailylog.add_item(vault_path, missing_day, "개인", "벤치마크 항목"),
+                      lambda: latest.write_text(content, encoding="utf-8")))
+
+    results = []
+    for name, scope, func, setup in cases:
+        timings = measure(func, repeat, setup)
+        results.append({
+            "op": name,
+            "years": num_years,
+            "items_per_day": items_per_day,
+            "scope": scope,
+            "file_bytes": sizes[scope]["file_bytes"],
+            "days": sizes[scope]["days"],
+            "vault_bytes": sizes["vault"]["file_bytes"],
+            "vault_days": sizes["vault"]["days"],
+            "repeat": repeat,
+            "min_ms": round(min(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+        })
+    return results
+
+
+def parse_sizes(value: str) -> list[tuple[int, int]]:
+    """'1x4,5x8' 형식을 [(연수, 하루 항목 수), ...]로 변환"""
+    sizes = []
+    for part in value.split(","):
+        years, _, items = part.strip().partition("x")
+        sizes.append((int(years), int(items)))
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데일리로그 성능 측정")
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes("1x4,3x8,10x8"),
+                        help="Vault 크기 목록 '연수x하루항목수' (기본값: 1x4,3x8,10x8)")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (기본값: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 난수 시드")
+    parser.add_argument("--output", type=str, help="결과를 이어 쓸 JSONL 파일 (기본값: stdout)")
+    parser.add_argument("--keep", type=str, help="생성한 Vault를 보존할 폴더 (기본값: 임시 폴더 후 삭제)")
+    args = parser.parse_args()
+
+    run_info = {
+        "run_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+    base_dir = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="dailylog-bench-"))
+    out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for num_years, items_per_day in args.sizes:
+            for result in bench_size(base_dir, num_years, items_per_day, args.repeat, args.seed):
+                out.write(json.dumps({**run_info, **result}, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if not args.keep:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,39 @@ Obsidian 데일리로그 파일을 파싱하고 조작하는 CLI 도구.
 """
 
 import argparse
+import bisect
+import ctypes
+import ctypes.util
+import hashlib
+import io
+import json
+import math
+import mmap
+import os
 import re
+import selectors
+import signal
+import socket
+import sqlite3
+import stat
+import struct
 import sys
+import tempfile
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
-from collections import defaultdict
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO
+from array import array
+from collections import Counter, defaultdict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 
 # 데일리로그 파일 경로 패턴
@@ -27,12 +54,218 @@ WEEKDAYS_KO = ["월", "화", "수", "목", "금", "토", "일"]
 # 섹션 목록
 SECTIONS = ["회사", "개인", "스크랩", "아이디어"]
 
+# 데일리로그 파일명 패턴 (디렉토리 목록에서 연도 추출용)
+DAILYLOG_FILENAME_PATTERN = re.compile(r"^데일리로그 (\d{4})\.md$")
+
+# 월별 분할 저장 (migrate로 전환): 연도 파일 대신 "데일리로그 YYYY/" 폴더에 월마다 파일 하나
+SHARD_DIR_PATTERN = re.compile(r"^데일리로그 (\d{4})$")
+SHARD_FILENAME_PATTERN = re.compile(r"^(\d{4})-(\d{2})\.md$")
+SHARD_MANIFEST_NAME = "manifest.json"
+SHARD_MANIFEST_VERSION = 1
+
+# 파싱 캐시 폴더 (데일리로그 파일과 같은 폴더, Obsidian은 점(.) 폴더를 색인하지 않음)
+CACHE_DIR_NAME = ".dailylog-cache"
+CACHE_VERSION = 4
+
+# 쓰기 잠금 파일과 추가 요청 대기열 폴더 (캐시 폴더 안)
+WRITE_LOCK_NAME = "write.lock"
+WRITE_SPOOL_DIR_NAME = "spool"
+# 요청한 프로세스가 가져가지 않은(비정상 종료) 결과 파일을 지우는 기준 (초)
+SPOOL_RESULT_TTL = 3600
+
+# 이 일수 이하의 read 요청은 파싱 없이 바이트 오프셋 색인 + mmap으로 처리
+SHORT_RANGE_DAYS = 31
+
+# 바이트 단위 날짜 헤더 / 구분선 패턴 (오프셋 색인 생성용)
+HEADER_BYTES_PATTERN = re.compile(
+    rb"^####[ \t\f\v]+(\d{4}-\d{2}-\d{2})[ \t\f\v]+\((?:"
+    + b"|".join(w.encode("utf-8") for w in WEEKDAYS_KO)
+    + rb")\)",
+    re.M,
+)
+SEPARATOR_BYTES_PATTERN = re.compile(rb"^---", re.M)
+
+# 항목 줄 패턴: "- YYYY-MM-DD HH:MM:SS 내용" (타임스탬프는 add가 붙이며 없을 수도 있음)
+ITEM_PATTERN = re.compile(r"^\s*-\s*(?:(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s+)?(.*)$")
+
+# Obsidian 내부 링크 패턴: [[문서]], [[문서|별칭]], [[문서#제목]]
+LINK_PATTERN = re.compile(r"\[\[([^\]]+)\]\]")
+
+# Vault 파일 이름/별칭 색인 (링크 확인용, 데일리로그 폴더의 캐시 폴더에 저장)
+VAULT_INDEX_NAME = "vault-index.json"
+VAULT_INDEX_VERSION = 1
+
+# frontmatter 별칭 키: "aliases: [a, b]", "aliases: a", "aliases:" 다음 줄 "  - a"
+FRONTMATTER_ALIAS_PATTERN = re.compile(r"^(?:aliases|alias)\s*:\s*(.*)$")
+FRONTMATTER_LIST_ITEM_PATTERN = re.compile(r"^\s*-\s+(.*)$")
+# 이 줄 수 안에 frontmatter가 닫히지 않으면 별칭 없음으로 처리
+FRONTMATTER_MAX_LINES = 200
+
+# 검색 토큰 패턴 (한글은 형태소 분석 대신 글자 bigram으로 색인)
+SEARCH_WORD_PATTERN = re.compile(r"\w+")
+
+# 출력 형식 (text: 마크다운, json: 레코드 배열, ndjson: 한 줄에 레코드 하나)
+OUTPUT_FORMATS = ["text", "json", "ndjson"]
+
+# sync로 만드는 SQLite 사본 (데일리로그 폴더의 .dailylog-cache/ 안)
+SQLITE_NAME = "dailylog.sqlite3"
+SQLITE_SCHEMA_VERSION = 1
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    date TEXT PRIMARY KEY,
+    weekday TEXT NOT NULL,
+    source TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    raw TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    timestamp TEXT,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS links (
+    item_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    target TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_date ON items (date);
+CREATE INDEX IF NOT EXISTS items_section_date ON items (section, date);
+CREATE INDEX IF NOT EXISTS items_timestamp ON items (timestamp);
+CREATE INDEX IF NOT EXISTS links_target ON links (target, date);
+CREATE INDEX IF NOT EXISTS links_date ON links (date);
+"""
+
+# 상주 서버(serve)가 처리하는 명령어와 클라이언트 응답 대기 시간(초)
+SERVER_COMMANDS = ("read", "add", "summary", "search", "links")
+SERVER_TIMEOUT = 30
+
+# 상주 서버 메모리 캐시: {파일 경로: ((mtime_ns, 크기), 항목)} - serve 모드에서만 사용
+RESIDENT_ENTRIES: Optional[dict] = None
+
+# 캐시 적중/미스 집계 (--cache-stats 출력용)
+CACHE_STATS = {"hit": 0, "miss": 0}
+
+# 단계별 측정 (--profile 또는 환경 변수 DAILYLOG_PROFILE=1|로그 파일 경로)
+PROFILE_ENV = "DAILYLOG_PROFILE"
+PROFILE_LOG_NAME = "profile.jsonl"
+PROFILER: Optional["Profiler"] = None
+
+
+class Profiler:
+    """명령 실행 단계(read, parse, filter, aggregate, format, write)별 소요 시간과 할당 블록 수 누적
+
+    단계가 중첩되면 바깥 단계에는 안쪽 단계를 뺀 시간만 기록한다.
+    할당 블록 수는 sys.getallocatedblocks()의 단계 전후 차이다.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.files = {}  # 경로 -> 바이트 수
+        self.entries = 0
+        self._stack = []  # 진행 중인 단계마다 [안쪽 단계 시간, 안쪽 단계 할당 블록]
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        blocks = sys.getallocatedblocks()
+        self._stack.append([0.0, 0])
+        try:
+            yield
+        finally:
+            inner_seconds, inner_blocks = self._stack.pop()
+            elapsed = time.perf_counter() - start
+            allocated = sys.getallocatedblocks() - blocks
+            if self._stack:
+                self._stack[-1][0] += elapsed
+                self._stack[-1][1] += allocated
+            self.add(name, (elapsed - inner_seconds) * 1000, allocated - inner_blocks)
+
+    def add(self, name: str, ms: float, alloc_blocks: int, calls: int = 1) -> None:
+        phase = self.phases.setdefault(name, {"ms": 0.0, "alloc_blocks": 0, "calls": 0})
+        phase["ms"] += ms
+        phase["alloc_blocks"] += alloc_blocks
+        phase["calls"] += calls
+
+    def add_file(self, file_path: Path, size: int) -> None:
+        self.files[str(file_path)] = size
+
+
+@contextmanager
+def profile_phase(name: str) -> Iterator[None]:
+    """--profile일 때만 단계 측정 (아니면 아무 것도 하지 않음)"""
+    if PROFILER is None:
+        yield
+    else:
+        with PROFILER.phase(name):
+            yield
+
 
 def get_dailylog_path(vault_path: Path, year: int) -> Path:
     """연도에 해당하는 데일리로그 파일 경로 반환"""
     return vault_path / DAILYLOG_PATH_PATTERN.format(year=year)
 
 
+def get_shard_dir(vault_path: Path, year: int) -> Path:
+    """연도의 월별 분할 폴더 경로 ("데일리로그 YYYY.md" 옆의 "데일리로그 YYYY/")"""
+    return get_dailylog_path(vault_path, year).with_suffix("")
+
+
+def load_manifest(shard_dir: Path) -> Optional[dict]:
+    """월별 분할 폴더의 manifest 로드 (분할되지 않았거나 손상되었으면 None)
+
+    구조: {"version", "year", "preamble": 첫 월 헤더 전 원문, "shards": [파일명, ...] (최신 월 먼저)}
+    """
+    try:
+        manifest = json.loads((shard_dir / SHARD_MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != SHARD_MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def find_dailylog_files(vault_path: Path, start_year: int, end_year: int) -> list[tuple[int, Path]]:
+    """기간과 겹치는 연도 중 실제로 존재하는 데일리로그 파일 목록 반환 (연도순)
+
+    월별로 분할된 연도는 연도 파일 대신 월 파일들을 월순으로 반환한다.
+    """
+    log_dir = get_dailylog_path(vault_path, start_year).parent
+    try:
+        names = os.listdir(log_dir)
+    except OSError:
+        return []
+
+    files = []
+    sharded = set()
+    for name in names:
+        match = SHARD_DIR_PATTERN.match(name)
+        if match and start_year <= int(match.group(1)) <= end_year:
+            manifest = load_manifest(log_dir / name)
+            if manifest:
+                sharded.add(int(match.group(1)))
+                files.extend((int(match.group(1)), log_dir / name / shard) for shard in manifest["shards"])
+
+    for name in names:
+        match = DAILYLOG_FILENAME_PATTERN.match(name)
+        if match and start_year <= int(match.group(1)) <= end_year and int(match.group(1)) not in sharded:
+            files.append((int(match.group(1)), log_dir / name))
+    return sorted(files)
+
+
+def get_write_path(vault_path: Path, date: datetime) -> Path:
+    """날짜 항목을 추가할 파일 (분할된 연도는 해당 월 파일, 아직 없을 수 있음)"""
+    shard_dir = get_shard_dir(vault_path, date.year)
+    if load_manifest(shard_dir):
+        return shard_dir / f"{date.year}-{date.month:02d}.md"
+    file_path = get_dailylog_path(vault_path, date.year)
+    if not file_path.exists():
+        raise ValueError(f"데일리로그 파일이 존재하지 않습니다: {file_path}")
+    return file_path
+
+
 def parse_date(date_str: str) -> datetime:
     """날짜 문자열을 datetime으로 변환
 
@@ -77,55 +310,100 @@ def get_month_range(date: datetime) -> tuple[datetime, datetime]:
     return start, end
 
 
-def parse_dailylog(content: str) -> dict:
-    """데일리로그 파일 내용을 파싱하여 구조화된 딕셔너리로 반환
+def iter_lines(f: Iterable[str]) -> Iterator[str]:
+    """텍스트 파일을 content.split("\\n")과 같은 줄 단위로 지연 순회"""
+    line = ""
+    for line in f:
+        yield line[:-1] if line.endswith("\n") else line
+    # 파일이 개행으로 끝나면(또는 비어 있으면) split처럼 마지막 빈 줄을 낸다
+    if line == "" or line.endswith("\n"):
+        yield ""
 
-    반환 구조:
-    {
-        "2026-01-08": {
-            "weekday": "목",
-            "sections": {
-                "회사": ["- 항목1", "- 항목2"],
-                "개인": ["- 항목1"],
-                ...
-            },
-            "raw": "#### 2026-01-08 (목)\n..."
-        },
-        ...
-    }
+
+class DayEntry(Mapping):
+    """하루 항목 - {"weekday", "sections", "raw"} 딕셔너리처럼 읽을 수 있는 압축 레코드
+
+    원문(raw)만 문자열로 한 번 보관하고, 항목은 (섹션 번호, 시작, 끝) 오프셋을
+    array에 저장해 두었다가 sections에 접근할 때 raw에서 잘라 만든다.
     """
-    entries = {}
 
+    __slots__ = ("weekday", "raw", "spans")
+
+    def __init__(self, weekday: str, raw: str, spans: array):
+        self.weekday = weekday
+        self.raw = raw
+        self.spans = spans  # [섹션 번호, 시작, 끝, ...] (raw 문자 오프셋)
+
+    @property
+    def sections(self) -> dict:
+        sections = {s: [] for s in SECTIONS}
+        spans = self.spans
+        for i in range(0, len(spans), 3):
+            sections[SECTIONS[spans[i]]].append(self.raw[spans[i + 1]:spans[i + 2]])
+        return sections
+
+    def __getitem__(self, key: str):
+        if key not in ("weekday", "sections", "raw"):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(("weekday", "sections", "raw"))
+
+    def __len__(self) -> int:
+        return 3
+
+    def to_json(self) -> list:
+        """캐시 저장용 [요일, 원문, 오프셋 목록]"""
+        return [self.weekday, self.raw, self.spans.tolist()]
+
+    @classmethod
+    def from_json(cls, data: list) -> "DayEntry":
+        return cls(data[0], data[1], array("I", data[2]))
+
+
+def entries_to_json(entries: dict) -> dict:
+    return {date_str: entry.to_json() for date_str, entry in entries.items()}
+
+
+def entries_from_json(data: dict) -> dict:
+    return {date_str: DayEntry.from_json(entry) for date_str, entry in data.items()}
+
+
+def iter_dailylog(lines: Iterable[str]) -> Iterator[tuple[str, DayEntry]]:
+    """데일리로그 줄을 순회하며 날짜 항목을 완성되는 대로 (날짜, 항목)으로 반환
+
+    항목 구조는 parse_dailylog와 같다. 파일 순서(최신 날짜 먼저)대로 반환하므로
+    호출 측에서 필요한 날짜를 지나면 순회를 멈출 수 있다.
+    """
     # 날짜 헤더 패턴: #### YYYY-MM-DD (요일)
     date_pattern = re.compile(r"^####\s+(\d{4}-\d{2}-\d{2})\s+\(([월화수목금토일])\)")
     # 섹션 헤더 패턴: ##### 섹션명
     section_pattern = re.compile(r"^#####\s+(.+)")
+    section_numbers = {section: i for i, section in enumerate(SECTIONS)}
 
     current_date = None
+    weekday = None
     current_section = None
     current_raw_lines = []
+    spans = None
+    pos = 0  # raw에서 현재 줄의 시작 오프셋
 
-    lines = content.split("\n")
-
-    for i, line in enumerate(lines):
+    for line in lines:
         date_match = date_pattern.match(line)
 
         if date_match:
-            # 이전 날짜 저장
+            # 이전 날짜 반환
             if current_date:
-                entries[current_date]["raw"] = "\n".join(current_raw_lines)
+                yield current_date, DayEntry(weekday, "\n".join(current_raw_lines), spans)
 
             # 새 날짜 시작
             current_date = date_match.group(1)
             weekday = date_match.group(2)
             current_section = None
             current_raw_lines = [line]
-
-            entries[current_date] = {
-                "weekday": weekday,
-                "sections": {s: [] for s in SECTIONS},
-                "raw": ""
-            }
+            spans = array("I")
+            pos = len(line) + 1
         elif current_date:
             current_raw_lines.append(line)
 
@@ -133,58 +411,413 @@ def parse_dailylog(content: str) -> dict:
             if section_match:
                 section_name = section_match.group(1).strip()
                 if section_name in SECTIONS:
-                    current_section = section_name
-            elif current_section and line.strip().startswith("-") and not line.strip().startswith("---"):
-                entries[current_date]["sections"][current_section].append(line)
+                    current_section = section_numbers[section_name]
+            elif current_section is not None and line.strip().startswith("-") and not line.strip().startswith("---"):
+                spans.extend((current_section, pos, pos + len(line)))
             elif line.startswith("---"):
                 # 구분선을 만나면 현재 날짜 종료
-                if current_date:
-                    entries[current_date]["raw"] = "\n".join(current_raw_lines[:-1])
+                yield current_date, DayEntry(weekday, "\n".join(current_raw_lines[:-1]), spans)
                 current_date = None
                 current_section = None
+            pos += len(line) + 1
 
-    # 마지막 날짜 저장
+    # 마지막 날짜 반환
     if current_date:
-        entries[current_date]["raw"] = "\n".join(current_raw_lines)
+        yield current_date, DayEntry(weekday, "\n".join(current_raw_lines), spans)
+
 
-    return entries
+def parse_dailylog(content: str) -> dict:
+    """데일리로그 파일 내용을 파싱하여 {날짜: DayEntry}로 반환
+
+    DayEntry는 아래 딕셔너리와 같은 방식으로 읽을 수 있다:
+    {
+        "2026-01-08": {
+            "weekday": "목",
+            "sections": {
+                "회사": ["- 항목1", "- 항목2"],
+                "개인": ["- 항목1"],
+                ...
+            },
+            "raw": "#### 2026-01-08 (목)\n..."
+        },
+        ...
+    }
+    """
+    return dict(iter_dailylog(content.split("\n")))
 
 
-def read_entries(vault_path: Path, start_date: datetime, end_date: Optional[datetime] = None) -> str:
+def stream_dailylog_range(file_path: Path, start_str: str, end_str: str,
+                          newest_first: bool = False) -> Iterator[tuple[str, dict]]:
+    """파일을 앞에서부터 스트리밍 파싱하여 기간 내 항목만 반환
+
+    newest_first=True(날짜가 최신순으로 정렬된 파일)이면 시작일보다 과거 날짜를 만나면 즉시 중단한다.
+    이전 버전의 add가 날짜 순서를 어긋나게 쓴 파일도 있으므로 정렬 여부는 오프셋 색인으로 확인한다.
+    """
+    with open(file_path, encoding="utf-8") as f:
+        for date_str, entry in iter_dailylog(iter_lines(f)):
+            if date_str < start_str:
+                if newest_first:
+                    break
+                continue
+            if date_str <= end_str:
+                yield date_str, entry
+
+
+def get_cache_path(file_path: Path, kind: str) -> Path:
+    """데일리로그 파일에 대응하는 캐시 파일 경로 반환"""
+    return file_path.parent / CACHE_DIR_NAME / f"{file_path.stem}.{kind}.json"
+
+
+def read_dailylog_text(data: bytes) -> str:
+    """파일 바이트를 Path.read_text와 동일한 문자열로 디코딩 (개행 정규화)"""
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def read_text_newline(path: Path) -> tuple[str, str]:
+    """파일을 읽어 (개행을 \n으로 바꾼 내용, 원래 개행 문자) 반환 (CRLF 파일을 CRLF로 다시 쓰기 위함)"""
+    with open(path, encoding="utf-8", newline="") as f:
+        content = f.read()
+    newline = "\r\n" if "\r\n" in content else "\n"
+    return content.replace("\r\n", "\n"), newline
+
+
+def write_text_atomic(path: Path, text: str, newline: Optional[str] = None) -> None:
+    """임시 파일에 쓴 뒤 rename하여 저장 (중간 상태 노출 방지)
+
+    newline=""이면 개행을 변환하지 않고 그대로 쓴다 (바이트 단위 보존).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(text, encoding="utf-8", newline=newline)
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def write_json_atomic(path: Path, data) -> None:
+    """임시 파일에 쓴 뒤 rename하여 JSON 저장"""
+    write_text_atomic(path, json.dumps(data, ensure_ascii=False))
+
+
+def load_cache(cache_path: Path) -> Optional[dict]:
+    """캐시 파일 로드 (없거나 손상/버전 불일치면 None)"""
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("version") != CACHE_VERSION:
+        return None
+    return cached
+
+
+def save_cache(cache_path: Path, cached: dict) -> None:
+    """캐시 저장 (쓰기 실패는 무시 - 캐시는 최선 노력)"""
+    try:
+        write_json_atomic(cache_path, cached)
+    except OSError:
+        pass
+
+
+def available_cpu_count() -> int:
+    """현재 프로세스가 사용할 수 있는 CPU 코어 수"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def parse_dailylog_file(file_path: Path, known_hash: Optional[str] = None) -> tuple[str, Optional[dict]]:
+    """파일을 읽어 내용 해시와 파싱 결과 반환 (프로세스 풀 작업 단위)
+
+    내용 해시가 known_hash와 같으면 파싱을 생략하고 None을 반환한다.
+    """
+    with profile_phase("read"):
+        data = file_path.read_bytes()
+        content_hash = hashlib.sha256(data).hexdigest()
+    if content_hash == known_hash:
+        return content_hash, None
+    with profile_phase("parse"):
+        return content_hash, parse_dailylog(read_dailylog_text(data))
+
+
+def parse_dailylog_file_worker(file_path: Path, known_hash: Optional[str], profile: bool) -> tuple:
+    """프로세스 풀용 parse_dailylog_file - 측정 중이면 작업 프로세스의 단계 측정값도 반환"""
+    global PROFILER
+    PROFILER = Profiler() if profile else None
+    content_hash, entries = parse_dailylog_file(file_path, known_hash)
+    return content_hash, entries, PROFILER.phases if profile else None
+
+
+def load_dailylogs(file_paths: list[Path], use_cache: bool = True) -> list[dict]:
+    """여러 데일리로그 파일을 파싱하여 입력 순서대로 반환 (캐시가 유효하면 캐시 사용)
+
+    캐시 키: 파일 경로 + mtime + 크기 + 내용 해시.
+    mtime/크기가 같으면 파일을 읽지 않고 캐시를 사용하고,
+    달라졌더라도 내용 해시가 같으면(touch 등) 캐시를 갱신만 한다.
+    상주 서버(serve)에서는 메모리에 올려 둔 결과를 먼저 확인한다.
+    다시 파싱할 파일이 둘 이상이면 프로세스 풀에서 병렬로 파싱한다.
+    """
+    results = {}
+    pending = []  # (파일 경로, stat, 기존 캐시)
+
+    for file_path in file_paths:
+        if not use_cache:
+            pending.append((file_path, None, None))
+            continue
+
+        stat = file_path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        if RESIDENT_ENTRIES is not None:
+            resident = RESIDENT_ENTRIES.get(str(file_path))
+            if resident and resident[0] == key:
+                CACHE_STATS["hit"] += 1
+                results[file_path] = resident[1]
+                continue
+
+        if PROFILER is not None:
+            PROFILER.add_file(file_path, stat.st_size)
+        with profile_phase("read"):
+            cached = load_cache(get_cache_path(file_path, "entries"))
+        if not cached or cached.get("path") != str(file_path):
+            cached = None
+        if cached and (cached.get("mtime_ns"), cached.get("size")) == key:
+            CACHE_STATS["hit"] += 1
+            with profile_phase("parse"):
+                results[file_path] = entries_from_json(cached["entries"])
+            if RESIDENT_ENTRIES is not None:
+                RESIDENT_ENTRIES[str(file_path)] = (key, results[file_path])
+            continue
+        pending.append((file_path, stat, cached))
+
+    paths = [file_path for file_path, _, _ in pending]
+    known_hashes = [cached.get("sha256") if cached else None for _, _, cached in pending]
+    workers = min(len(pending), available_cpu_count())
+    if workers > 1:
+        # 작업 프로세스의 단계 측정값은 병렬로 겹치므로 "worker.단계" 이름으로 따로 기록
+        profile = PROFILER is not None
+        with profile_phase("parse"), ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = []
+            for content_hash, entries, phases in pool.map(parse_dailylog_file_worker, paths, known_hashes,
+                                                          [profile] * len(paths)):
+                parsed.append((content_hash, entries))
+                if profile:
+                    for name, phase in phases.items():
+                        PROFILER.add(f"worker.{name}", phase["ms"], phase["alloc_blocks"], phase["calls"])
+    else:
+        # 파일 하나(또는 코어 하나)는 풀 생성 비용 없이 현재 프로세스에서 파싱
+        parsed = [parse_dailylog_file(path, known) for path, known in zip(paths, known_hashes)]
+
+    for (file_path, stat, cached), (content_hash, entries) in zip(pending, parsed):
+        if use_cache:
+            if entries is None:
+                CACHE_STATS["hit"] += 1
+                with profile_phase("parse"):
+                    entries = entries_from_json(cached["entries"])
+            else:
+                CACHE_STATS["miss"] += 1
+            with profile_phase("write"):
+                save_cache(get_cache_path(file_path, "entries"), {
+                    "version": CACHE_VERSION,
+                    "path": str(file_path),
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "sha256": content_hash,
+                    "entries": entries_to_json(entries),
+                })
+            if RESIDENT_ENTRIES is not None:
+                RESIDENT_ENTRIES[str(file_path)] = ((stat.st_mtime_ns, stat.st_size), entries)
+        results[file_path] = entries
+
+    if PROFILER is not None:
+        PROFILER.entries += sum(len(entries) for entries in results.values())
+    return [results[file_path] for file_path in file_paths]
+
+
+def load_dailylog(file_path: Path, use_cache: bool = True) -> dict:
+    """데일리로그 파일 하나를 파싱하여 반환 (load_dailylogs 참고)"""
+    return load_dailylogs([file_path], use_cache)[0]
+
+
+def scan_header_offsets(buf) -> dict:
+    """파일 버퍼를 한 번 훑어 날짜 블록의 바이트 오프셋 목록 반환
+
+    반환: {"blocks": [[날짜, 시작 오프셋, 끝 오프셋], ...] (날짜 오름차순),
+           "newest_first": 파일 안의 날짜 헤더가 중복 없이 최신순인지 여부}
+    끝 오프셋은 블록을 끝내는 줄(구분선 또는 다음 날짜 헤더)의 시작 위치이며,
+    파일 끝까지 이어지는 블록은 파일 길이다. parse_dailylog의 raw 범위와 같다.
+    """
+    headers = [(m.group(1).decode("ascii"), m.start()) for m in HEADER_BYTES_PATTERN.finditer(buf)]
+    separators = [m.start() for m in SEPARATOR_BYTES_PATTERN.finditer(buf)]
+
+    blocks = {}
+    for i, (date_str, start) in enumerate(headers):
+        end = headers[i + 1][1] if i + 1 < len(headers) else len(buf)
+        sep_idx = bisect.bisect_right(separators, start)
+        if sep_idx < len(separators):
+            end = min(end, separators[sep_idx])
+        # 같은 날짜가 여러 번 나오면 parse_dailylog처럼 마지막 블록 사용
+        blocks[date_str] = [date_str, start, end]
+
+    return {
+        "blocks": [blocks[d] for d in sorted(blocks)],
+        "newest_first": all(a[0] > b[0] for a, b in zip(headers, headers[1:])),
+    }
+
+
+def load_derived(file_path: Path, kind: str, build: Callable[[Path, bool], Any], use_cache: bool = True):
+    """데일리로그 파일에서 파생된 색인을 캐시에서 로드 (mtime/크기가 바뀌면 build로 재생성)
+
+    오프셋 색인, 검색 색인 등 파일 단위로 다시 만들 수 있는 데이터에 사용한다.
+    build(file_path, use_cache)에도 use_cache를 넘기므로 --no-cache이면 파싱 캐시도 쓰지 않는다.
+    """
+    stat = file_path.stat()
+    cache_path = get_cache_path(file_path, kind)
+
+    if use_cache:
+        with profile_phase("read"):
+            cached = load_cache(cache_path)
+        if (cached and cached.get("path") == str(file_path) and "data" in cached
+                and cached.get("mtime_ns") == stat.st_mtime_ns and cached.get("size") == stat.st_size):
+            CACHE_STATS["hit"] += 1
+            return cached["data"]
+        CACHE_STATS["miss"] += 1
+
+    with profile_phase("parse"):
+        data = build(file_path, use_cache)
+
+    if use_cache:
+        with profile_phase("write"):
+            save_cache(cache_path, {
+                "version": CACHE_VERSION,
+                "path": str(file_path),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "data": data,
+            })
+    return data
+
+
+def build_header_index(file_path: Path, use_cache: bool = True) -> dict:
+    """파일을 mmap으로 열어 날짜 헤더 바이트 오프셋 색인 생성 (scan_header_offsets 참고)"""
+    if file_path.stat().st_size == 0:
+        return {"blocks": [], "newest_first": True}
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return scan_header_offsets(mm)
+
+
+def load_header_index(file_path: Path, use_cache: bool = True) -> dict:
+    """날짜 헤더 바이트 오프셋 색인 로드 (mtime/크기가 바뀌면 재생성)"""
+    return load_derived(file_path, "offsets", build_header_index, use_cache)
+
+
+def read_raw_blocks(file_path: Path, start_str: str, end_str: str, use_cache: bool = True) -> list[tuple[str, str]]:
+    """오프셋 색인으로 기간 내 날짜 블록만 mmap에서 잘라 (날짜, raw) 목록 반환"""
+    offsets = load_header_index(file_path, use_cache)["blocks"]
+    dates = [block[0] for block in offsets]
+    lo = bisect.bisect_left(dates, start_str)
+    hi = bisect.bisect_right(dates, end_str)
+    if lo >= hi:
+        return []
+
+    blocks = []
+    with profile_phase("read"), open(file_path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        if PROFILER is not None:
+            PROFILER.add_file(file_path, size)
+        for date_str, start, end in offsets[lo:hi]:
+            raw = read_dailylog_text(mm[start:end])
+            # 블록을 끝낸 줄 앞의 개행은 raw에 포함되지 않음
+            if end < size and raw.endswith("\n"):
+                raw = raw[:-1]
+            blocks.append((date_str, raw))
+    return blocks
+
+
+class DateIndex:
+    """날짜 오름차순으로 정렬된 데일리로그 항목 색인
+
+    기간 조회를 날짜별 순회 대신 bisect 슬라이스로 처리한다.
+    """
+
+    def __init__(self, entries: dict):
+        self.dates = sorted(entries)
+        self.entries = [entries[d] for d in self.dates]
+
+    def range(self, start_str: str, end_str: str) -> list[tuple[str, dict]]:
+        """start_str ~ end_str (YYYY-MM-DD, 양끝 포함) 사이의 (날짜, 항목) 목록"""
+        lo = bisect.bisect_left(self.dates, start_str)
+        hi = bisect.bisect_right(self.dates, end_str)
+        return list(zip(self.dates[lo:hi], self.entries[lo:hi]))
+
+
+def load_date_index(vault_path: Path, start_date: datetime, end_date: datetime,
+                    use_cache: bool = True) -> DateIndex:
+    """기간과 겹치는 연도 파일만 읽어 날짜 색인 생성
+
+    긴 기간은 파싱 캐시(없으면 병렬 파싱)를 사용하고, 짧은 기간은
+    스트리밍 파싱으로 읽는다 (날짜가 최신순으로 정렬된 파일은 필요한 날짜까지만).
+    """
+    start_str = start_date.strftime("%Y-%m-%d")
+    end_str = end_date.strftime("%Y-%m-%d")
+    # 상주 서버에서는 메모리에 있는 전체 파싱 결과가 가장 빠름
+    short_range = (end_date - start_date).days < SHORT_RANGE_DAYS and RESIDENT_ENTRIES is None
+
+    file_paths = [file_path for _, file_path in find_dailylog_files(vault_path, start_date.year, end_date.year)]
+
+    all_entries = {}
+    if short_range:
+        for file_path in file_paths:
+            newest_first = load_header_index(file_path, use_cache)["newest_first"]
+            # 스트리밍 파싱은 읽기와 파싱이 섞여 있어 parse로 기록
+            with profile_phase("parse"):
+                all_entries.update(stream_dailylog_range(file_path, start_str, end_str, newest_first))
+            if PROFILER is not None:
+                PROFILER.add_file(file_path, file_path.stat().st_size)
+        if PROFILER is not None:
+            PROFILER.entries += len(all_entries)
+    else:
+        # 여러 연도는 캐시에 없는 파일만 병렬 파싱, 연도순으로 병합
+        for entries in load_dailylogs(file_paths, use_cache):
+            all_entries.update(entries)
+    with profile_phase("filter"):
+        return DateIndex(all_entries)
+
+
+def read_entries(vault_path: Path, start_date: datetime, end_date: Optional[datetime] = None,
+                 use_cache: bool = True) -> str:
     """지정된 기간의 데일리로그 항목 읽기"""
     if end_date is None:
         end_date = start_date
 
-    # 시작일과 종료일 사이의 모든 연도 수집
-    years = set()
-    current = start_date
-    while current <= end_date:
-        years.add(current.year)
-        current += timedelta(days=1)
+    start_str = start_date.strftime("%Y-%m-%d")
+    end_str = end_date.strftime("%Y-%m-%d")
 
-    # 각 연도별 파일에서 항목 수집
-    all_entries = {}
-    for year in sorted(years):
-        file_path = get_dailylog_path(vault_path, year)
-        if file_path.exists():
-            content = file_path.read_text(encoding="utf-8")
-            entries = parse_dailylog(content)
-            all_entries.update(entries)
+    if (end_date - start_date).days < SHORT_RANGE_DAYS and RESIDENT_ENTRIES is None:
+        # 짧은 기간: 파싱 없이 오프셋 색인으로 필요한 블록만 잘라 읽기
+        raw_blocks = {}
+        for _, file_path in find_dailylog_files(vault_path, start_date.year, end_date.year):
+            raw_blocks.update(read_raw_blocks(file_path, start_str, end_str, use_cache))
+        raws = [raw_blocks[d] for d in sorted(raw_blocks)]
+    else:
+        index = load_date_index(vault_path, start_date, end_date, use_cache)
+        with profile_phase("filter"):
+            raws = [entry["raw"] for _, entry in index.range(start_str, end_str)]
 
     # 기간 내 항목 필터링
-    result_lines = []
-    current = start_date
-    while current <= end_date:
-        date_str = current.strftime("%Y-%m-%d")
-        if date_str in all_entries:
-            result_lines.append(all_entries[date_str]["raw"])
+    with profile_phase("format"):
+        result_lines = []
+        for raw in raws:
+            result_lines.append(raw)
             result_lines.append("")  # 빈 줄 추가
-        current += timedelta(days=1)
 
-    if not result_lines:
-        return f"지정된 기간({start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')})에 해당하는 항목이 없습니다."
+        if not result_lines:
+            return f"지정된 기간({start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')})에 해당하는 항목이 없습니다."
 
-    return "\n".join(result_lines).strip()
+        return "\n".join(result_lines).strip()
 
 
 def generate_day_template(date: datetime) -> str:
@@ -207,173 +840,680 @@ def generate_day_template(date: datetime) -> str:
 -"""
 
 
-def find_insert_position(content: str, target_date: datetime) -> tuple[int, bool, str]:
-    """항목을 삽입할 위치와 날짜 섹션 존재 여부 반환
+MONTH_HEADER_PATTERN = re.compile(r"^##\s+(\d+)월")
+WEEK_HEADER_PATTERN = re.compile(r"^###\s+(\d+)월\s+(\d+)주차")
+DAY_HEADER_PATTERN = re.compile(r"^####\s+(\d{4}-\d{2}-\d{2})")
+SECTION_HEADER_PATTERN = re.compile(r"^#####\s+(.+)")
 
-    반환: (삽입 위치, 날짜 섹션 존재 여부, 주차 헤더)
-    """
-    lines = content.split("\n")
-    date_str = target_date.strftime("%Y-%m-%d")
 
-    # 날짜 헤더 패턴
-    date_pattern = re.compile(r"^####\s+(\d{4}-\d{2}-\d{2})")
+class LogNode:
+    """데일리로그 문서 트리의 노드 (root, month, week, day, section)
 
-    # 해당 날짜 찾기
-    for i, line in enumerate(lines):
-        match = date_pattern.match(line)
-        if match and match.group(1) == date_str:
-            return i, True, ""
+    lines는 헤더부터 첫 자식 노드 전까지의 원문 줄이며, 노드의 원문은
+    lines 뒤에 자식 노드의 원문을 차례로 이어 붙인 것과 같다.
+    """
 
-    # 날짜가 없으면 적절한 위치 찾기 (날짜 내림차순 정렬)
-    # 월 헤더 아래, 가장 가까운 과거 날짜 앞에 삽입
-    month_pattern = re.compile(r"^##\s+(\d+)월")
-    week_pattern = re.compile(r"^###\s+(\d+)월\s+(\d+)주차")
+    __slots__ = ("kind", "key", "lines", "children", "parent")
 
-    target_month = target_date.month
-    target_week = (target_date.day - 1) // 7 + 1
+    def __init__(self, kind: str, key: Any = None, lines: Optional[list[str]] = None,
+                 parent: Optional["LogNode"] = None):
+        self.kind = kind
+        self.key = key
+        self.lines = lines if lines is not None else []
+        self.children = []
+        self.parent = parent
 
-    insert_pos = -1
-    week_header = ""
+    def add_child(self, child: "LogNode", index: Optional[int] = None) -> "LogNode":
+        child.parent = self
+        if index is None:
+            self.children.append(child)
+        else:
+            self.children.insert(index, child)
+        return child
 
-    for i, line in enumerate(lines):
-        # 월 헤더 확인
-        month_match = month_pattern.match(line)
-        if month_match:
-            month_num = int(month_match.group(1))
-            if month_num == target_month:
-                insert_pos = i + 1
+    def iter_lines(self) -> Iterator[str]:
+        yield from self.lines
+        for child in self.children:
+            yield from child.iter_lines()
 
-        # 주차 헤더 확인
-        week_match = week_pattern.match(line)
-        if week_match:
-            week_month = int(week_match.group(1))
-            week_num = int(week_match.group(2))
-            if week_month == target_month:
-                insert_pos = i + 1
-                week_header = line
 
-        # 날짜 확인 - 타겟 날짜보다 과거면 그 앞에 삽입
-        date_match = date_pattern.match(line)
-        if date_match:
-            existing_date = datetime.strptime(date_match.group(1), "%Y-%m-%d")
-            if existing_date < target_date:
-                return i, False, week_header
+class DailylogDocument:
+    """연도 파일을 월 > 주차 > 날짜 > 섹션 트리로 파싱한 문서
 
-    return insert_pos if insert_pos > 0 else len(lines), False, week_header
+    serialize()는 원문을 바이트 단위로 그대로 복원한다. 날짜 노드는 파일 순서
+    (최신 날짜가 위)로 days에 보관하여 새 날짜의 위치를 이진 탐색으로 찾고,
+    항목 추가는 해당 섹션 노드의 줄만 수정한 뒤 저장할 때 한 번만 직렬화한다.
+    """
 
+    def __init__(self, content: str):
+        self.root = LogNode("root")
+        self.days = []  # 날짜 노드 (파일 순서 = 최신 날짜가 위)
+        self.by_date = {}  # 날짜 -> 첫 번째 날짜 노드
+        self.months = {}  # 월 -> 마지막 월 노드
+        self.weeks = {}  # (월, 주차) -> 마지막 주차 노드
+
+        month = week = day = section = None
+        day_closed = False  # 날짜 안에서 "---"를 지나면 섹션 헤더로 보지 않음
+        for line in content.split("\n"):
+            current = section or day or week or month or self.root
+
+            match = DAY_HEADER_PATTERN.match(line)
+            if match:
+                day = (week or month or self.root).add_child(LogNode("day", match.group(1), [line]))
+                section, day_closed = None, False
+                self.days.append(day)
+                self.by_date.setdefault(day.key, day)
+                continue
+
+            match = WEEK_HEADER_PATTERN.match(line)
+            if match:
+                key = (int(match.group(1)), int(match.group(2)))
+                week = (month or self.root).add_child(LogNode("week", key, [line]))
+                day = section = None
+                self.weeks[key] = week
+                continue
+
+            match = MONTH_HEADER_PATTERN.match(line)
+            if match:
+                month = self.root.add_child(LogNode("month", int(match.group(1)), [line]))
+                week = day = section = None
+                self.months[month.key] = month
+                continue
+
+            if day and not day_closed:
+                match = SECTION_HEADER_PATTERN.match(line)
+                if match:
+                    section = day.add_child(LogNode("section", match.group(1).strip(), [line]))
+                    continue
+                if line.strip() == "---":
+                    day_closed = True
+
+            current.lines.append(line)
+
+        # 날짜가 내림차순이면 이진 탐색, 아니면 파일 순서대로 비교
+        self.sorted = all(a.key >= b.key for a, b in zip(self.days, self.days[1:]))
+
+    def serialize(self) -> str:
+        return "\n".join(self.root.iter_lines())
+
+    def first_older_day(self, date_str: str) -> int:
+        """date_str보다 과거인 첫 날짜 노드의 days 인덱스 (없으면 len(days))"""
+        if not self.sorted:
+            return next((i for i, day in enumerate(self.days) if day.key < date_str), len(self.days))
+        lo, hi = 0, len(self.days)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.days[mid].key < date_str:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def ensure_day(self, date: datetime) -> LogNode:
+        """날짜 노드 반환 (없으면 템플릿으로 생성)
+
+        해당 주차(없으면 월) 헤더 아래에서, 그보다 과거인 첫 날짜 앞에 넣는다.
+        그 헤더 아래 날짜가 모두 더 최신이면 마지막 날짜 뒤에, 날짜가 없으면
+        헤더 바로 다음 줄에 넣는다. 월/주차 헤더가 없으면 과거인 첫 날짜 앞(없으면 파일 끝).
+        """
+        date_str = date.strftime("%Y-%m-%d")
+        if date_str in self.by_date:
+            return self.by_date[date_str]
+
+        template = generate_day_template(date).split("\n")
+        new_day = LogNode("day", date_str, [template[0]])
+        sections = []
+        for line in template[1:]:
+            if SECTION_HEADER_PATTERN.match(line):
+                sections.append(new_day.add_child(LogNode("section", line[6:].strip(), [line])))
+            else:
+                (sections[-1] if sections else new_day).lines.append(line)
+        sections[-1].lines.extend(["", "---"])
+
+        index = self.first_older_day(date_str)
+        older = self.days[index] if index < len(self.days) else None
+        container = self.weeks.get((date.month, (date.day - 1) // 7 + 1)) or self.months.get(date.month)
+
+        if container is not None and (older is None or not self.contains(container, older)):
+            last = self.last_day(container)
+            if last is not None:
+                # 헤더 아래 날짜가 모두 더 최신 - 마지막 날짜 바로 뒤
+                last.parent.add_child(new_day, last.parent.children.index(last) + 1)
+            else:
+                # 헤더 바로 다음 줄 - 헤더 뒤에 있던 줄은 새 날짜 뒤로 이동
+                sections[-1].lines.extend(container.lines[1:])
+                del container.lines[1:]
+                container.add_child(new_day, 0)
+        elif older is not None:
+            older.parent.add_child(new_day, older.parent.children.index(older))
+        else:
+            self.root.add_child(new_day)
+
+        # 앞뒤 헤더/구분선과 빈 줄 하나로 띄움 (파일 끝이면 원래 마지막 개행 유지)
+        before, after = self.line_before(new_day), self.line_after(new_day)
+        if before is not None and before.strip():
+            new_day.lines.insert(0, "")
+        if sections[-1].lines[-1].strip() and ((after is None and before == "") or (after is not None and after.strip())):
+            sections[-1].lines.append("")
+
+        # days는 날짜 내림차순을 유지 (이진 탐색용)
+        self.days.insert(index, new_day)
+        self.by_date[date_str] = new_day
+        return new_day
+
+    @staticmethod
+    def line_before(node: LogNode) -> Optional[str]:
+        """원문에서 node 바로 앞 줄 (없으면 None)"""
+        parent = node.parent
+        index = parent.children.index(node)
+        if index > 0:
+            last = parent.children[index - 1]
+            while last.children:
+                last = last.children[-1]
+            return last.lines[-1] if last.lines else None
+        if parent.lines:
+            return parent.lines[-1]
+        return DailylogDocument.line_before(parent) if parent.parent else None
+
+    @staticmethod
+    def line_after(node: LogNode) -> Optional[str]:
+        """원문에서 node(하위 노드 포함) 바로 다음 줄 (없으면 None)"""
+        while node.parent is not None:
+            siblings = node.parent.children
+            index = siblings.index(node)
+            if index + 1 < len(siblings):
+                return siblings[index + 1].lines[0]
+            node = node.parent
+        return None
+
+    @staticmethod
+    def last_day(node: LogNode) -> Optional[LogNode]:
+        """node 아래 파일 순서상 마지막 날짜 노드"""
+        for child in reversed(node.children):
+            if child.kind == "day":
+                return child
+            if child.kind == "week":
+                day = DailylogDocument.last_day(child)
+                if day is not None:
+                    return day
+        return None
+
+    @staticmethod
+    def contains(node: LogNode, day: LogNode) -> bool:
+        """day가 node의 하위 노드인지 여부"""
+        parent = day.parent
+        while parent is not None:
+            if parent is node:
+                return True
+            parent = parent.parent
+        return False
+
+
+def format_item(item: str, timestamp: str) -> str:
+    """항목 형식 정리 (앞의 - 제거 후 타임스탬프 포함)"""
+    if item.startswith("-"):
+        item = item[1:].strip()  # 앞의 - 제거
+    return f"- {timestamp} {item}"
 
-def add_item(vault_path: Path, date: datetime, section: str, item: str) -> str:
-    """데일리로그에 항목 추가"""
-    if section not in SECTIONS:
-        return f"오류: 유효하지 않은 섹션입니다. 사용 가능: {', '.join(SECTIONS)}"
 
-    file_path = get_dailylog_path(vault_path, date.year)
+def insert_item(doc: DailylogDocument, date: datetime, section: str, item: str,
+                timestamp: Optional[str] = None, skip_existing: bool = False) -> str:
+    """문서 트리에 항목을 삽입 (날짜가 없으면 템플릿 생성)
 
-    if not file_path.exists():
-        return f"오류: 데일리로그 파일이 존재하지 않습니다: {file_path}"
+    반환: 삽입된 항목 줄. 섹션을 찾지 못하면 ValueError.
+    timestamp가 없으면 현재 시각을 붙인다.
+    skip_existing=True이면 같은 항목 줄이 섹션에 이미 있을 때 삽입하지 않는다 (중단된 추가 재시도용).
+    """
+    day = doc.ensure_day(date)
+
+    # 같은 이름이 연속되면 마지막 섹션 (다른 섹션이 나오면 종료)
+    target = None
+    for node in day.children:
+        if node.key == section:
+            target = node
+        elif target is not None:
+            break
+    if target is None:
+        raise ValueError(f"{day.key}에서 '{section}' 섹션을 찾을 수 없습니다.")
+
+    # 항목 추가 위치 결정 (섹션의 마지막 항목 다음, 구분선 전)
+    insert_idx = 1
+    for i in range(1, len(target.lines)):
+        line = target.lines[i].strip()
+        if line == "---":
+            break
+        if line.startswith("-") or line == "":
+            insert_idx = i + 1
+        else:
+            break
 
-    content = file_path.read_text(encoding="utf-8")
-    lines = content.split("\n")
+    # 현재 시간 타임스탬프 생성
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    item = format_item(item, timestamp)
 
-    date_str = date.strftime("%Y-%m-%d")
-    date_pattern = re.compile(r"^####\s+(\d{4}-\d{2}-\d{2})")
-    section_pattern = re.compile(r"^#####\s+(.+)")
+    if skip_existing and item in target.lines:
+        return item
 
-    # 날짜 섹션 찾기
-    date_line_idx = -1
-    for i, line in enumerate(lines):
-        match = date_pattern.match(line)
-        if match and match.group(1) == date_str:
-            date_line_idx = i
+    # 대기열에 늦게 도착한 요청도 섹션 안에서 타임스탬프 순서를 지키도록, 더 늦은 시각의 항목 앞에 넣음
+    while insert_idx > 1:
+        match = ITEM_PATTERN.match(target.lines[insert_idx - 1])
+        if not match or not match.group(1) or match.group(1) <= timestamp:
             break
+        insert_idx -= 1
 
-    # 날짜 섹션이 없으면 생성
-    if date_line_idx == -1:
-        insert_pos, _, _ = find_insert_position(content, date)
-        template = generate_day_template(date)
-        lines.insert(insert_pos, "")
-        lines.insert(insert_pos + 1, template)
-        lines.insert(insert_pos + 2, "")
-        lines.insert(insert_pos + 3, "---")
-        content = "\n".join(lines)
-        lines = content.split("\n")
-
-        # 다시 찾기
-        for i, line in enumerate(lines):
-            match = date_pattern.match(line)
-            if match and match.group(1) == date_str:
-                date_line_idx = i
-                break
+    target.lines.insert(insert_idx, item)
+    return item
 
-    # 섹션 찾기
-    section_line_idx = -1
-    next_section_idx = len(lines)
-    in_target_date = False
 
-    for i in range(date_line_idx, len(lines)):
-        line = lines[i]
+def get_write_lock_path(vault_path: Path) -> Path:
+    return get_dailylog_path(vault_path, datetime.now().year).parent / CACHE_DIR_NAME / WRITE_LOCK_NAME
 
-        # 다음 날짜나 구분선을 만나면 종료
-        if i > date_line_idx and (date_pattern.match(line) or line.strip() == "---"):
-            next_section_idx = i
-            break
 
-        section_match = section_pattern.match(line)
-        if section_match:
-            section_name = section_match.group(1).strip()
-            if section_name == section:
-                section_line_idx = i
-            elif section_line_idx != -1:
-                # 다음 섹션 시작
-                next_section_idx = i
-                break
+def get_spool_dir(vault_path: Path) -> Path:
+    return get_dailylog_path(vault_path, datetime.now().year).parent / CACHE_DIR_NAME / WRITE_SPOOL_DIR_NAME
 
-    if section_line_idx == -1:
-        return f"오류: {date_str}에서 '{section}' 섹션을 찾을 수 없습니다."
 
-    # 항목 추가 위치 결정 (섹션의 마지막 항목 다음)
-    insert_idx = section_line_idx + 1
-    for i in range(section_line_idx + 1, next_section_idx):
-        line = lines[i].strip()
-        if line.startswith("-") or line == "":
-            insert_idx = i + 1
+@contextmanager
+def write_lock(vault_path: Path) -> Iterator[None]:
+    """데일리로그 파일 쓰기 잠금 (프로세스 간 advisory lock, 같은 프로세스에서 중첩 금지)
+
+    fcntl이 없는 Windows에서는 msvcrt로 잠금 파일의 첫 바이트를 잠근다.
+    """
+    lock_path = get_write_lock_path(vault_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
         else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK은 10초 동안 재시도한 뒤 실패하므로 다시 대기
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def apply_add_requests(vault_path: Path, requests: list[list], recovered: Iterable[int] = ()) -> list[dict]:
+    """추가 요청 여러 건을 연도(월) 파일별로 한 번만 읽고 한 번만 저장하여 반영
+
+    requests: [[[날짜, 섹션, 내용, 타임스탬프], ...], ...] - 요청 순서, 요청 안의 순서대로 삽입된다.
+    recovered: 중단된 이전 처리에서 일부 파일에 이미 반영되었을 수 있는 요청 번호
+    (같은 타임스탬프의 같은 항목 줄이 있으면 다시 넣지 않음).
+    반환: 요청별 {"ok": True, "messages": [...]} 또는 {"ok": False, "error": ...}.
+    오류가 난 요청은 통째로 빼고 나머지 요청만 반영한다. 파일 저장이 중간에 실패하면
+    저장된 파일에 들어간 요청만 성공으로 알린다. write_lock 안에서 호출해야 한다.
+    """
+    recovered = set(recovered)
+    results = [None] * len(requests)
+    while True:
+        by_file = defaultdict(list)
+        for i, records in enumerate(requests):
+            if results[i] is not None:
+                continue
+            try:
+                paths = [get_write_path(vault_path, datetime.strptime(r[0], "%Y-%m-%d")) for r in records]
+            except ValueError as e:
+                results[i] = {"ok": False, "error": str(e)}
+                continue
+            for file_path, record in zip(paths, records):
+                by_file[file_path].append((i, record))
+
+        # 모든 파일의 변경 내용을 메모리에서 먼저 완성한 뒤 저장
+        pending = []
+        new_shards = []
+        messages = defaultdict(list)
+        failed = False
+        for file_path, file_records in by_file.items():
+            with profile_phase("read"):
+                if file_path.exists():
+                    content, newline = read_text_newline(file_path)
+                else:
+                    # 분할된 연도의 새 월 - 월 헤더만 있는 파일로 시작
+                    content, newline = f"## {int(file_records[0][1][0][5:7])}월\n\n", "\n"
+                    new_shards.append(file_path)
+            with profile_phase("parse"):
+                doc = DailylogDocument(content)
+            if PROFILER is not None:
+                PROFILER.add_file(file_path, len(content.encode("utf-8")))
+                PROFILER.entries += len(doc.days)
+            with profile_phase("filter"):
+                for i, (date_str, section, item, timestamp) in file_records:
+                    try:
+                        item_line = insert_item(doc, datetime.strptime(date_str, "%Y-%m-%d"), section, item,
+                                                timestamp, skip_existing=i in recovered)
+                    except ValueError as e:
+                        results[i] = {"ok": False, "error": str(e)}
+                        failed = True
+                        break
+                    messages[i].append(f"{date_str} > {section}\n{item_line}")
+            if failed:
+                break
+            with profile_phase("format"):
+                pending.append((file_path, doc.serialize().replace("\n", newline)))
+
+        if not failed:
             break
+        # 실패한 요청을 빼고 원본부터 다시 적용 (드문 경우)
+
+    written = set()
+    write_error = None
+    try:
+        with profile_phase("write"):
+            for file_path, new_content in pending:
+                write_text_atomic(file_path, new_content, newline="")
+                # 월 파일을 먼저 쓰고 manifest에 등록 (manifest가 없는 파일을 가리키지 않도록)
+                if file_path in new_shards:
+                    register_shard(file_path)
+                written.add(file_path)
+    except OSError as e:
+        write_error = e
+
+    for i, result in enumerate(results):
+        if result is not None:
+            continue
+        paths = {file_path for file_path, file_records in by_file.items() if any(j == i for j, _ in file_records)}
+        if paths <= written:
+            results[i] = {"ok": True, "messages": messages[i]}
+        elif paths & written:
+            landed = [file_path.name for file_path in sorted(paths & written)]
+            results[i] = {"ok": False, "error": f"{write_error} (일부 항목은 이미 추가됨: {', '.join(landed)})"}
+        else:
+            results[i] = {"ok": False, "error": str(write_error)}
+    return results
 
-    # 현재 시간 타임스탬프 생성
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # 항목 형식 정리 (타임스탬프 포함)
-    if item.startswith("-"):
-        item = item[1:].strip()  # 앞의 - 제거
-    item = f"- {timestamp} {item}"
+def drain_add_queue(vault_path: Path) -> None:
+    """대기열에 쌓인 추가 요청을 모두 한 번에 반영하고 요청별 결과 파일 기록 (write_lock 안에서 호출)
+
+    요청 파일은 반영 전에 *.applying으로 이름을 바꿔 두고, 결과를 기록한 뒤 지운다.
+    처리 중 프로세스가 죽어 남은 *.applying 요청은 다음 처리에서 이미 들어간 항목을 건너뛰며 다시 반영한다.
+    """
+    spool_dir = get_spool_dir(vault_path)
+    recovered_paths = {p for p in spool_dir.glob("*.applying") if not p.name.startswith(".")}
+    for request_path in spool_dir.glob("*.json"):
+        if not request_path.name.startswith("."):
+            request_path.rename(request_path.with_suffix(".applying"))
+    request_paths = sorted((p for p in spool_dir.glob("*.applying") if not p.name.startswith(".")),
+                           key=lambda p: p.name)
+    requests = []
+    for request_path in request_paths:
+        try:
+            requests.append(json.loads(request_path.read_text(encoding="utf-8"))["records"])
+        except (OSError, ValueError, KeyError, TypeError):
+            requests.append(None)
+
+    valid = [i for i, records in enumerate(requests) if records is not None]
+    results = [{"ok": False, "error": "요청 파일을 읽을 수 없습니다."}] * len(requests)
+    try:
+        applied = apply_add_requests(vault_path, [requests[i] for i in valid],
+                                     [n for n, i in enumerate(valid) if request_paths[i] in recovered_paths])
+    except (OSError, ValueError) as e:
+        # 파일을 쓰기 전의 읽기 실패 등은 대기 중인 요청 모두에 알림 (다음 잠금 보유자가 다시 시도하지 않도록)
+        applied = [{"ok": False, "error": str(e)}] * len(valid)
+    for i, result in zip(valid, applied):
+        results[i] = result
+
+    for request_path, result in zip(request_paths, results):
+        write_json_atomic(request_path.with_suffix(".result"), result)
+        request_path.unlink()
+
+    # 요청한 프로세스가 가져가지 않은 오래된 결과 정리
+    expire = time.time() - SPOOL_RESULT_TTL
+    for result_path in spool_dir.glob("*.result"):
+        try:
+            if result_path.stat().st_mtime < expire:
+                result_path.unlink()
+        except OSError:
+            pass
+
+
+def add_items(vault_path: Path, records: list[tuple[datetime, str, str]]) -> list[str]:
+    """여러 항목을 연도 파일별로 한 번만 읽고 한 번만 저장하여 추가
+
+    records: [(날짜, 섹션, 내용), ...] - 입력 순서대로 삽입된다.
+    반환: 항목별 결과 메시지. 하나라도 오류가 있으면 이 요청의 항목은 하나도
+    추가하지 않고 ValueError를 발생시킨다.
+
+    여러 프로세스가 동시에 추가해도 항목이 사라지지 않도록 요청을 대기열 폴더에 넣은 뒤
+    쓰기 잠금을 기다린다. 잠금을 얻은 프로세스가 그동안 쌓인 요청을 모두 모아 파일마다
+    한 번만 다시 쓰므로, 잠금을 얻었을 때 이미 처리된 요청은 결과만 읽고 끝난다.
+    """
+    for _, section, _ in records:
+        if section not in SECTIONS:
+            raise ValueError(f"유효하지 않은 섹션입니다. 사용 가능: {', '.join(SECTIONS)}")
+    if not records:
+        return []
+
+    # 타임스탬프는 잠금을 기다린 시간과 관계없이 요청 시각으로 고정
+    # (대기열 파일 이름과 같은 시각을 사용하므로 처리 순서가 타임스탬프 순서와 같다)
+    requested_ns = time.time_ns()
+    timestamp = datetime.fromtimestamp(requested_ns // 1_000_000_000).strftime("%Y-%m-%d %H:%M:%S")
+    spool_dir = get_spool_dir(vault_path)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    request_path = spool_dir / f"{requested_ns:020d}-{os.getpid()}-{os.urandom(4).hex()}.json"
+    write_json_atomic(request_path, {
+        "records": [[date.strftime("%Y-%m-%d"), section, item, timestamp] for date, section, item in records],
+    })
+
+    result_path = request_path.with_suffix(".result")
+    with write_lock(vault_path):
+        if not result_path.exists():
+            drain_add_queue(vault_path)
+        result = json.loads(result_path.read_text(encoding="utf-8"))
+        result_path.unlink()
+
+    if not result["ok"]:
+        raise ValueError(result["error"])
+    return result["messages"]
+
+
+def add_item(vault_path: Path, date: datetime, section: str, item: str) -> str:
+    """데일리로그에 항목 추가"""
+    try:
+        message = add_items(vault_path, [(date, section, item)])[0]
+    except ValueError as e:
+        return f"오류: {e}"
+    return f"항목이 추가되었습니다: {message}"
+
 
-    lines.insert(insert_idx, item)
+def read_batch_records(source: str) -> list[tuple[datetime, str, str]]:
+    """JSONL 파일(또는 '-'이면 stdin)에서 (날짜, 섹션, 내용) 레코드 읽기
 
-    # 파일 저장
-    new_content = "\n".join(lines)
-    file_path.write_text(new_content, encoding="utf-8")
+    각 줄 형식: {"date": "2026-01-15", "section": "회사", "item": "내용"}
+    date는 생략하면 today이며 parse_date가 지원하는 형식을 모두 허용한다.
+    """
+    if source == "-":
+        text = sys.stdin.read()
+    else:
+        text = Path(source).read_text(encoding="utf-8")
+
+    records = []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            date = parse_date(record.get("date", "today"))
+            records.append((date, record["section"], record["item"]))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"{line_no}번째 줄을 해석할 수 없습니다: {e}")
+    return records
+
+
+def add_batch(vault_path: Path, source: str) -> str:
+    """JSONL 레코드를 일괄 추가"""
+    try:
+        messages = add_items(vault_path, read_batch_records(source))
+    except (OSError, ValueError) as e:
+        return f"오류: {e}"
+    if not messages:
+        return "추가할 항목이 없습니다."
+    return f"{len(messages)}개 항목이 추가되었습니다:\n" + "\n".join(messages)
+
+
+def split_month_shards(text: str, year: int) -> tuple[str, list[tuple[int, str]]]:
+    """연도 파일 원문을 (preamble, [(월, 월 원문), ...])으로 분할 (이어 붙이면 원문과 같음)
+
+    월 헤더(## M월)마다 나누며, 분할하면 데이터가 어긋나는 파일은 ValueError.
+    """
+    starts = []
+    pos = 0
+    for line in text.split("\n"):
+        match = MONTH_HEADER_PATTERN.match(line)
+        if match:
+            starts.append((pos, int(match.group(1))))
+        pos += len(line) + 1
+    if not starts:
+        raise ValueError("월 헤더(## M월)가 없어 월별로 나눌 수 없습니다.")
+
+    preamble = text[:starts[0][0]]
+    if any(DAY_HEADER_PATTERN.match(line) for line in preamble.split("\n")):
+        raise ValueError("첫 월 헤더 앞에 날짜 항목이 있어 월별로 나눌 수 없습니다.")
+
+    shards = []
+    for i, (start, month) in enumerate(starts):
+        end = starts[i + 1][0] if i + 1 < len(starts) else len(text)
+        if any(month == other for other, _ in shards):
+            raise ValueError(f"{month}월 헤더가 두 번 이상 있어 월별로 나눌 수 없습니다.")
+        shard_text = text[start:end]
+        for line in shard_text.split("\n"):
+            match = DAY_HEADER_PATTERN.match(line)
+            if match and match.group(1)[:7] != f"{year}-{month:02d}":
+                raise ValueError(f"{match.group(1)} 항목이 {month}월 아래에 있어 월별로 나눌 수 없습니다.")
+        shards.append((month, shard_text))
+    return preamble, shards
+
+
+def register_shard(shard_path: Path) -> None:
+    """새 월 파일을 manifest에 등록 (최신 월 먼저 순서 유지)"""
+    shard_dir = shard_path.parent
+    manifest = load_manifest(shard_dir)
+    if shard_path.name not in manifest["shards"]:
+        manifest["shards"] = sorted([*manifest["shards"], shard_path.name], reverse=True)
+        write_json_atomic(shard_dir / SHARD_MANIFEST_NAME, manifest)
+
+
+def remove_caches(file_path: Path) -> None:
+    """파일에 딸린 캐시(.dailylog-cache/{이름}.*.json) 삭제"""
+    for cache_path in (file_path.parent / CACHE_DIR_NAME).glob(f"{file_path.stem}.*.json"):
+        try:
+            cache_path.unlink()
+        except OSError:
+            pass
+
+
+def migrate_year(vault_path: Path, year: int) -> str:
+    """연도 파일을 월별 파일 + manifest로 분할
+
+    월 파일을 모두 쓴 뒤 manifest를 쓰고 마지막에 연도 파일을 지운다.
+    manifest가 있으면 분할된 것으로 보므로 중간에 실패해도 읽기 결과는 같다.
+    """
+    file_path = get_dailylog_path(vault_path, year)
+    shard_dir = get_shard_dir(vault_path, year)
+    if load_manifest(shard_dir):
+        raise ValueError(f"{year}년은 이미 월별로 나뉘어 있습니다: {shard_dir}")
+    if not file_path.exists():
+        raise ValueError(f"데일리로그 파일이 존재하지 않습니다: {file_path}")
+
+    # 개행을 정규화하지 않고 그대로 나눠 compact로 바이트 단위 복원이 가능하게 함
+    text = file_path.read_bytes().decode("utf-8")
+    preamble, shards = split_month_shards(text, year)
+
+    names = []
+    for month, shard_text in shards:
+        name = f"{year}-{month:02d}.md"
+        write_text_atomic(shard_dir / name, shard_text, newline="")
+        names.append(name)
+    write_json_atomic(shard_dir / SHARD_MANIFEST_NAME, {
+        "version": SHARD_MANIFEST_VERSION,
+        "year": year,
+        "preamble": preamble,
+        "shards": names,
+    })
+    file_path.unlink()
+    remove_caches(file_path)
+    return f"{year}년: {len(names)}개 월 파일로 분할했습니다: {shard_dir}"
+
+
+def compact_year(vault_path: Path, year: int) -> str:
+    """월별 파일을 연도 파일 하나로 합치고 분할 폴더 정리
+
+    연도 파일을 먼저 쓴 뒤 manifest, 월 파일 순서로 지운다.
+    """
+    file_path = get_dailylog_path(vault_path, year)
+    shard_dir = get_shard_dir(vault_path, year)
+    manifest = load_manifest(shard_dir)
+    if not manifest:
+        raise ValueError(f"{year}년은 월별로 나뉘어 있지 않습니다.")
+
+    parts = [manifest["preamble"]]
+    for name in manifest["shards"]:
+        # 나중에 추가된 월 파일이 개행 없이 끝나면 다음 월 헤더가 붙지 않도록 개행 보충
+        if parts[-1] and not parts[-1].endswith("\n"):
+            parts[-1] += "\n"
+        parts.append((shard_dir / name).read_bytes().decode("utf-8"))
+    write_text_atomic(file_path, "".join(parts), newline="")
+
+    (shard_dir / SHARD_MANIFEST_NAME).unlink()
+    for name in manifest["shards"]:
+        shard_path = shard_dir / name
+        remove_caches(shard_path)
+        if shard_path.exists():
+            shard_path.unlink()
+    for path in (shard_dir / CACHE_DIR_NAME, shard_dir):
+        try:
+            path.rmdir()
+        except OSError:
+            pass  # 사용자가 둔 다른 파일이 있으면 폴더 유지
+    remove_caches(file_path)
+    return f"{year}년: {len(manifest['shards'])}개 월 파일을 합쳤습니다: {file_path}"
+
+
+def convert_layout(vault_path: Path, command: str, year: Optional[int] = None) -> str:
+    """migrate/compact를 지정 연도(없으면 해당되는 모든 연도)에 실행"""
+    log_dir = get_dailylog_path(vault_path, datetime.now().year).parent
+    if year is not None:
+        years = [year]
+    else:
+        try:
+            names = os.listdir(log_dir)
+        except OSError:
+            names = []
+        pattern = DAILYLOG_FILENAME_PATTERN if command == "migrate" else SHARD_DIR_PATTERN
+        years = sorted(int(m.group(1)) for m in map(pattern.match, names) if m)
+        if command == "migrate":
+            years = [y for y in years if not load_manifest(get_shard_dir(vault_path, y))]
+        else:
+            years = [y for y in years if load_manifest(get_shard_dir(vault_path, y))]
+        if not years:
+            return "변환할 연도가 없습니다."
 
-    return f"항목이 추가되었습니다: {date_str} > {section}\n{item}"
+    convert = migrate_year if command == "migrate" else compact_year
+    result = []
+    # 변환 중에 add가 옛 경로에 쓰지 않도록 쓰기 잠금을 잡고 실행
+    with write_lock(vault_path):
+        for y in years:
+            try:
+                result.append(convert(vault_path, y))
+            except (OSError, ValueError) as e:
+                result.append(f"오류: {y}년: {e}")
+    return "\n".join(result)
 
 
-def generate_summary(vault_path: Path, start_date: datetime, end_date: datetime) -> str:
+def generate_summary(vault_path: Path, start_date: datetime, end_date: datetime,
+                     use_cache: bool = True) -> str:
     """기간별 통계 요약 생성"""
-    # 연도별 파일 수집
-    years = set()
-    current = start_date
-    while current <= end_date:
-        years.add(current.year)
-        current += timedelta(days=1)
-
-    # 모든 항목 수집
-    all_entries = {}
-    for year in sorted(years):
-        file_path = get_dailylog_path(vault_path, year)
-        if file_path.exists():
-            content = file_path.read_text(encoding="utf-8")
-            entries = parse_dailylog(content)
-            all_entries.update(entries)
+    index = load_date_index(vault_path, start_date, end_date, use_cache)
 
     # 기간 내 항목 필터링 및 통계 계산
     section_counts = defaultdict(int)
@@ -381,12 +1521,12 @@ def generate_summary(vault_path: Path, start_date: datetime, end_date: datetime)
     links = []
     days_with_entries = 0
 
-    current = start_date
-    while current <= end_date:
-        date_str = current.strftime("%Y-%m-%d")
-        if date_str in all_entries:
+    with profile_phase("filter"):
+        days = index.range(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+
+    with profile_phase("aggregate"):
+        for date_str, entry in days:
             days_with_entries += 1
-            entry = all_entries[date_str]
 
             for section, items in entry["sections"].items():
                 for item in items:
@@ -395,13 +1535,38 @@ def generate_summary(vault_path: Path, start_date: datetime, end_date: datetime)
                         section_items[section].append(f"{date_str}: {item.strip()}")
 
                         # 링크 추출
-                        link_matches = re.findall(r"\[\[([^\]]+)\]\]", item)
+                        link_matches = LINK_PATTERN.findall(item)
                         for link in link_matches:
                             links.append(f"[[{link}]]")
 
-        current += timedelta(days=1)
-
-    # 요약 출력 생성
+    # 링크 대상이 Vault에 있는지 확인 (파일 이름/별칭 색인)
+    link_status = {}
+    if links:
+        vault_index = load_vault_index(vault_path, use_cache)
+        with profile_phase("aggregate"):
+            for link in dict.fromkeys(links):
+                target = link_target(link[2:-2])
+                if target:
+                    link_status[link] = vault_index.resolve(target)
+
+    with profile_phase("format"):
+        return format_summary(start_date, end_date, days_with_entries, section_counts, section_items, links,
+                              link_status)
+
+
+def format_link_status(status: str, paths: list[str]) -> str:
+    """요약 링크 목록 뒤에 붙일 확인 결과 (연결된 링크는 빈 문자열)"""
+    if status == "dead":
+        return " (없는 문서)"
+    if status == "ambiguous":
+        return f" (대상 {len(paths)}개: {', '.join(paths[:3])}{' 등' if len(paths) > 3 else ''})"
+    return ""
+
+
+def format_summary(start_date: datetime, end_date: datetime, days_with_entries: int,
+                   section_counts: dict, section_items: dict, links: list[str],
+                   link_status: Optional[dict] = None) -> str:
+    """기간 요약 마크다운 생성 (link_status: {"[[링크]]": (상태, 후보 경로)}, VaultIndex.resolve 참고)"""
     total_days = (end_date - start_date).days + 1
 
     result = []
@@ -425,8 +1590,15 @@ def generate_summary(vault_path: Path, start_date: datetime, end_date: datetime)
         unique_links = list(dict.fromkeys(links))  # 중복 제거, 순서 유지
         result.append("### 언급된 문서 링크")
         result.append("")
+        link_status = link_status or {}
+        dead = sum(1 for status, _ in link_status.values() if status == "dead")
+        ambiguous = sum(1 for status, _ in link_status.values() if status == "ambiguous")
+        if dead or ambiguous:
+            result.append(f"> [!warning] 없는 문서 {dead}개, 대상이 여럿인 링크 {ambiguous}개 "
+                          "(`check-links`로 전체 목록 확인)")
+            result.append("")
         for link in unique_links[:20]:  # 최대 20개
-            result.append(f"- {link}")
+            result.append(f"- {link}{format_link_status(*link_status.get(link, ('ok', [])))}")
         if len(unique_links) > 20:
             result.append(f"- ... 외 {len(unique_links) - 20}개")
         result.append("")
@@ -447,7 +1619,1423 @@ def generate_summary(vault_path: Path, start_date: datetime, end_date: datetime)
     return "\n".join(result)
 
 
-def main():
+def count_day_items(entry: dict) -> dict:
+    """하루 항목의 섹션별 개수 (빈 "-" 항목 제외)"""
+    return {
+        section: sum(1 for item in items if item.strip() and item.strip() != "-")
+        for section, items in entry["sections"].items()
+    }
+
+
+def rollup_keys(date_str: str) -> list[str]:
+    """날짜가 속한 집계 키 목록: 주(W:월요일 날짜), 월(M:YYYY-MM), 연(Y:YYYY)"""
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    week_start, _ = get_week_range(date)
+    return [f"W:{week_start.strftime('%Y-%m-%d')}", f"M:{date_str[:7]}", f"Y:{date_str[:4]}"]
+
+
+def apply_day_changes(rollups: dict, old_days: dict, new_days: dict) -> None:
+    """바뀐 날짜의 개수만 빼고 더해 주/월/연 집계를 갱신"""
+    buckets = rollups["buckets"]
+    for date_str in set(old_days) | set(new_days):
+        old_counts = old_days.get(date_str)
+        new_counts = new_days.get(date_str)
+        if old_counts == new_counts:
+            continue
+
+        for key in rollup_keys(date_str):
+            bucket = buckets.setdefault(key, {"days": 0, "sections": {s: 0 for s in SECTIONS}})
+            for counts, sign in ((old_counts, -1), (new_counts, 1)):
+                if counts is None:
+                    continue
+                bucket["days"] += sign
+                for section, count in counts.items():
+                    bucket["sections"][section] = bucket["sections"].get(section, 0) + sign * count
+            if bucket["days"] == 0:
+                del buckets[key]
+
+    rollups["days"] = new_days
+
+
+def load_rollups(file_path: Path, use_cache: bool = True) -> dict:
+    """연도 파일의 주/월/연 집계 로드
+
+    반환: {"days": {날짜: {섹션: 개수}}, "buckets": {집계 키: {"days": 기록일 수, "sections": {섹션: 개수}}}}
+    파일이 바뀌면 날짜별 개수를 이전 집계와 비교하여 바뀐 날짜가 속한 집계만 다시 계산한다.
+    """
+    stat = file_path.stat()
+    cache_path = get_cache_path(file_path, "rollups")
+    cached = load_cache(cache_path) if use_cache else None
+    if cached and cached.get("path") != str(file_path):
+        cached = None
+
+    if cached and (cached.get("mtime_ns"), cached.get("size")) == (stat.st_mtime_ns, stat.st_size):
+        CACHE_STATS["hit"] += 1
+        return cached["data"]
+
+    entries = load_dailylog(file_path, use_cache)
+    new_days = {date_str: count_day_items(entry) for date_str, entry in entries.items()}
+
+    rollups = cached["data"] if cached else {"days": {}, "buckets": {}}
+    apply_day_changes(rollups, rollups["days"], new_days)
+
+    if use_cache:
+        CACHE_STATS["miss"] += 1
+        save_cache(cache_path, {
+            "version": CACHE_VERSION,
+            "path": str(file_path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "data": rollups,
+        })
+    return rollups
+
+
+def load_buckets(vault_path: Path, start_year: int, end_year: int, use_cache: bool = True) -> dict:
+    """기간과 겹치는 연도 파일의 집계를 합쳐 반환 ({집계 키: 집계})"""
+    with profile_phase("aggregate"):
+        merged = {}
+        for _, file_path in find_dailylog_files(vault_path, start_year, end_year):
+            for key, bucket in load_rollups(file_path, use_cache)["buckets"].items():
+                target = merged.setdefault(key, {"days": 0, "sections": {s: 0 for s in SECTIONS}})
+                target["days"] += bucket["days"]
+                for section, count in bucket["sections"].items():
+                    target["sections"][section] = target["sections"].get(section, 0) + count
+    return merged
+
+
+def format_month_table(buckets: dict, month_keys: list[str]) -> list[str]:
+    """월별 섹션 항목 수 표"""
+    lines = [
+        "| 월 | 기록일 | " + " | ".join(SECTIONS) + " | 합계 |",
+        "|----|--------|" + "|".join("------" for _ in SECTIONS) + "|------|",
+    ]
+    for key in month_keys:
+        bucket = buckets.get(key, {"days": 0, "sections": {}})
+        counts = [bucket["sections"].get(section, 0) for section in SECTIONS]
+        lines.append(f"| {key[2:]} | {bucket['days']} | " + " | ".join(str(c) for c in counts) + f" | {sum(counts)} |")
+    return lines
+
+
+def month_keys_between(start_date: datetime, end_date: datetime) -> list[str]:
+    """기간에 걸친 월 집계 키 목록 (M:YYYY-MM)"""
+    month_keys = []
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        month_keys.append(f"M:{year}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return month_keys
+
+
+def generate_year_summary(vault_path: Path, year: int, use_cache: bool = True) -> str:
+    """연간 요약 - 원본 항목 대신 미리 계산된 월/연 집계만 사용"""
+    buckets = load_buckets(vault_path, year, year, use_cache)
+    year_bucket = buckets.get(f"Y:{year}", {"days": 0, "sections": {}})
+    total_days = (datetime(year, 12, 31) - datetime(year, 1, 1)).days + 1
+
+    result = []
+    result.append(f"## 연간 요약: {year}")
+    result.append("")
+    result.append(f"**기간**: {total_days}일 중 {year_bucket['days']}일 기록")
+    result.append("")
+
+    result.append("### 섹션별 항목 수")
+    result.append("")
+    result.append("| 섹션 | 항목 수 |")
+    result.append("|------|---------|")
+    for section in SECTIONS:
+        result.append(f"| {section} | {year_bucket['sections'].get(section, 0)} |")
+    result.append("")
+
+    result.append("### 월별 추이")
+    result.append("")
+    result.extend(format_month_table(buckets, [f"M:{year}-{month:02d}" for month in range(1, 13)]))
+
+    return "\n".join(result)
+
+
+def generate_trend(vault_path: Path, start_date: datetime, end_date: datetime, use_cache: bool = True) -> str:
+    """여러 해에 걸친 월별 섹션 항목 수 추이 (월 단위 집계 사용, 부분 월도 월 전체로 집계)"""
+    buckets = load_buckets(vault_path, start_date.year, end_date.year, use_cache)
+    month_keys = month_keys_between(start_date, end_date)
+
+    result = []
+    result.append(f"## 월별 추이: {start_date.strftime('%Y-%m')} ~ {end_date.strftime('%Y-%m')}")
+    result.append("")
+    result.extend(format_month_table(buckets, month_keys))
+
+    years = [key for key in sorted(buckets) if key.startswith("Y:")
+             and start_date.year <= int(key[2:]) <= end_date.year]
+    if len(years) > 1:
+        result.append("")
+        result.append("### 연도별 합계")
+        result.append("")
+        result.append("| 연도 | 기록일 | " + " | ".join(SECTIONS) + " | 합계 |")
+        result.append("|------|--------|" + "|".join("------" for _ in SECTIONS) + "|------|")
+        for key in years:
+            counts = [buckets[key]["sections"].get(section, 0) for section in SECTIONS]
+            result.append(f"| {key[2:]} | {buckets[key]['days']} | " + " | ".join(str(c) for c in counts)
+                          + f" | {sum(counts)} |")
+
+    return "\n".join(result)
+
+
+def compute_stats(vault_path: Path, start_date: Optional[datetime] = None,
+                  end_date: Optional[datetime] = None, use_cache: bool = True) -> dict:
+    """항목 타임스탬프 기반 활동 통계 (NumPy 배열 연산)
+
+    항목을 (날짜, 섹션, 타임스탬프) 배열로 한 번 모은 뒤 시간대 x 요일 분포,
+    연속 기록/공백, 섹션별 비율을 벡터 연산으로 계산한다.
+    numpy가 없으면 ImportError, 시작일이 종료일보다 늦으면 ValueError.
+    """
+    import numpy as np
+
+    index = load_date_index(vault_path, start_date or datetime(1, 1, 1),
+                            end_date or datetime(9999, 12, 31), use_cache)
+    start_str = start_date.strftime("%Y-%m-%d") if start_date else "0000-00-00"
+    end_str = end_date.strftime("%Y-%m-%d") if end_date else "9999-99-99"
+
+    section_numbers = {section: i for i, section in enumerate(SECTIONS)}
+    item_days, item_sections, stamps = [], [], []
+    for date_str, entry in index.range(start_str, end_str):
+        for section, items in entry["sections"].items():
+            for item in items:
+                timestamp, text = split_item(item)
+                if not text:
+                    continue
+                item_days.append(date_str)
+                item_sections.append(section_numbers[section])
+                if timestamp:
+                    stamps.append(timestamp)
+
+    with profile_phase("aggregate"):
+        days = np.array(item_days, dtype="datetime64[D]").astype(np.int64)
+        sections = np.array(item_sections, dtype=np.int64)
+        stamps = np.array(stamps, dtype="datetime64[s]")
+
+        # 시간대 x 요일 (항목을 추가한 시각 기준, 1970-01-01은 목요일)
+        stamp_days = stamps.astype("datetime64[D]")
+        hours = (stamps - stamp_days).astype("timedelta64[h]").astype(np.int64)
+        weekdays = (stamp_days.astype(np.int64) + 3) % 7
+        heatmap = np.bincount(hours * 7 + weekdays, minlength=24 * 7).reshape(24, 7)
+
+        def day_str(ordinal) -> str:
+            return str(np.datetime64(int(ordinal), "D"))
+
+        # 기간: 시작일 기본값은 첫 항목 날짜, 종료일 기본값은 오늘 (미래 날짜 항목이 있으면 그 날짜)
+        today = np.datetime64(datetime.now().date(), "D").astype(np.int64)
+        first = np.datetime64(start_date.date(), "D").astype(np.int64) if start_date else (days.min() if days.size else today)
+        last = np.datetime64(end_date.date(), "D").astype(np.int64) if end_date else max(today, days.max() if days.size else today)
+        if first > last:
+            raise ValueError(f"시작일({day_str(first)})이 종료일({day_str(last)})보다 늦습니다.")
+        total_days = int(last - first + 1)
+
+        # 연속 기록: 항목이 있는 날짜의 차이가 1보다 크면 끊김
+        active = np.unique(days)
+        longest = {"days": 0, "start": None, "end": None}
+        gaps = {"count": 0, "mean_days": 0.0, "longest": {"days": 0, "start": None, "end": None}}
+        current = 0
+        if active.size:
+            diffs = np.diff(active)
+            breaks = np.flatnonzero(diffs > 1)
+            run_starts = np.concatenate(([0], breaks + 1))
+            run_ends = np.concatenate((breaks, [active.size - 1]))
+            lengths = run_ends - run_starts + 1
+            best = int(np.argmax(lengths))
+            longest = {"days": int(lengths[best]), "start": day_str(active[run_starts[best]]),
+                       "end": day_str(active[run_ends[best]])}
+            # 현재 연속: 기간 마지막 날(또는 그 전날)까지 이어지는 마지막 연속 기록
+            if active[-1] >= last - 1:
+                current = int(lengths[-1])
+
+            gap_lengths = diffs[breaks] - 1
+            if gap_lengths.size:
+                widest = int(np.argmax(gap_lengths))
+                gaps = {
+                    "count": int(gap_lengths.size),
+                    "mean_days": round(float(gap_lengths.mean()), 1),
+                    "longest": {"days": int(gap_lengths[widest]), "start": day_str(active[breaks[widest]] + 1),
+                                "end": day_str(active[breaks[widest] + 1] - 1)},
+                }
+
+        counts = np.bincount(sections, minlength=len(SECTIONS))
+        weeks = max(total_days / 7, 1)
+        section_stats = {
+            section: {
+                "items": int(counts[i]),
+                "share": round(float(counts[i] / max(counts.sum(), 1) * 100), 1),
+                "per_active_day": round(float(counts[i] / max(active.size, 1)), 2),
+                "per_week": round(float(counts[i] / weeks), 2),
+            }
+            for i, section in enumerate(SECTIONS)
+        }
+
+    return {
+        "type": "stats",
+        "start": day_str(first),
+        "end": day_str(last),
+        "total_days": total_days,
+        "active_days": int(active.size),
+        "items": int(days.size),
+        "timestamped_items": int(stamps.size),
+        "heatmap": {"weekdays": WEEKDAYS_KO, "hours": heatmap.tolist()},
+        "streaks": {"longest": longest, "current": current},
+        "gaps": gaps,
+        "sections": section_stats,
+    }
+
+
+def format_stats(stats: dict) -> str:
+    """활동 통계를 마크다운으로 변환"""
+    result = []
+    result.append(f"## 활동 통계: {stats['start']} ~ {stats['end']}")
+    result.append("")
+    result.append(f"**기간**: {stats['total_days']}일 중 {stats['active_days']}일 기록, "
+                  f"항목 {stats['items']}개 (타임스탬프 {stats['timestamped_items']}개)")
+    result.append("")
+
+    result.append("### 시간대 x 요일 (항목 추가 시각)")
+    result.append("")
+    result.append("| 시 | " + " | ".join(WEEKDAYS_KO) + " | 합계 |")
+    result.append("|----|" + "|".join("----" for _ in WEEKDAYS_KO) + "|------|")
+    for hour, row in enumerate(stats["heatmap"]["hours"]):
+        if any(row):
+            result.append(f"| {hour:02d} | " + " | ".join(str(c) for c in row) + f" | {sum(row)} |")
+    totals = [sum(column) for column in zip(*stats["heatmap"]["hours"])]
+    result.append("| 합계 | " + " | ".join(str(c) for c in totals) + f" | {sum(totals)} |")
+    result.append("")
+
+    longest = stats["streaks"]["longest"]
+    widest = stats["gaps"]["longest"]
+    result.append("### 연속 기록")
+    result.append("")
+    if longest["days"]:
+        result.append(f"- 최장 연속: {longest['days']}일 ({longest['start']} ~ {longest['end']})")
+    result.append(f"- 현재 연속: {stats['streaks']['current']}일")
+    if widest["days"]:
+        result.append(f"- 최장 공백: {widest['days']}일 ({widest['start']} ~ {widest['end']})")
+        result.append(f"- 공백 {stats['gaps']['count']}회, 평균 {stats['gaps']['mean_days']}일")
+    result.append("")
+
+    result.append("### 섹션별")
+    result.append("")
+    result.append("| 섹션 | 항목 수 | 비율 | 기록일당 | 주당 |")
+    result.append("|------|---------|------|----------|------|")
+    for section, values in stats["sections"].items():
+        result.append(f"| {section} | {values['items']} | {values['share']}% | "
+                      f"{values['per_active_day']} | {values['per_week']} |")
+
+    return "\n".join(result)
+
+
+def split_item(item: str) -> tuple[str, str]:
+    """항목 줄을 (타임스탬프, 내용)으로 분리 (타임스탬프가 없으면 빈 문자열)"""
+    match = ITEM_PATTERN.match(item)
+    if not match:
+        return "", item.strip()
+    return match.group(1) or "", match.group(2).strip()
+
+
+def tokenize(text: str) -> list[str]:
+    """검색용 토큰 생성 - 단어마다 글자 bigram (한 글자 단어는 그대로)"""
+    tokens = []
+    for word in SEARCH_WORD_PATTERN.findall(text.lower()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def index_tokens(text: str) -> set[str]:
+    """색인용 토큰 - tokenize의 bigram에 단어 속 글자 하나짜리 토큰을 더함
+
+    한 글자 검색어("책")도 긴 단어("책상") 안에서 찾을 수 있도록 모든 글자를 색인한다.
+    """
+    tokens = set(tokenize(text))
+    for word in SEARCH_WORD_PATTERN.findall(text.lower()):
+        tokens.update(word)
+    return tokens
+
+
+def build_search_index(file_path: Path, use_cache: bool = True) -> dict:
+    """연도 파일의 항목으로 역색인 생성
+
+    반환: {"items": [[날짜, 요일, 섹션, 내용], ...], "postings": {토큰: [항목 번호, ...]}}
+    """
+    items = []
+    postings = defaultdict(list)
+    for date_str, entry in sorted(load_dailylog(file_path, use_cache).items()):
+        for section, section_items in entry["sections"].items():
+            for item in section_items:
+                _, text = split_item(item)
+                if not text:
+                    continue
+                item_id = len(items)
+                items.append([date_str, entry["weekday"], section, text])
+                for token in index_tokens(text):
+                    postings[token].append(item_id)
+    return {"items": items, "postings": postings}
+
+
+def load_search_index(file_path: Path, use_cache: bool = True) -> dict:
+    """연도 파일의 검색 색인 로드 (파일이 바뀐 연도만 다시 색인)"""
+    return load_derived(file_path, "search", build_search_index, use_cache)
+
+
+def find_search_hits(vault_path: Path, query: str, section: Optional[str] = None,
+                     start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                     use_cache: bool = True) -> list[tuple]:
+    """역색인으로 항목을 검색하여 관련도순 (점수, 날짜, 요일, 섹션, 내용) 목록 반환
+
+    모든 질의 토큰을 포함하는 항목을 후보로 고른 뒤, 질의 단어가 실제로 들어 있는지
+    확인하고 TF-IDF 점수(동점이면 최신 날짜 우선)로 정렬한다.
+    """
+    query_tokens = tokenize(query)
+    # 질의 단어도 색인과 같은 단어 패턴으로 나눔 (문장 부호가 붙은 단어도 찾도록)
+    query_words = SEARCH_WORD_PATTERN.findall(query.lower())
+    if not query_tokens:
+        raise ValueError("검색어가 비어 있습니다.")
+
+    start_str = start_date.strftime("%Y-%m-%d") if start_date else "0000-00-00"
+    end_str = end_date.strftime("%Y-%m-%d") if end_date else "9999-99-99"
+    start_year = start_date.year if start_date else 1
+    end_year = end_date.year if end_date else 9999
+
+    unique_tokens = set(query_tokens)
+    indexes = [load_search_index(file_path, use_cache)
+               for _, file_path in find_dailylog_files(vault_path, start_year, end_year)]
+
+    with profile_phase("aggregate"):
+        # 연도 파일 전체 기준 문서 빈도 (연도마다 점수 척도가 달라지지 않도록)
+        total = sum(len(index["items"]) for index in indexes)
+        doc_freq = {token: sum(len(index["postings"].get(token, ())) for index in indexes)
+                    for token in unique_tokens}
+
+        hits = []
+        for index in indexes:
+            postings = index["postings"]
+            if any(token not in postings for token in unique_tokens):
+                continue
+
+            # 가장 짧은 posting부터 교집합
+            token_lists = sorted((postings[t] for t in unique_tokens), key=len)
+            candidates = set(token_lists[0])
+            for ids in token_lists[1:]:
+                candidates.intersection_update(ids)
+                if not candidates:
+                    break
+
+            for item_id in candidates:
+                date_str, weekday, item_section, text = index["items"][item_id]
+                if not (start_str <= date_str <= end_str):
+                    continue
+                if section and item_section != section:
+                    continue
+                lowered = text.lower()
+                if any(word not in lowered for word in query_words):
+                    continue
+                item_tokens = tokenize(text)
+                score = sum(
+                    # 한 글자 토큰은 bigram 목록에 없으므로 글자 수로 셈
+                    (lowered.count(token) if len(token) == 1 else item_tokens.count(token))
+                    * math.log(1 + total / doc_freq[token])
+                    for token in unique_tokens
+                ) / math.sqrt(len(item_tokens) or 1)
+                hits.append((score, date_str, weekday, item_section, text))
+
+    hits.sort(key=lambda hit: (hit[0], hit[1]), reverse=True)
+    return hits
+
+
+def search_entries(vault_path: Path, query: str, section: Optional[str] = None,
+                   start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                   limit: int = 20, use_cache: bool = True) -> str:
+    """항목 검색 결과를 마크다운 목록으로 반환"""
+    try:
+        hits = find_search_hits(vault_path, query, section, start_date, end_date, use_cache)
+    except ValueError as e:
+        return f"오류: {e}"
+
+    if not hits:
+        return f"'{query}'에 해당하는 항목이 없습니다."
+
+    result = [f"## 검색 결과: {query} ({len(hits)}건)", ""]
+    for _, date_str, weekday, item_section, text in hits[:limit]:
+        result.append(f"- {date_str} ({weekday}) [{item_section}] {text}")
+    if len(hits) > limit:
+        result.append(f"- ... 외 {len(hits) - limit}건")
+    return "\n".join(result)
+
+
+def link_target(link: str) -> str:
+    """링크 본문에서 대상 문서 이름만 추출 ([[문서#제목|별칭]] -> 문서)"""
+    return link.split("|", 1)[0].split("#", 1)[0].strip()
+
+
+def build_link_graph(file_path: Path, use_cache: bool = True) -> dict:
+    """연도 파일의 [[링크]]를 문서별 언급 목록으로 정리
+
+    반환: {문서: [[날짜, 섹션], ...]} (날짜 오름차순)
+    """
+    graph = defaultdict(list)
+    for date_str, entry in sorted(load_dailylog(file_path, use_cache).items()):
+        for section, items in entry["sections"].items():
+            for item in items:
+                for link in LINK_PATTERN.findall(item):
+                    target = link_target(link)
+                    if target:
+                        graph[target].append([date_str, section])
+    return graph
+
+
+def load_link_graph(file_path: Path, use_cache: bool = True) -> dict:
+    """연도 파일의 링크 그래프 로드 (파일이 바뀐 연도만 다시 생성)"""
+    return load_derived(file_path, "links", build_link_graph, use_cache)
+
+
+def collect_link_mentions(vault_path: Path, start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None, use_cache: bool = True) -> dict:
+    """기간 내 링크 언급을 연도 파일별 링크 그래프에서 모아 반환 ({문서: [[날짜, 섹션], ...]})"""
+    start_str = start_date.strftime("%Y-%m-%d") if start_date else "0000-00-00"
+    end_str = end_date.strftime("%Y-%m-%d") if end_date else "9999-99-99"
+    start_year = start_date.year if start_date else 1
+    end_year = end_date.year if end_date else 9999
+
+    with profile_phase("aggregate"):
+        mentions = defaultdict(list)
+        for _, file_path in find_dailylog_files(vault_path, start_year, end_year):
+            for target, refs in load_link_graph(file_path, use_cache).items():
+                mentions[target].extend(ref for ref in refs if start_str <= ref[0] <= end_str)
+    return mentions
+
+
+def match_note_mentions(mentions: dict, note: str) -> list[tuple[str, str, str]]:
+    """문서 이름(전체 경로 또는 마지막 경로 요소)이 일치하는 언급을 (날짜, 섹션, 문서) 날짜순으로 반환"""
+    wanted = link_target(note.strip("[]")).lower()
+    return sorted(
+        (ref[0], ref[1], target)
+        for target, refs in mentions.items()
+        if target.lower() == wanted or target.lower().rsplit("/", 1)[-1] == wanted
+        for ref in refs
+    )
+
+
+def rank_links(mentions: dict) -> list[tuple[int, str, str]]:
+    """언급 수 내림차순 (언급 수, 마지막 언급 날짜, 문서) 목록"""
+    return sorted(
+        ((len(refs), max(ref[0] for ref in refs), target) for target, refs in mentions.items() if refs),
+        reverse=True,
+    )
+
+
+def find_links(vault_path: Path, note: Optional[str] = None, top: int = 20,
+               start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+               use_cache: bool = True) -> str:
+    """링크 그래프 조회
+
+    note를 주면 해당 문서를 언급한 날짜/섹션 목록(최신순),
+    없으면 가장 많이 언급된 문서 top개를 반환한다.
+    """
+    mentions = collect_link_mentions(vault_path, start_date, end_date, use_cache)
+
+    if note:
+        note = link_target(note.strip("[]"))
+        matched = match_note_mentions(mentions, note)
+        if not matched:
+            return f"[[{note}]]를 언급한 항목이 없습니다."
+
+        result = [f"## [[{note}]] 언급 ({len(matched)}건)", ""]
+        result.append(f"**마지막 언급**: {matched[-1][0]}")
+        result.append("")
+        for date_str, section, target in reversed(matched[-top:] if top else matched):
+            result.append(f"- {date_str} [{section}] [[{target}]]")
+        if top and len(matched) > top:
+            result.append(f"- ... 외 {len(matched) - top}건")
+        return "\n".join(result)
+
+    ranked = rank_links(mentions)
+    if not ranked:
+        return "언급된 문서 링크가 없습니다."
+
+    result = [f"## 많이 언급된 문서 (전체 {len(ranked)}개 중 상위 {min(top, len(ranked))}개)", ""]
+    result.append("| 문서 | 언급 수 | 마지막 언급 |")
+    result.append("|------|---------|-------------|")
+    for count, last_date, target in ranked[:top]:
+        result.append(f"| [[{target}]] | {count} | {last_date} |")
+    return "\n".join(result)
+
+
+def read_frontmatter_aliases(file_path: Path) -> list[str]:
+    """마크다운 문서 YAML frontmatter의 aliases(alias) 목록 (없으면 빈 목록)"""
+    lines = []
+    try:
+        with open(file_path, encoding="utf-8", errors="replace") as f:
+            if f.readline().rstrip("\r\n").lstrip("\ufeff") != "---":
+                return []
+            for line in f:
+                line = line.rstrip("\r\n")
+                if line in ("---", "..."):
+                    break
+                lines.append(line)
+                if len(lines) > FRONTMATTER_MAX_LINES:
+                    return []
+            else:
+                return []
+    except OSError:
+        return []
+
+    aliases = []
+    in_list = False
+    for line in lines:
+        match = FRONTMATTER_ALIAS_PATTERN.match(line)
+        if match:
+            value = match.group(1).strip()
+            if value.startswith("["):
+                aliases.extend(value.strip("[]").split(","))
+            elif value:
+                aliases.append(value)
+            in_list = not value
+        elif in_list:
+            item_match = FRONTMATTER_LIST_ITEM_PATTERN.match(line)
+            if item_match:
+                aliases.append(item_match.group(1))
+            elif line.strip():
+                in_list = False
+    return [alias for alias in (a.strip().strip("'\"").strip() for a in aliases) if alias]
+
+
+def get_vault_index_path(vault_path: Path) -> Path:
+    return get_dailylog_path(vault_path, datetime.now().year).parent / CACHE_DIR_NAME / VAULT_INDEX_NAME
+
+
+def scan_vault_dir(dir_path: Path, cached: Optional[dict]) -> dict:
+    """폴더 하나를 os.scandir로 훑어 {mtime_ns, files, subdirs} 반환
+
+    files: {파일명: [mtime_ns, 크기, 별칭 목록]}. 이전 결과에서 mtime/크기가 같은 문서는
+    frontmatter를 다시 읽지 않는다. 점으로 시작하는 항목(.obsidian, .trash 등)은 제외한다.
+    """
+    old_files = cached["files"] if cached else {}
+    files = {}
+    subdirs = []
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    old = old_files.get(entry.name)
+                    if old and old[0] == stat.st_mtime_ns and old[1] == stat.st_size:
+                        files[entry.name] = old
+                    else:
+                        aliases = read_frontmatter_aliases(Path(entry.path)) if entry.name.endswith(".md") else []
+                        files[entry.name] = [stat.st_mtime_ns, stat.st_size, aliases]
+            except OSError:
+                continue  # 훑는 도중 삭제된 항목
+    return {"mtime_ns": os.stat(dir_path).st_mtime_ns, "files": files, "subdirs": sorted(subdirs)}
+
+
+def refresh_vault_dirs(vault_path: Path, dirs: dict) -> tuple[dict, int]:
+    """폴더별 색인을 갱신하여 (새 색인, 다시 훑은 폴더 수) 반환
+
+    mtime이 그대로인 폴더는 파일 목록을 재사용하고 하위 폴더만 따라 내려간다.
+    (파일 추가/삭제/이름 변경은 폴더 mtime을 바꾸지만, 제자리 저장으로 바뀐 별칭은
+    해당 폴더가 다시 훑어질 때 반영된다.)
+    """
+    new_dirs = {}
+    rescanned = 0
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        dir_path = vault_path / rel if rel else vault_path
+        cached = dirs.get(rel)
+        try:
+            if cached and os.stat(dir_path).st_mtime_ns == cached["mtime_ns"]:
+                info = cached
+            else:
+                info = scan_vault_dir(dir_path, cached)
+                rescanned += 1
+        except OSError:
+            continue  # 삭제되었거나 읽을 수 없는 폴더
+        new_dirs[rel] = info
+        stack.extend(f"{rel}/{name}" if rel else name for name in info["subdirs"])
+    return new_dirs, rescanned
+
+
+class VaultIndex:
+    """Vault 파일 이름/별칭 색인 - [[링크]] 대상을 딕셔너리 조회 한 번으로 확인
+
+    Obsidian처럼 대소문자를 구분하지 않고, .md 문서는 확장자 없이, 첨부 파일은 확장자까지 비교한다.
+    """
+
+    def __init__(self, dirs: dict):
+        self.names = defaultdict(list)    # 소문자 이름 -> [상대 경로, ...]
+        self.aliases = defaultdict(list)  # 소문자 별칭 -> [상대 경로, ...]
+        for rel, info in dirs.items():
+            for name, (_, _, aliases) in info["files"].items():
+                path = f"{rel}/{name}" if rel else name
+                self.names[(name[:-3] if name.endswith(".md") else name).lower()].append(path)
+                for alias in aliases:
+                    self.aliases[alias.lower()].append(path)
+
+    def resolve(self, target: str) -> tuple[str, list[str]]:
+        """링크 대상을 (상태, 후보 경로 목록)으로 확인
+
+        상태: ok(파일 하나), alias(별칭으로만 일치), ambiguous(후보 여럿), dead(없음)
+        "폴더/문서"처럼 경로가 있으면 마지막 이름으로 찾은 뒤 경로 끝이 일치하는 것만 남긴다.
+        """
+        key = target.lower()
+        if key.endswith(".md"):
+            key = key[:-3]
+        folder, _, name = key.rpartition("/")
+        candidates = self.names.get(name, [])
+        if folder:
+            candidates = [path for path in candidates
+                          if ("/" + (path[:-3] if path.endswith(".md") else path).lower()).endswith("/" + key)]
+        if len(candidates) == 1:
+            return "ok", candidates
+        if candidates:
+            return "ambiguous", sorted(candidates)
+
+        candidates = self.aliases.get(key, []) if not folder else []
+        if len(candidates) == 1:
+            return "alias", candidates
+        if candidates:
+            return "ambiguous", sorted(candidates)
+        return "dead", []
+
+
+def load_vault_index(vault_path: Path, use_cache: bool = True, rebuild: bool = False) -> VaultIndex:
+    """캐시된 Vault 색인을 폴더 mtime 기준으로 갱신하여 로드 (rebuild=True면 전체 다시 훑기)"""
+    index_path = get_vault_index_path(vault_path)
+    dirs = {}
+    if use_cache and not rebuild:
+        with profile_phase("read"):
+            cached = load_cache(index_path)
+        if cached and cached.get("root") == str(vault_path) and cached.get("index_version") == VAULT_INDEX_VERSION:
+            dirs = cached["dirs"]
+
+    with profile_phase("parse"):
+        new_dirs, rescanned = refresh_vault_dirs(vault_path, dirs)
+    if rescanned or len(new_dirs) != len(dirs):
+        CACHE_STATS["miss"] += 1
+        if use_cache:
+            with profile_phase("write"):
+                save_cache(index_path, {
+                    "version": CACHE_VERSION,
+                    "index_version": VAULT_INDEX_VERSION,
+                    "root": str(vault_path),
+                    "dirs": new_dirs,
+                })
+    else:
+        CACHE_STATS["hit"] += 1
+
+    with profile_phase("filter"):
+        return VaultIndex(new_dirs)
+
+
+def check_link_targets(vault_index: VaultIndex, mentions: dict) -> list[dict]:
+    """링크 대상마다 확인 결과 레코드 (문제 있는 링크 먼저, 언급 수 내림차순)"""
+    records = []
+    for count, last_date, target in rank_links(mentions):
+        status, paths = vault_index.resolve(target)
+        records.append({"type": "link", "note": target, "status": status, "paths": paths,
+                        "count": count, "last_date": last_date})
+    records.sort(key=lambda r: r["status"] in ("ok", "alias"))
+    return records
+
+
+def check_links(vault_path: Path, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                show_all: bool = False, use_cache: bool = True, rebuild: bool = False) -> str:
+    """기간 내 [[링크]] 중 없는 문서와 대상이 여럿인 링크 보고"""
+    mentions = collect_link_mentions(vault_path, start_date, end_date, use_cache)
+    vault_index = load_vault_index(vault_path, use_cache, rebuild)
+    with profile_phase("aggregate"):
+        records = check_link_targets(vault_index, mentions)
+
+    period = (f"{start_date.strftime('%Y-%m-%d') if start_date else '처음'} ~ "
+              f"{end_date.strftime('%Y-%m-%d') if end_date else '끝'}")
+    if not records:
+        return f"언급된 문서 링크가 없습니다. ({period})"
+
+    dead = [r for r in records if r["status"] == "dead"]
+    ambiguous = [r for r in records if r["status"] == "ambiguous"]
+    result = [f"## 링크 확인: {period}", ""]
+    result.append(f"**링크 대상**: {len(records)}개 중 없는 문서 {len(dead)}개, 대상이 여럿인 링크 {len(ambiguous)}개")
+    result.append("")
+
+    if dead:
+        result.extend(["### 없는 문서", "", "| 문서 | 언급 수 | 마지막 언급 |", "|------|---------|-------------|"])
+        result.extend(f"| [[{r['note']}]] | {r['count']} | {r['last_date']} |" for r in dead)
+        result.append("")
+    if ambiguous:
+        result.extend(["### 대상이 여럿인 링크", "", "| 문서 | 후보 | 마지막 언급 |", "|------|------|-------------|"])
+        result.extend(f"| [[{r['note']}]] | {', '.join(r['paths'])} | {r['last_date']} |" for r in ambiguous)
+        result.append("")
+    if show_all:
+        resolved = [r for r in records if r["status"] in ("ok", "alias")]
+        result.extend(["### 연결된 문서", "", "| 문서 | 파일 | 언급 수 |", "|------|------|---------|"])
+        result.extend(f"| [[{r['note']}]] | {r['paths'][0]}{' (별칭)' if r['status'] == 'alias' else ''} | {r['count']} |"
+                      for r in resolved)
+        result.append("")
+    if not dead and not ambiguous:
+        result.append("모든 링크가 Vault의 문서 하나로 연결됩니다.")
+
+    return "\n".join(result).rstrip("\n")
+
+
+def item_record(date_str: str, weekday: str, section: str, item: str) -> dict:
+    """항목 한 줄을 구조화된 레코드로 변환"""
+    timestamp, text = split_item(item)
+    return {
+        "date": date_str,
+        "weekday": weekday,
+        "section": section,
+        "timestamp": timestamp,
+        "text": text,
+        "links": [link_target(link) for link in LINK_PATTERN.findall(item)],
+    }
+
+
+def iter_day_items(date_str: str, entry: dict) -> Iterator[dict]:
+    """하루 항목을 섹션 순서대로 레코드로 반환 (빈 "-" 항목 제외)"""
+    for section, items in entry["sections"].items():
+        for item in items:
+            if item.strip() and item.strip() != "-":
+                yield item_record(date_str, entry["weekday"], section, item)
+
+
+def iter_read_records(vault_path: Path, start_date: datetime, end_date: datetime,
+                      use_cache: bool = True) -> Iterator[dict]:
+    """기간 내 날짜마다 레코드 하나 (항목 목록과 원문 포함)"""
+    index = load_date_index(vault_path, start_date, end_date, use_cache)
+    for date_str, entry in index.range(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")):
+        yield {
+            "type": "day",
+            "date": date_str,
+            "weekday": entry["weekday"],
+            "items": list(iter_day_items(date_str, entry)),
+            "raw": entry["raw"],
+        }
+
+
+def iter_summary_records(vault_path: Path, start_date: datetime, end_date: datetime,
+                         use_cache: bool = True) -> Iterator[dict]:
+    """기간 내 모든 항목 레코드(잘라내지 않음)를 내보낸 뒤 마지막에 통계 레코드 하나"""
+    index = load_date_index(vault_path, start_date, end_date, use_cache)
+    section_counts = {section: 0 for section in SECTIONS}
+    links = {}
+    days_with_entries = 0
+
+    for date_str, entry in index.range(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")):
+        days_with_entries += 1
+        for record in iter_day_items(date_str, entry):
+            section_counts[record["section"]] = section_counts.get(record["section"], 0) + 1
+            for link in record["links"]:
+                links[link] = links.get(link, 0) + 1
+            yield {"type": "item", **record}
+
+    resolved = {}
+    if links:
+        vault_index = load_vault_index(vault_path, use_cache)
+        resolved = {target: vault_index.resolve(target) for target in links if target}
+
+    yield {
+        "type": "summary",
+        "start": start_date.strftime("%Y-%m-%d"),
+        "end": end_date.strftime("%Y-%m-%d"),
+        "total_days": (end_date - start_date).days + 1,
+        "days_with_entries": days_with_entries,
+        "section_counts": section_counts,
+        "links": links,
+        "dead_links": [target for target, (status, _) in resolved.items() if status == "dead"],
+        "ambiguous_links": {target: paths for target, (status, paths) in resolved.items() if status == "ambiguous"},
+    }
+
+
+def iter_bucket_records(buckets: dict, keys: list[str]) -> Iterator[dict]:
+    """집계 키(M:YYYY-MM, Y:YYYY 등)마다 레코드 하나"""
+    kinds = {"W": "week", "M": "month", "Y": "year"}
+    for key in keys:
+        bucket = buckets.get(key, {"days": 0, "sections": {}})
+        yield {
+            "type": kinds[key[0]],
+            "period": key[2:],
+            "days": bucket["days"],
+            "section_counts": {section: bucket["sections"].get(section, 0) for section in SECTIONS},
+        }
+
+
+def write_records(records: Iterable[dict], fmt: str, out: TextIO) -> None:
+    """레코드를 만들어지는 대로 JSON 배열(json) 또는 한 줄에 하나(ndjson)로 출력"""
+    if fmt == "ndjson":
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return
+
+    out.write("[")
+    for i, record in enumerate(records):
+        out.write(",\n" if i else "\n")
+        out.write(json.dumps(record, ensure_ascii=False))
+    out.write("\n]\n")
+
+
+def get_sqlite_path(vault_path: Path) -> Path:
+    """SQLite 사본 경로"""
+    return get_dailylog_path(vault_path, datetime.now().year).parent / CACHE_DIR_NAME / SQLITE_NAME
+
+
+def sync_sqlite(vault_path: Path, use_cache: bool = True) -> str:
+    """파싱 결과를 SQLite 사본(days, items, links 테이블)에 반영
+
+    날짜별 원문 해시를 비교하여 새로 생기거나 바뀐 날짜만 다시 넣고,
+    데일리로그에서 사라진 날짜는 지운다.
+    """
+    files = find_dailylog_files(vault_path, 1, 9999)
+    log_dir = get_dailylog_path(vault_path, datetime.now().year).parent
+    current = {}  # 날짜 -> (항목, 원본 파일)
+    for (_, file_path), entries in zip(files, load_dailylogs([path for _, path in files], use_cache)):
+        source = str(file_path.relative_to(log_dir))
+        for date_str, entry in entries.items():
+            current[date_str] = (entry, source)
+
+    db_path = get_sqlite_path(vault_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SQLITE_SCHEMA_VERSION:
+            # 스키마가 바뀌었으면 처음부터 다시 만듦 (원본은 언제나 마크다운)
+            conn.executescript("DROP TABLE IF EXISTS days; DROP TABLE IF EXISTS items; DROP TABLE IF EXISTS links;")
+            conn.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+        conn.executescript(SQLITE_SCHEMA)
+
+        with profile_phase("write"):
+            stored = dict(conn.execute("SELECT date, hash FROM days"))
+            added = updated = 0
+            removed = [date_str for date_str in stored if date_str not in current]
+            with conn:
+                for date_str, (entry, source) in sorted(current.items()):
+                    content_hash = hashlib.sha1(f"{source}\n{entry['raw']}".encode("utf-8")).hexdigest()
+                    if stored.get(date_str) == content_hash:
+                        continue
+                    if date_str in stored:
+                        updated += 1
+                    else:
+                        added += 1
+
+                    conn.execute("DELETE FROM days WHERE date = ?", (date_str,))
+                    conn.execute("DELETE FROM items WHERE date = ?", (date_str,))
+                    conn.execute("DELETE FROM links WHERE date = ?", (date_str,))
+                    conn.execute("INSERT INTO days (date, weekday, source, hash, raw) VALUES (?, ?, ?, ?, ?)",
+                                 (date_str, entry["weekday"], source, content_hash, entry["raw"]))
+                    for position, record in enumerate(iter_day_items(date_str, entry)):
+                        item_id = conn.execute(
+                            "INSERT INTO items (date, section, position, timestamp, text) VALUES (?, ?, ?, ?, ?)",
+                            (date_str, record["section"], position, record["timestamp"] or None, record["text"]),
+                        ).lastrowid
+                        conn.executemany("INSERT INTO links (item_id, date, target) VALUES (?, ?, ?)",
+                                         [(item_id, date_str, target) for target in record["links"]])
+
+                for date_str in removed:
+                    conn.execute("DELETE FROM days WHERE date = ?", (date_str,))
+                    conn.execute("DELETE FROM items WHERE date = ?", (date_str,))
+                    conn.execute("DELETE FROM links WHERE date = ?", (date_str,))
+    finally:
+        conn.close()
+
+    return (f"동기화 완료: 추가 {added}일, 갱신 {updated}일, 삭제 {len(removed)}일 "
+            f"(전체 {len(current)}일) - {db_path}")
+
+
+def query_sqlite(vault_path: Path, sql: str) -> Iterator[dict]:
+    """SQLite 사본에 읽기 전용으로 질의하여 행을 {열: 값}으로 하나씩 반환
+
+    SQL 오류는 첫 행을 읽기 전에(호출 시점에) sqlite3.Error로 발생한다.
+    """
+    db_path = get_sqlite_path(vault_path)
+    if not db_path.exists():
+        raise ValueError("SQLite 사본이 없습니다. 먼저 sync를 실행하세요.")
+    conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+    try:
+        conn.execute("PRAGMA query_only = ON")
+        cursor = conn.execute(sql)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    columns = [column[0] for column in cursor.description or []]
+
+    def rows() -> Iterator[dict]:
+        try:
+            for row in cursor:
+                yield dict(zip(columns, row))
+        finally:
+            conn.close()
+
+    return rows()
+
+
+def format_query_table(rows: Iterable[dict]) -> str:
+    """질의 결과를 마크다운 표로 변환"""
+    rows = list(rows)
+    if not rows:
+        return "결과가 없습니다."
+
+    def cell(value) -> str:
+        return "" if value is None else str(value).replace("|", "\\|").replace("\n", " ")
+
+    columns = list(rows[0])
+    result = [
+        "| " + " | ".join(columns) + " |",
+        "|" + "|".join("---" for _ in columns) + "|",
+    ]
+    result.extend("| " + " | ".join(cell(row[column]) for column in columns) + " |" for row in rows)
+    result.append("")
+    result.append(f"({len(rows)}행)")
+    return "\n".join(result)
+
+
+class Inotify:
+    """ctypes 기반 최소 inotify 래퍼 (Linux 전용)
+
+    사용할 수 없는 환경에서는 생성 시 OSError를 발생시킨다.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            init1 = libc.inotify_init1
+        except (OSError, AttributeError, TypeError) as e:
+            raise OSError(f"inotify를 사용할 수 없습니다: {e}")
+        self._libc = libc
+        self.fd = init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, path: Path, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), ctypes.c_uint32(mask))
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(path))
+        return wd
+
+    def read_events(self) -> list[tuple[int, int, str]]:
+        """대기 중인 이벤트를 (wd, mask, 파일명) 목록으로 반환"""
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        header_size = self.EVENT_HEADER.size
+        while offset + header_size <= len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + header_size:offset + header_size + length].rstrip(b"\0")
+            events.append((wd, mask, os.fsdecode(name)))
+            offset += header_size + length
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def is_private_dir(path: Path) -> bool:
+    """현재 사용자 소유이고 다른 사용자가 접근할 수 없는 실제 폴더인지 (심볼릭 링크 제외)"""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def get_server_socket_dir(create: bool = False) -> Optional[Path]:
+    """상주 서버 소켓 폴더 ($XDG_RUNTIME_DIR, 없으면 임시 폴더 아래 사용자 전용 0700 폴더)
+
+    다른 사용자가 먼저 만들었거나 권한이 열려 있는 폴더는 사용하지 않고 None을 반환한다.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and is_private_dir(Path(runtime_dir)):
+        return Path(runtime_dir)
+    sock_dir = Path(tempfile.gettempdir()) / f"dailylog-{os.getuid()}"
+    if create:
+        try:
+            sock_dir.mkdir(mode=0o700)
+        except FileExistsError:
+            pass
+        except OSError:
+            return None
+    return sock_dir if is_private_dir(sock_dir) else None
+
+
+def get_server_socket_path(vault_path: Path, create: bool = False) -> Optional[Path]:
+    """Vault별 상주 서버 소켓 경로 (안전한 소켓 폴더가 없으면 None, get_server_socket_dir 참고)"""
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "getuid"):
+        return None
+    sock_dir = get_server_socket_dir(create)
+    if sock_dir is None:
+        return None
+    digest = hashlib.sha1(str(vault_path).encode("utf-8")).hexdigest()[:12]
+    return sock_dir / f"dailylog-{digest}.sock"
+
+
+def is_own_server(sock_path: Path, sock: socket.socket) -> bool:
+    """소켓 파일과 연결된 서버 프로세스가 현재 사용자 소유인지 확인"""
+    try:
+        st = os.lstat(sock_path)
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        return False
+    if hasattr(socket, "SO_PEERCRED"):
+        # struct ucred {pid_t pid; uid_t uid; gid_t gid;}
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("iII"))
+        _, uid, _ = struct.unpack("iII", creds)
+        return uid == os.getuid()
+    return True
+
+
+def request_server(vault_path: Path, argv: list[str]) -> Optional[dict]:
+    """실행 중인 상주 서버에 명령을 보내고 응답 반환
+
+    서버가 없거나 연결할 수 없거나 다른 사용자의 소켓이면 None (호출 측이 현재 프로세스에서 실행).
+    요청을 보낸 뒤 실패하면 {"ok": False, "sent": True, ...}를 반환한다.
+    """
+    sock_path = get_server_socket_path(vault_path)
+    if sock_path is None or not sock_path.exists():
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(SERVER_TIMEOUT)
+        try:
+            sock.connect(str(sock_path))
+            if not is_own_server(sock_path, sock):
+                return None
+        except OSError:
+            return None
+
+        try:
+            sock.sendall(json.dumps({"argv": argv}, ensure_ascii=False).encode("utf-8") + b"\n")
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            return json.loads(b"".join(chunks).decode("utf-8"))
+        except (OSError, ValueError) as e:
+            return {"ok": False, "sent": True, "error": str(e)}
+
+
+def refresh_resident_file(file_path: Path) -> None:
+    """상주 메모리에서 해당 파일만 버리고 다시 파싱"""
+    RESIDENT_ENTRIES.pop(str(file_path), None)
+    if file_path.exists():
+        load_dailylog(file_path)
+
+
+def handle_server_request(conn: socket.socket, parser: argparse.ArgumentParser, vault_path: Path) -> None:
+    """클라이언트 요청 한 건 처리 (요청/응답 모두 JSON 한 줄)"""
+    conn.settimeout(SERVER_TIMEOUT)
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    if not data:
+        return  # 연결 확인만 하고 닫은 클라이언트
+
+    before = dict(CACHE_STATS)
+    try:
+        request = json.loads(data.decode("utf-8"))
+        args = parser.parse_args(request["argv"])
+        if args.command not in SERVER_COMMANDS:
+            raise ValueError(f"상주 서버에서 처리하지 않는 명령어: {args.command}")
+        out = io.StringIO()
+        run_command(args, vault_path, out)
+        response = {
+            "ok": True,
+            "output": out.getvalue(),
+            "cache": {key: CACHE_STATS[key] - before[key] for key in CACHE_STATS},
+        }
+    except SystemExit:
+        response = {"ok": False, "sent": True, "error": "잘못된 인자"}
+    except Exception as e:
+        response = {"ok": False, "sent": True, "error": str(e)}
+
+    conn.sendall(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+def serve(vault_path: Path) -> None:
+    """파싱 결과를 메모리에 유지하는 상주 서버 실행
+
+    Unix 소켓으로 read/add/summary 요청을 받고, inotify로 데일리로그 폴더를 감시해
+    변경된 연도 파일만 다시 파싱한다. inotify가 없으면 요청마다 mtime/크기로 확인한다.
+    """
+    global RESIDENT_ENTRIES
+
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "getuid"):
+        print("오류: 이 플랫폼은 Unix 소켓을 지원하지 않습니다.")
+        sys.exit(1)
+
+    sock_path = get_server_socket_path(vault_path, create=True)
+    if sock_path is None:
+        print(f"오류: 소켓 폴더가 현재 사용자 전용(0700)이 아닙니다: {tempfile.gettempdir()}/dailylog-{os.getuid()}")
+        sys.exit(1)
+    if sock_path.exists():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(sock_path))
+                print(f"오류: 이미 상주 서버가 실행 중입니다: {sock_path}")
+                sys.exit(1)
+            except OSError:
+                sock_path.unlink()  # 비정상 종료로 남은 소켓
+
+    # 전체 연도 파일 미리 파싱
+    RESIDENT_ENTRIES = {}
+    files = find_dailylog_files(vault_path, 1, 9999)
+    for _, file_path in files:
+        load_dailylog(file_path)
+
+    log_dir = get_dailylog_path(vault_path, datetime.now().year).parent
+    watch_mask = (Inotify.IN_CLOSE_WRITE | Inotify.IN_MOVED_TO | Inotify.IN_MOVED_FROM
+                  | Inotify.IN_CREATE | Inotify.IN_DELETE)
+    watched = {}  # wd -> 감시 중인 폴더 (데일리로그 폴더와 월별 분할 폴더)
+    try:
+        inotify = Inotify()
+        watched[inotify.add_watch(log_dir, watch_mask)] = log_dir
+        for name in os.listdir(log_dir):
+            if SHARD_DIR_PATTERN.match(name) and (log_dir / name).is_dir():
+                watched[inotify.add_watch(log_dir / name, watch_mask)] = log_dir / name
+    except OSError as e:
+        print(f"[serve] 파일 감시 비활성화 (요청마다 변경 확인): {e}", file=sys.stderr)
+        inotify = None
+
+    parser = build_parser()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(sock_path))
+    os.chmod(sock_path, 0o600)
+    server.listen()
+
+    selector = selectors.DefaultSelector()
+    selector.register(server, selectors.EVENT_READ)
+    if inotify:
+        selector.register(inotify.fd, selectors.EVENT_READ)
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"[serve] {len(files)}개 데일리로그 파일 로드, 대기 중: {sock_path}", file=sys.stderr)
+
+    try:
+        while True:
+            for key, _ in selector.select():
+                if key.fileobj is server:
+                    conn, _ = server.accept()
+                    with conn:
+                        try:
+                            handle_server_request(conn, parser, vault_path)
+                        except OSError as e:
+                            print(f"[serve] 요청 처리 실패: {e}", file=sys.stderr)
+                else:
+                    changed = set()
+                    for wd, _, name in inotify.read_events():
+                        directory = watched.get(wd)
+                        if directory is None:
+                            continue
+                        path = directory / name
+                        if directory == log_dir and SHARD_DIR_PATTERN.match(name) and path.is_dir() \
+                                and path not in watched.values():
+                            # migrate로 새로 생긴 분할 폴더도 감시
+                            watched[inotify.add_watch(path, watch_mask)] = path
+                        elif (DAILYLOG_FILENAME_PATTERN.match(name) if directory == log_dir
+                              else SHARD_FILENAME_PATTERN.match(name)):
+                            changed.add(path)
+                    for path in sorted(changed):
+                        refresh_resident_file(path)
+                        print(f"[serve] 다시 파싱: {path.relative_to(log_dir)}", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        selector.close()
+        server.close()
+        if inotify:
+            inotify.close()
+        if sock_path.exists():
+            sock_path.unlink()
+
+
+# watch: 파일 감시 대기 시간(초). 날짜가 바뀌었는지, inotify가 없으면 파일이 바뀌었는지 이 주기로 확인
+WATCH_INTERVAL = 0.5
+
+# watch 파일 감시 이벤트 (원자적 rename 저장과 제자리 저장 모두)
+WATCH_MASK = Inotify.IN_CLOSE_WRITE | Inotify.IN_MOVED_TO | Inotify.IN_CREATE
+
+
+def common_prefix_length(a: bytes, b: bytes) -> int:
+    """두 바이트열의 공통 접두사 길이 (슬라이스 비교 이분 탐색)"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def common_suffix_length(a: bytes, b: bytes, limit: int) -> int:
+    """두 바이트열의 공통 접미사 길이 (limit 이하)"""
+    lo, hi = 0, min(len(a), len(b), limit)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def find_block_start(data: bytes, pos: int) -> int:
+    """pos 이전에서 가장 가까운 날짜 헤더 줄의 시작 오프셋 (없으면 0)"""
+    while pos > 0:
+        pos = data.rfind(b"\n####", 0, pos)
+        if pos < 0:
+            return 0
+        if HEADER_BYTES_PATTERN.match(data, pos + 1):
+            return pos + 1
+    return 0
+
+
+def find_block_end(data: bytes, pos: int) -> int:
+    """pos 이후 처음 나오는 날짜 헤더 줄의 시작 오프셋 (없으면 파일 끝)"""
+    match = HEADER_BYTES_PATTERN.search(data, pos)
+    return match.start() if match else len(data)
+
+
+def diff_new_items(old: bytes, new: bytes) -> list[dict]:
+    """파일 변경 전후 내용에서 새로 생긴 항목 레코드 목록
+
+    공통 접두사/접미사를 제외한 변경 구간을 날짜 블록 단위로 넓혀 그 부분만 파싱하고,
+    (날짜, 섹션)별로 이전에 없던 항목만 반환한다. 내용이 같은 항목이 늘어난 경우도 구분한다.
+    """
+    prefix = common_prefix_length(old, new)
+    suffix = common_suffix_length(old, new, min(len(old), len(new)) - prefix)
+    if prefix == len(old) == len(new):
+        return []
+
+    # 공통 접두사 안에서 찾은 시작 위치는 변경 전후 모두 같다
+    start = find_block_start(new, prefix)
+    old_blocks = parse_dailylog(read_dailylog_text(old[start:find_block_end(old, len(old) - suffix)]))
+    new_blocks = parse_dailylog(read_dailylog_text(new[start:find_block_end(new, len(new) - suffix)]))
+
+    records = []
+    for date_str, entry in new_blocks.items():
+        old_sections = old_blocks[date_str]["sections"] if date_str in old_blocks else {}
+        for section, items in entry["sections"].items():
+            seen = Counter(old_sections.get(section, ()))
+            for item in items:
+                if seen[item]:
+                    seen[item] -= 1
+                elif item.strip() and item.strip() != "-":
+                    records.append({"type": "item", **item_record(date_str, entry["weekday"], section, item)})
+    return records
+
+
+def watch_items(vault_path: Path, out: TextIO) -> None:
+    """오늘 항목을 추가할 파일을 감시하며 새로 추가된 항목을 NDJSON으로 바로 출력
+
+    inotify로 데일리로그 폴더(와 월별 분할 폴더)를 감시하고, 파일이 바뀌면 변경 구간만 파싱한다.
+    날짜가 바뀌어 대상 파일이 달라지면 새 파일을 기준으로 다시 시작한다.
+    inotify가 없으면 WATCH_INTERVAL마다 mtime/크기로 변경을 확인한다.
+    """
+    log_dir = get_dailylog_path(vault_path, datetime.now().year).parent
+    selector = selectors.DefaultSelector()
+    try:
+        inotify = Inotify()
+        selector.register(inotify.fd, selectors.EVENT_READ)
+    except OSError as e:
+        print(f"[watch] 파일 감시 비활성화 ({WATCH_INTERVAL}초마다 변경 확인): {e}", file=sys.stderr)
+        inotify = None
+
+    watched = set()
+    target = None
+    content = b""
+    signature = None
+
+    def read_target() -> tuple[Optional[tuple], bytes]:
+        try:
+            with open(target, "rb") as f:
+                stat = os.fstat(f.fileno())
+                return (stat.st_mtime_ns, stat.st_size, stat.st_ino), f.read()
+        except FileNotFoundError:
+            return None, b""
+
+    try:
+        while True:
+            today = datetime.now()
+            try:
+                path = get_write_path(vault_path, today)
+            except ValueError:
+                path = get_dailylog_path(vault_path, today.year)  # 새해 파일은 아직 없을 수 있음
+
+            if inotify:
+                # 감시 폴더는 대상 파일이 생기기 전에도 있어야 하므로 매번 확인
+                for directory in (log_dir, path.parent):
+                    if directory not in watched and directory.is_dir():
+                        inotify.add_watch(directory, WATCH_MASK)
+                        watched.add(directory)
+
+            if path != target:
+                # 처음 시작하거나 날짜/저장 형식이 바뀐 경우: 현재 내용을 기준으로 삼음
+                target = path
+                signature, content = read_target()
+                print(f"[watch] 감시 중: {target}", file=sys.stderr)
+            else:
+                stat_signature = None
+                try:
+                    stat = target.stat()
+                    stat_signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+                except FileNotFoundError:
+                    pass
+                if stat_signature != signature:
+                    signature, new_content = read_target()
+                    for record in diff_new_items(content, new_content):
+                        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                    content = new_content
+
+            if inotify:
+                if selector.select(WATCH_INTERVAL):
+                    inotify.read_events()
+            else:
+                time.sleep(WATCH_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        selector.close()
+        if inotify:
+            inotify.close()
+
+
+def add_format_argument(subparser: argparse.ArgumentParser) -> None:
+    """조회 명령어 공통 --format 옵션"""
+    subparser.add_argument("--format", dest="output_format", choices=OUTPUT_FORMATS, default="text",
+                           help="출력 형식 (text: 마크다운, json: 레코드 배열, ndjson: 한 줄에 레코드 하나)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """CLI 인자 파서 생성 (상주 서버도 같은 파서로 요청을 해석)"""
     parser = argparse.ArgumentParser(
         description="Obsidian 데일리로그 관리 도구",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -468,13 +3056,66 @@ def main():
   # 특정 날짜에 항목 추가
   dailylog.py add --section 개인 --date 2026-01-15 "운동 1시간"
 
+  # JSONL 레코드 일괄 추가 (파일 한 번만 다시 씀)
+  dailylog.py add --batch items.jsonl
+
   # 이번 주 요약
   dailylog.py summary --week
+
+  # 연간 요약 / 여러 해 월별 추이 (미리 계산된 집계 사용)
+  dailylog.py summary --year 2025
+  dailylog.py summary --trend --from 2020-01-01 --to 2025-12-31
+
+  # 항목 검색 (섹션/기간 필터)
+  dailylog.py search "회의" --section 회사 --from 2025-01-01
+
+  # 많이 언급된 문서 / 특정 문서를 언급한 날짜
+  dailylog.py links --top 10
+  dailylog.py links --note "프로젝트 A"
+
+  # 없는 문서 / 대상이 여럿인 [[링크]] 확인
+  dailylog.py check-links --from 2025-01-01
+
+  # 상주 서버 실행 (실행 중이면 read/add/summary가 자동으로 서버 사용)
+  dailylog.py serve
+
+  # 새로 추가되는 항목을 NDJSON으로 실시간 출력 (Ctrl+C로 종료)
+  dailylog.py watch
+
+  # 시간대 x 요일 분포, 연속 기록, 섹션별 비율 (numpy 필요)
+  uv run --with numpy dailylog.py stats --from 2025-01-01
+
+  # SQLite 사본 갱신 후 SQL로 분석 (읽기 전용)
+  dailylog.py sync
+  dailylog.py query "SELECT section, count(*) FROM items GROUP BY section"
+
+  # 월별 파일로 분할 (추가 시 해당 월 파일만 다시 씀) / 다시 연도 파일로 합치기
+  dailylog.py migrate --year 2025
+  dailylog.py compact --year 2025
+
+  # 캐시 없이 직접 파싱 / 캐시 적중 확인
+  dailylog.py --no-cache read today
+  dailylog.py --cache-stats summary --month
+
+  # 단계별(read/parse/filter/aggregate/format/write) 소요 시간 기록
+  dailylog.py --profile summary --from 2020-01-01
+  DAILYLOG_PROFILE=1 dailylog.py add --section 회사 "회의"
 """
     )
 
     parser.add_argument("--vault", type=str, default=".",
                         help="Obsidian Vault 경로 (기본값: 현재 디렉토리)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="파싱 캐시를 사용하지 않고 파일을 직접 파싱")
+    parser.add_argument("--cache-stats", action="store_true",
+                        help="캐시 적중/미스 횟수를 stderr로 출력")
+    parser.add_argument("--no-server", action="store_true",
+                        help="상주 서버가 실행 중이어도 현재 프로세스에서 직접 실행")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"단계별 소요 시간/할당 블록 수를 JSON 한 줄로 기록 (환경 변수 {PROFILE_ENV}=1과 같음, "
+                             "항상 현재 프로세스에서 실행)")
+    parser.add_argument("--profile-log", type=str, metavar="FILE",
+                        help=f"측정 기록 파일 (기본값: 데일리로그 폴더의 {CACHE_DIR_NAME}/{PROFILE_LOG_NAME})")
 
     subparsers = parser.add_subparsers(dest="command", help="명령어")
 
@@ -490,14 +3131,17 @@ def main():
                              help="이번 주 전체")
     read_parser.add_argument("--month", action="store_true",
                              help="이번 달 전체")
+    add_format_argument(read_parser)
 
     # add 서브커맨드
     add_parser = subparsers.add_parser("add", help="항목 추가")
-    add_parser.add_argument("item", type=str, help="추가할 항목 내용")
-    add_parser.add_argument("--section", "-s", type=str, required=True,
+    add_parser.add_argument("item", type=str, nargs="?", help="추가할 항목 내용")
+    add_parser.add_argument("--section", "-s", type=str,
                             choices=SECTIONS, help="섹션 (회사, 개인, 스크랩, 아이디어)")
     add_parser.add_argument("--date", "-d", type=str, default="today",
                             help="날짜 (기본값: today)")
+    add_parser.add_argument("--batch", type=str, metavar="FILE",
+                            help="JSONL 파일의 {date, section, item} 레코드를 일괄 추가 (- 이면 stdin)")
 
     # summary 서브커맨드
     summary_parser = subparsers.add_parser("summary", help="기간별 요약")
@@ -509,14 +3153,86 @@ def main():
                                 help="이번 주")
     summary_parser.add_argument("--month", action="store_true",
                                 help="이번 달")
-
-    args = parser.parse_args()
-
-    if not args.command:
-        parser.print_help()
-        sys.exit(1)
-
-    vault_path = Path(args.vault).resolve()
+    summary_parser.add_argument("--year", type=int, nargs="?", const=datetime.now().year,
+                                help="연간 요약 (월/연 집계 사용, 기본값: 올해)")
+    summary_parser.add_argument("--trend", action="store_true",
+                                help="기간의 월별 섹션 항목 수 추이 (--from/--to와 함께, 기본값: 올해)")
+    add_format_argument(summary_parser)
+
+    # search 서브커맨드
+    search_parser = subparsers.add_parser("search", help="항목 전문 검색")
+    search_parser.add_argument("query", type=str, help="검색어 (여러 단어는 모두 포함하는 항목만)")
+    search_parser.add_argument("--section", "-s", type=str, choices=SECTIONS,
+                               help="섹션 필터")
+    search_parser.add_argument("--from", dest="from_date", type=str,
+                               help="시작 날짜")
+    search_parser.add_argument("--to", dest="to_date", type=str,
+                               help="종료 날짜")
+    search_parser.add_argument("--limit", "-n", type=int, default=20,
+                               help="최대 결과 수 (기본값: 20)")
+    add_format_argument(search_parser)
+
+    # links 서브커맨드
+    links_parser = subparsers.add_parser("links", help="[[링크]] 언급 조회")
+    links_parser.add_argument("--note", type=str,
+                              help="문서 이름 (해당 문서를 언급한 날짜 목록)")
+    links_parser.add_argument("--top", "-n", type=int, default=20,
+                              help="최대 표시 개수 (기본값: 20)")
+    links_parser.add_argument("--from", dest="from_date", type=str,
+                              help="시작 날짜")
+    links_parser.add_argument("--to", dest="to_date", type=str,
+                              help="종료 날짜")
+    add_format_argument(links_parser)
+
+    # check-links 서브커맨드
+    check_links_parser = subparsers.add_parser("check-links", help="[[링크]] 대상이 Vault에 있는지 확인")
+    check_links_parser.add_argument("--from", dest="from_date", type=str,
+                                    help="시작 날짜 (기본값: 전체)")
+    check_links_parser.add_argument("--to", dest="to_date", type=str,
+                                    help="종료 날짜 (기본값: 전체)")
+    check_links_parser.add_argument("--all", dest="show_all", action="store_true",
+                                    help="연결된 링크도 표시 (json/ndjson은 모든 링크 레코드 출력)")
+    check_links_parser.add_argument("--rebuild", action="store_true",
+                                    help="Vault 색인을 폴더 mtime과 관계없이 다시 생성")
+    add_format_argument(check_links_parser)
+
+    # stats 서브커맨드
+    stats_parser = subparsers.add_parser("stats", help="타임스탬프 기반 활동 통계 (numpy 필요)")
+    stats_parser.add_argument("--from", dest="from_date", type=str,
+                              help="시작 날짜 (기본값: 첫 기록)")
+    stats_parser.add_argument("--to", dest="to_date", type=str,
+                              help="종료 날짜 (기본값: 오늘, 오늘 이후 날짜의 기록이 있으면 마지막 기록)")
+    add_format_argument(stats_parser)
+
+    # sync / query 서브커맨드
+    subparsers.add_parser("sync", help="파싱 결과를 SQLite 사본에 반영 (바뀐 날짜만)")
+    query_parser = subparsers.add_parser("query", help="SQLite 사본에 읽기 전용 SQL 질의")
+    query_parser.add_argument("sql", type=str, help="SQL (테이블: days, items, links)")
+    add_format_argument(query_parser)
+
+    # migrate / compact 서브커맨드
+    migrate_parser = subparsers.add_parser("migrate", help="연도 파일을 월별 파일로 분할")
+    migrate_parser.add_argument("--year", type=int, help="연도 (기본값: 분할되지 않은 모든 연도)")
+    compact_parser = subparsers.add_parser("compact", help="월별 파일을 연도 파일 하나로 합치기")
+    compact_parser.add_argument("--year", type=int, help="연도 (기본값: 분할된 모든 연도)")
+
+    # watch 서브커맨드
+    subparsers.add_parser("watch", help="오늘 파일을 감시하며 새로 추가된 항목을 NDJSON으로 출력")
+
+    # serve 서브커맨드
+    subparsers.add_parser("serve", help="파싱 결과를 메모리에 유지하는 상주 서버 실행")
+
+    return parser
+
+
+def run_command(args: argparse.Namespace, vault_path: Path, out: TextIO) -> None:
+    """파싱된 인자로 명령을 실행하고 결과를 out에 출력
+
+    --format이 json/ndjson이면 레코드를 만들어지는 대로 바로 써서
+    전체 결과를 문자열로 모아두지 않는다.
+    """
+    use_cache = not args.no_cache
+    fmt = getattr(args, "output_format", "text")
 
     if args.command == "read":
         today = datetime.now()
@@ -532,17 +3248,40 @@ def main():
             start_date = parse_date(args.date)
             end_date = start_date
 
-        result = read_entries(vault_path, start_date, end_date)
-        print(result)
+        if fmt == "text":
+            out.write(read_entries(vault_path, start_date, end_date, use_cache=use_cache) + "\n")
+        else:
+            write_records(iter_read_records(vault_path, start_date, end_date, use_cache), fmt, out)
 
     elif args.command == "add":
-        date = parse_date(args.date)
-        result = add_item(vault_path, date, args.section, args.item)
-        print(result)
+        if args.batch:
+            out.write(add_batch(vault_path, args.batch) + "\n")
+        else:
+            date = parse_date(args.date)
+            out.write(add_item(vault_path, date, args.section, args.item) + "\n")
 
     elif args.command == "summary":
         today = datetime.now()
 
+        if args.year:
+            if fmt == "text":
+                out.write(generate_year_summary(vault_path, args.year, use_cache=use_cache) + "\n")
+            else:
+                buckets = load_buckets(vault_path, args.year, args.year, use_cache)
+                keys = [f"M:{args.year}-{month:02d}" for month in range(1, 13)] + [f"Y:{args.year}"]
+                write_records(iter_bucket_records(buckets, keys), fmt, out)
+            return
+
+        if args.trend:
+            start_date = parse_date(args.from_date) if args.from_date else today.replace(month=1, day=1)
+            end_date = parse_date(args.to_date) if args.to_date else today
+            if fmt == "text":
+                out.write(generate_trend(vault_path, start_date, end_date, use_cache=use_cache) + "\n")
+            else:
+                buckets = load_buckets(vault_path, start_date.year, end_date.year, use_cache)
+                write_records(iter_bucket_records(buckets, month_keys_between(start_date, end_date)), fmt, out)
+            return
+
         if args.week:
             start_date, end_date = get_week_range(today)
         elif args.month:
@@ -554,8 +3293,187 @@ def main():
             # 기본값: 이번 주
             start_date, end_date = get_week_range(today)
 
-        result = generate_summary(vault_path, start_date, end_date)
-        print(result)
+        if fmt == "text":
+            out.write(generate_summary(vault_path, start_date, end_date, use_cache=use_cache) + "\n")
+        else:
+            write_records(iter_summary_records(vault_path, start_date, end_date, use_cache), fmt, out)
+
+    elif args.command == "search":
+        start_date = parse_date(args.from_date) if args.from_date else None
+        end_date = parse_date(args.to_date) if args.to_date else None
+        if fmt == "text":
+            out.write(search_entries(vault_path, args.query, args.section, start_date, end_date,
+                                     limit=args.limit, use_cache=use_cache) + "\n")
+        else:
+            try:
+                hits = find_search_hits(vault_path, args.query, args.section, start_date, end_date, use_cache)
+            except ValueError as e:
+                out.write(f"오류: {e}\n")
+                return
+            # 검색 색인은 타임스탬프를 떼고 저장하므로 hit 레코드에는 timestamp가 없음
+            write_records(({"type": "hit", "score": round(score, 4), "date": date_str, "weekday": weekday,
+                            "section": section, "text": text,
+                            "links": [link_target(link) for link in LINK_PATTERN.findall(text)]}
+                           for score, date_str, weekday, section, text in hits[:args.limit]), fmt, out)
+
+    elif args.command == "links":
+        start_date = parse_date(args.from_date) if args.from_date else None
+        end_date = parse_date(args.to_date) if args.to_date else None
+        if fmt == "text":
+            out.write(find_links(vault_path, args.note, args.top, start_date, end_date,
+                                 use_cache=use_cache) + "\n")
+        else:
+            mentions = collect_link_mentions(vault_path, start_date, end_date, use_cache)
+            if args.note:
+                records = ({"type": "mention", "date": date_str, "section": section, "note": target}
+                           for date_str, section, target in reversed(match_note_mentions(mentions, args.note)))
+            else:
+                records = ({"type": "link", "note": target, "count": count, "last_date": last}
+                           for count, last, target in rank_links(mentions)[:args.top])
+            write_records(records, fmt, out)
+
+    elif args.command == "check-links":
+        start_date = parse_date(args.from_date) if args.from_date else None
+        end_date = parse_date(args.to_date) if args.to_date else None
+        if fmt == "text":
+            out.write(check_links(vault_path, start_date, end_date, args.show_all, use_cache, args.rebuild) + "\n")
+        else:
+            mentions = collect_link_mentions(vault_path, start_date, end_date, use_cache)
+            records = check_link_targets(load_vault_index(vault_path, use_cache, args.rebuild), mentions)
+            write_records((r for r in records if args.show_all or r["status"] in ("dead", "ambiguous")), fmt, out)
+
+    elif args.command == "stats":
+        start_date = parse_date(args.from_date) if args.from_date else None
+        end_date = parse_date(args.to_date) if args.to_date else None
+        try:
+            stats = compute_stats(vault_path, start_date, end_date, use_cache)
+        except ImportError:
+            out.write("오류: stats에는 numpy가 필요합니다. "
+                      "`uv run --with numpy scripts/dailylog.py stats`로 실행하세요.\n")
+            return
+        except ValueError as e:
+            out.write(f"오류: {e}\n")
+            sys.exit(1)
+        if fmt == "text":
+            out.write(format_stats(stats) + "\n")
+        else:
+            write_records([stats], fmt, out)
+
+    elif args.command == "sync":
+        out.write(sync_sqlite(vault_path, use_cache=use_cache) + "\n")
+
+    elif args.command == "query":
+        try:
+            if fmt == "text":
+                out.write(format_query_table(query_sqlite(vault_path, args.sql)) + "\n")
+            else:
+                write_records(query_sqlite(vault_path, args.sql), fmt, out)
+        except (sqlite3.Error, ValueError) as e:
+            out.write(f"오류: {e}\n")
+
+    elif args.command in ("migrate", "compact"):
+        out.write(convert_layout(vault_path, args.command, args.year) + "\n")
+
+    elif args.command == "watch":
+        watch_items(vault_path, out)
+
+    else:
+        raise ValueError(f"지원하지 않는 명령어: {args.command}")
+
+
+def get_profile_log_path(args: argparse.Namespace, vault_path: Path) -> Optional[Path]:
+    """측정 기록 파일 경로 (측정하지 않으면 None)
+
+    --profile 또는 DAILYLOG_PROFILE이 켜져 있을 때만 측정한다.
+    환경 변수 값이 1/true가 아니면 기록 파일 경로로 사용한다.
+    """
+    env = os.environ.get(PROFILE_ENV, "").strip()
+    if not args.profile and env.lower() in ("", "0", "false", "no"):
+        return None
+    if args.profile_log:
+        return Path(args.profile_log)
+    if env and env.lower() not in ("1", "true", "yes"):
+        return Path(env)
+    return get_dailylog_path(vault_path, datetime.now().year).parent / CACHE_DIR_NAME / PROFILE_LOG_NAME
+
+
+def write_profile_record(log_path: Path, argv: list[str], total_ms: float) -> dict:
+    """측정 결과를 JSON 한 줄로 기록 파일에 이어 쓰고 기록 반환"""
+    phases = {name: {"ms": round(phase["ms"], 3), "alloc_blocks": phase["alloc_blocks"], "calls": phase["calls"]}
+              for name, phase in PROFILER.phases.items()}
+    measured = sum(phase["ms"] for name, phase in PROFILER.phases.items() if not name.startswith("worker."))
+    record = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "argv": argv,
+        "total_ms": round(total_ms, 3),
+        "other_ms": round(total_ms - measured, 3),
+        "phases": phases,
+        "files": [{"path": path, "bytes": size} for path, size in PROFILER.files.items()],
+        "file_bytes": sum(PROFILER.files.values()),
+        "entries": PROFILER.entries,
+        "cache": dict(CACHE_STATS),
+        "python": sys.version.split()[0],
+    }
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return record
+
+
+def main():
+    global PROFILER
+
+    parser = build_parser()
+    argv = sys.argv[1:]
+    args = parser.parse_args(argv)
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    if args.command == "add" and not args.batch and (not args.section or args.item is None):
+        parser.error("add: --section과 항목 내용이 필요합니다 (일괄 추가는 --batch)")
+
+    vault_path = Path(args.vault).resolve()
+
+    if args.command == "serve":
+        serve(vault_path)
+        return
+
+    # 측정은 현재 프로세스에서 실행해야 의미가 있으므로 상주 서버를 사용하지 않음
+    profile_log = get_profile_log_path(args, vault_path)
+    if profile_log is not None:
+        PROFILER = Profiler()
+        started = time.perf_counter()
+
+    output = None
+    if (args.command in SERVER_COMMANDS and not args.no_server and profile_log is None
+            and not (args.command == "add" and args.batch)):
+        response = request_server(vault_path, argv)
+        if response is not None:
+            if response.get("ok"):
+                output = response["output"]
+                for key, value in response.get("cache", {}).items():
+                    CACHE_STATS[key] += value
+            elif response.get("sent") and args.command == "add":
+                # 요청이 이미 전달된 add는 중복 추가를 막기 위해 재실행하지 않음
+                print(f"오류: 상주 서버 처리 실패: {response.get('error')}")
+                sys.exit(1)
+
+    if output is None:
+        # 다른 단계로 측정되지 않은 나머지(출력 생성 등)는 format으로 기록
+        with profile_phase("format"):
+            run_command(args, vault_path, sys.stdout)
+    else:
+        sys.stdout.write(output)
+
+    if profile_log is not None:
+        record = write_profile_record(profile_log, argv, (time.perf_counter() - started) * 1000)
+        phases = ", ".join(f"{name} {phase['ms']:.1f}ms" for name, phase in record["phases"].items())
+        print(f"[profile] 전체 {record['total_ms']:.1f}ms ({phases}) -> {profile_log}", file=sys.stderr)
+
+    if args.cache_stats:
+        print(f"[cache] 적중 {CACHE_STATS['hit']}건, 미스 {CACHE_STATS['miss']}건", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,801 @@
+"""dailylog.py 회귀 테스트 (uv run --with pytest pytest dailylog/tests)"""
+
+import json
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).resolve().parent.parent / "scripts" / "dailylog.py"
+sys.path.insert(0, str(SCRIPT_PATH.parent))
+
+import bench_dailylog  # noqa: E402
+import dailylog  # noqa: E402
+
+
+def make_day(date_str: str, weekday: str, item: str) -> str:
+    return f"#### {date_str} ({weekday})\n\n##### 회사\n- {item}\n\n---\n"
+
+
+def run_cli(vault_path: Path, *args: str) -> str:
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT_PATH), "--vault", str(vault_path), "--no-server", *args],
+        capture_output=True, text=True, encoding="utf-8", check=True,
+    )
+    return result.stdout
+
+
+def write_unsorted_year(vault_path: Path) -> None:
+    """이전 버전의 add처럼 03-07이 과거 날짜(03-01) 아래에 들어간 연도 파일"""
+    file_path = dailylog.get_dailylog_path(vault_path, 2024)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(
+        "# 데일리로그 2024\n\n## 3월\n\n"
+        + make_day("2024-03-05", "화", "정렬된 항목")
+        + make_day("2024-03-01", "금", "기간 밖 항목")
+        + make_day("2024-03-07", "목", "순서가 어긋난 항목"),
+        encoding="utf-8",
+    )
+
+
+def test_short_range_reads_unsorted_year_file(tmp_path):
+    write_unsorted_year(tmp_path)
+    start, end = datetime(2024, 3, 4), datetime(2024, 3, 10)
+
+    assert dailylog.load_date_index(tmp_path, start, end).dates == ["2024-03-05", "2024-03-07"]
+
+    records = json.loads(run_cli(tmp_path, "read", "--from", "2024-03-04", "--to", "2024-03-10", "--format", "json"))
+    assert [record["date"] for record in records] == ["2024-03-05", "2024-03-07"]
+    text = run_cli(tmp_path, "read", "--from", "2024-03-04", "--to", "2024-03-10")
+    assert "정렬된 항목" in text and "순서가 어긋난 항목" in text and "기간 밖 항목" not in text
+
+
+def test_header_index_records_order(tmp_path):
+    write_unsorted_year(tmp_path)
+    file_path = dailylog.get_dailylog_path(tmp_path, 2024)
+    assert dailylog.load_header_index(file_path)["newest_first"] is False
+
+    file_path.write_text(make_day("2024-03-07", "목", "a") + make_day("2024-03-05", "화", "b"), encoding="utf-8")
+    assert dailylog.load_header_index(file_path)["newest_first"] is True
+
+
+def test_search_single_character_query_matches_inside_words(tmp_path):
+    file_path = dailylog.get_dailylog_path(tmp_path, 2024)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(
+        make_day("2024-03-07", "목", "책상 정리")
+        + make_day("2024-03-06", "수", "독서 모임 리뷰")
+        + make_day("2024-03-05", "화", "책"),
+        encoding="utf-8",
+    )
+
+    def search(query):
+        return sorted(hit[4] for hit in dailylog.find_search_hits(tmp_path, query))
+
+    assert search("책") == ["책", "책상 정리"]
+    assert search("리") == ["독서 모임 리뷰", "책상 정리"]
+    assert search("책 정리") == ["책상 정리"]
+    assert search("모임") == ["독서 모임 리뷰"]
+
+
+def test_parallel_adds_keep_every_item_in_order(tmp_path):
+    count = 16
+    file_path = dailylog.get_dailylog_path(tmp_path, 2024)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text("# 데일리로그 2024\n\n## 3월\n\n" + make_day("2024-03-05", "화", "기존 항목"), encoding="utf-8")
+
+    processes = [
+        subprocess.Popen(
+            [sys.executable, str(SCRIPT_PATH), "--vault", str(tmp_path), "--no-server",
+             "add", "--date", "2024-03-05", "--section", "회사", f"동시 추가 {i}"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        for i in range(count)
+    ]
+    for process in processes:
+        _, stderr = process.communicate(timeout=60)
+        assert process.returncode == 0, stderr.decode("utf-8")
+
+    items = dailylog.parse_dailylog(file_path.read_text(encoding="utf-8"))["2024-03-05"]["sections"]["회사"]
+    assert items[0] == "- 기존 항목"
+    added = [dailylog.split_item(item) for item in items[1:]]
+    assert sorted(text for _, text in added) == sorted(f"동시 추가 {i}" for i in range(count))
+    # 대기열 순서대로 삽입되므로 요청 시각(타임스탬프) 순서와 같아야 함
+    timestamps = [timestamp for timestamp, _ in added]
+    assert timestamps == sorted(timestamps)
+
+    spool_dir = dailylog.get_spool_dir(tmp_path)
+    assert list(spool_dir.iterdir()) == []
+
+
+def test_server_socket_dir_must_be_private(tmp_path, monkeypatch):
+    runtime_dir = tmp_path / "runtime"
+    runtime_dir.mkdir(mode=0o700)
+    runtime_dir.chmod(0o700)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(runtime_dir))
+    assert dailylog.get_server_socket_path(tmp_path).parent == runtime_dir
+
+    # 다른 사용자도 쓸 수 있는 XDG_RUNTIME_DIR, 미리 만들어진 공용 임시 폴더는 사용하지 않음
+    runtime_dir.chmod(0o777)
+    temp_dir = tmp_path / "tmp"
+    temp_dir.mkdir()
+    monkeypatch.setattr(dailylog.tempfile, "tempdir", str(temp_dir))
+    (temp_dir / f"dailylog-{dailylog.os.getuid()}").mkdir(mode=0o777)
+    (temp_dir / f"dailylog-{dailylog.os.getuid()}").chmod(0o777)
+    assert dailylog.get_server_socket_path(tmp_path, create=True) is None
+    assert dailylog.request_server(tmp_path, ["read", "today"]) is None
+
+
+def test_serve_answers_only_through_private_socket(tmp_path, monkeypatch):
+    runtime_dir = tmp_path / "runtime"
+    runtime_dir.mkdir(mode=0o700)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(runtime_dir))
+    vault_path = tmp_path / "vault"
+    write_unsorted_year(vault_path)
+
+    server = subprocess.Popen([sys.executable, str(SCRIPT_PATH), "--vault", str(vault_path), "serve"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        response = None
+        for _ in range(100):
+            response = dailylog.request_server(vault_path, ["read", "2024-03-05"])
+            if response is not None:
+                break
+            time.sleep(0.05)
+        assert response["ok"] and "정렬된 항목" in response["output"]
+
+        # 소켓 폴더 권한이 열리면 서버를 믿지 않고 현재 프로세스에서 실행
+        runtime_dir.chmod(0o755)
+        assert dailylog.request_server(vault_path, ["read", "2024-03-05"]) is None
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def write_years(vault_path: Path, *years: int) -> list[Path]:
+    paths = []
+    for year in years:
+        file_path = dailylog.get_dailylog_path(vault_path, year)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(f"# 데일리로그 {year}\n\n## 3월\n\n" + make_day(f"{year}-03-05", "화", "기존 항목"),
+                             encoding="utf-8")
+        paths.append(file_path)
+    return paths
+
+
+def section_items(file_path: Path, date_str: str) -> list[str]:
+    return dailylog.parse_dailylog(file_path.read_text(encoding="utf-8"))[date_str]["sections"]["회사"]
+
+
+def test_write_failure_reports_only_requests_that_did_not_land(tmp_path, monkeypatch):
+    path_2023, path_2024 = write_years(tmp_path, 2023, 2024)
+    write_text_atomic = dailylog.write_text_atomic
+
+    def failing_write(path, text, newline=None):
+        if path == path_2024:
+            raise OSError("디스크 가득 참")
+        write_text_atomic(path, text, newline)
+
+    monkeypatch.setattr(dailylog, "write_text_atomic", failing_write)
+    results = dailylog.apply_add_requests(tmp_path, [
+        [["2023-03-05", "회사", "A", "2023-03-05 09:00:00"]],
+        [["2024-03-05", "회사", "B", "2024-03-05 09:00:00"]],
+        [["2023-03-05", "회사", "C", "2023-03-05 10:00:00"], ["2024-03-05", "회사", "C", "2024-03-05 10:00:00"]],
+    ])
+
+    assert results[0]["ok"]
+    assert not results[1]["ok"] and "이미 추가됨" not in results[1]["error"]
+    assert not results[2]["ok"] and "이미 추가됨" in results[2]["error"]
+    assert section_items(path_2023, "2023-03-05") == ["- 기존 항목", "- 2023-03-05 09:00:00 A", "- 2023-03-05 10:00:00 C"]
+    assert section_items(path_2024, "2024-03-05") == ["- 기존 항목"]
+
+
+def test_interrupted_drain_is_reapplied_without_duplicates(tmp_path, monkeypatch):
+    (file_path,) = write_years(tmp_path, 2024)
+    spool_dir = dailylog.get_spool_dir(tmp_path)
+    spool_dir.mkdir(parents=True)
+    request_path = spool_dir / "00000000000000000001-1-abcd.json"
+    request_path.write_text(json.dumps({"records": [["2024-03-05", "회사", "중단된 추가", "2024-03-05 09:00:00"]]}),
+                            encoding="utf-8")
+
+    # 연도 파일을 쓴 뒤 결과를 기록하기 전에 죽은 경우
+    write_json_atomic = dailylog.write_json_atomic
+
+    def crash_on_result(path, data):
+        if path.suffix == ".result":
+            raise KeyboardInterrupt
+        write_json_atomic(path, data)
+
+    monkeypatch.setattr(dailylog, "write_json_atomic", crash_on_result)
+    with pytest.raises(KeyboardInterrupt):
+        dailylog.drain_add_queue(tmp_path)
+    assert [p.suffix for p in spool_dir.iterdir()] == [".applying"]
+
+    monkeypatch.setattr(dailylog, "write_json_atomic", write_json_atomic)
+    dailylog.drain_add_queue(tmp_path)
+
+    assert section_items(file_path, "2024-03-05") == ["- 기존 항목", "- 2024-03-05 09:00:00 중단된 추가"]
+    assert [p.suffix for p in spool_dir.iterdir()] == [".result"]
+    assert json.loads(request_path.with_suffix(".result").read_text(encoding="utf-8"))["ok"]
+
+
+def test_no_cache_leaves_cache_dir_untouched(tmp_path):
+    (file_path,) = write_years(tmp_path, 2024)
+    cache_dir = file_path.parent / dailylog.CACHE_DIR_NAME
+
+    for args in (["search", "기존"], ["links"], ["summary", "--from", "2024-01-01", "--to", "2024-12-31"]):
+        run_cli(tmp_path, "--no-cache", *args)
+        assert not cache_dir.exists() or list(cache_dir.iterdir()) == [], args
+
+
+WEEKLY_YEAR = (
+    "# 데일리로그 2024\n\n## 3월\n\n"
+    "### 3월 2주차 (03/08 - 03/14)\n\n" + make_day("2024-03-12", "화", "a") + "\n"
+    "### 3월 1주차 (03/01 - 03/07)\n\n" + make_day("2024-03-05", "화", "b")
+)
+
+
+def test_add_keeps_crlf_newlines(tmp_path):
+    file_path = dailylog.get_dailylog_path(tmp_path, 2024)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_bytes(WEEKLY_YEAR.replace("\n", "\r\n").encode("utf-8"))
+
+    dailylog.add_item(tmp_path, datetime(2024, 3, 12), "회사", "기존 날짜")
+    dailylog.add_item(tmp_path, datetime(2024, 3, 10), "회사", "새 날짜")
+
+    data = file_path.read_bytes()
+    assert data.count(b"\n") == data.count(b"\r\n")
+    assert data.startswith(WEEKLY_YEAR.split("#### 2024-03-12")[0].replace("\n", "\r\n").encode("utf-8"))
+
+
+@pytest.mark.parametrize("date", [datetime(2024, 3, 13), datetime(2024, 3, 10), datetime(2024, 3, 6),
+                                  datetime(2024, 3, 3)])
+def test_new_day_is_separated_from_neighbouring_headers(date):
+    for content in (WEEKLY_YEAR, WEEKLY_YEAR.rstrip("\n")):
+        doc = dailylog.DailylogDocument(content)
+        dailylog.insert_item(doc, date, "회사", "새 항목", "2024-03-20 09:00:00")
+        lines = doc.serialize().split("\n")
+
+        headers = [i for i, line in enumerate(lines) if line.startswith(("## ", "### ", "#### "))]
+        assert all(lines[i - 1] == "" for i in headers if i > 0)
+        assert all(lines[i] or lines[i - 1] for i in range(1, len(lines)))  # 빈 줄이 두 번 연속되지 않음
+        assert lines[-1] == content.split("\n")[-1]  # 파일 끝 개행 유지
+
+
+def parse_vault(paths: list[Path]) -> dict:
+    """연도 파일을 모두 파싱하여 합친 항목 (색인/캐시를 쓰지 않는 기준값)"""
+    entries = {}
+    for file_path in paths:
+        entries.update(dailylog.parse_dailylog(file_path.read_text(encoding="utf-8")))
+    return entries
+
+
+# 월/연 경계를 걸치는 짧은 기간(오프셋 색인 경로)과 긴 기간(전체 파싱 경로)
+BOUNDARY_RANGES = [
+    ("2023-12-25", "2024-01-07"),
+    ("2024-02-26", "2024-03-03"),
+    ("2024-03-31", "2024-04-01"),
+    ("2024-12-31", "2024-12-31"),
+    ("2022-12-01", "2023-01-03"),
+    ("2023-06-15", "2024-06-15"),
+]
+
+
+def test_date_index_range_matches_full_scan(tmp_path):
+    paths = bench_dailylog.generate_vault(tmp_path, [2023, 2024], 4)
+    all_entries = parse_vault(paths)
+
+    for start_str, end_str in BOUNDARY_RANGES:
+        index = dailylog.load_date_index(tmp_path, dailylog.parse_date(start_str), dailylog.parse_date(end_str))
+        expected = sorted(d for d in all_entries if start_str <= d <= end_str)
+        found = index.range(start_str, end_str)
+        assert [date_str for date_str, _ in found] == expected, (start_str, end_str)
+        assert [entry["raw"] for _, entry in found] == [all_entries[d]["raw"] for d in expected]
+
+    # 양끝 날짜 포함, 색인에 없는 날짜로 시작/끝나도 그 사이만
+    index = dailylog.DateIndex({"2024-03-01": "a", "2024-03-03": "b", "2024-03-05": "c"})
+    assert index.range("2024-03-03", "2024-03-05") == [("2024-03-03", "b"), ("2024-03-05", "c")]
+    assert index.range("2024-03-02", "2024-03-04") == [("2024-03-03", "b")]
+    assert index.range("2024-03-06", "2024-03-31") == []
+
+
+def read_both_ways(vault_path: Path, monkeypatch, start_str: str, end_str: str) -> tuple[str, str]:
+    """같은 기간을 오프셋 색인 + mmap 경로와 전체 파싱 경로로 각각 읽은 결과"""
+    start, end = dailylog.parse_date(start_str), dailylog.parse_date(end_str)
+    short = dailylog.read_entries(vault_path, start, end)
+    with monkeypatch.context() as m:
+        m.setattr(dailylog, "SHORT_RANGE_DAYS", 0)
+        full = dailylog.read_entries(vault_path, start, end)
+    return short, full
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"], ids=["lf", "crlf"])
+def test_offset_read_matches_full_parse(tmp_path, monkeypatch, newline):
+    paths = bench_dailylog.generate_vault(tmp_path, [2023, 2024], 4)
+    for file_path in paths:
+        file_path.write_bytes(file_path.read_bytes().replace(b"\n", newline.encode()))
+    all_entries = parse_vault(paths)
+
+    for start_str, end_str in BOUNDARY_RANGES[:5]:
+        short, full = read_both_ways(tmp_path, monkeypatch, start_str, end_str)
+        assert short == full, (start_str, end_str)
+        expected = [all_entries[d]["raw"] for d in sorted(all_entries) if start_str <= d <= end_str]
+        assert short == "\n\n".join(expected).strip()
+
+    # 블록마다 잘라 읽은 원문이 parse_dailylog의 raw와 같음 (파일 끝 블록 포함)
+    blocks = dailylog.read_raw_blocks(paths[1], "2024-01-01", "2024-12-31")
+    assert blocks == [(d, all_entries[d]["raw"]) for d in sorted(all_entries) if d.startswith("2024")]
+
+
+def test_offset_read_last_block_without_separator(tmp_path, monkeypatch):
+    file_path = dailylog.get_dailylog_path(tmp_path, 2024)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(
+        "# 데일리로그 2024\n\n## 3월\n\n" + make_day("2024-03-05", "화", "a")
+        + "#### 2024-03-04 (월)\n\n##### 회사\n- 구분선 없는 마지막 날",
+        encoding="utf-8",
+    )
+
+    short, full = read_both_ways(tmp_path, monkeypatch, "2024-03-01", "2024-03-05")
+    assert short == full
+    assert short == ("#### 2024-03-04 (월)\n\n##### 회사\n- 구분선 없는 마지막 날\n\n"
+                     "#### 2024-03-05 (화)\n\n##### 회사\n- a")
+
+
+def test_add_batch_writes_each_file_once(tmp_path, monkeypatch):
+    path_2023, path_2024 = write_years(tmp_path, 2023, 2024)
+    batch_path = tmp_path / "batch.jsonl"
+    batch_path.write_text("\n".join([
+        json.dumps({"date": "2024-03-05", "section": "회사", "item": "첫째"}),
+        json.dumps({"date": "2023-03-05", "section": "회사", "item": "작년"}),
+        "",
+        json.dumps({"date": "2024-03-06", "section": "회사", "item": "새 날짜"}),
+        json.dumps({"date": "2024-03-05", "section": "회사", "item": "둘째"}),
+    ]), encoding="utf-8")
+
+    writes = Counter()
+    write_text_atomic = dailylog.write_text_atomic
+
+    def counting_write(path, text, newline=None):
+        writes[path] += 1
+        write_text_atomic(path, text, newline)
+
+    monkeypatch.setattr(dailylog, "write_text_atomic", counting_write)
+    message = dailylog.add_batch(tmp_path, str(batch_path))
+
+    assert message.startswith("4개 항목이 추가되었습니다:")
+    assert writes[path_2023] == writes[path_2024] == 1
+    assert [dailylog.split_item(item)[1] for item in section_items(path_2024, "2024-03-05")] == ["기존 항목", "첫째", "둘째"]
+    # 새 날짜는 템플릿의 빈 항목(-) 다음에 추가
+    assert [dailylog.split_item(item)[1] for item in section_items(path_2024, "2024-03-06")] == ["", "새 날짜"]
+    assert [dailylog.split_item(item)[1] for item in section_items(path_2023, "2023-03-05")] == ["기존 항목", "작년"]
+
+
+def test_add_batch_rejects_whole_batch_on_bad_record(tmp_path):
+    (file_path,) = write_years(tmp_path, 2024)
+    original = file_path.read_bytes()
+    batch_path = tmp_path / "batch.jsonl"
+
+    batch_path.write_text(json.dumps({"date": "2024-03-05", "section": "회사", "item": "a"}) + "\n"
+                          + json.dumps({"date": "2024-03-05", "section": "없는 섹션", "item": "b"}) + "\n",
+                          encoding="utf-8")
+    assert dailylog.add_batch(tmp_path, str(batch_path)).startswith("오류: 유효하지 않은 섹션입니다.")
+
+    batch_path.write_text(json.dumps({"section": "회사", "item": "a"}) + "\n{깨진 줄\n", encoding="utf-8")
+    assert dailylog.add_batch(tmp_path, str(batch_path)).startswith("오류: 2번째 줄을 해석할 수 없습니다")
+    assert file_path.read_bytes() == original
+
+
+def test_add_batch_from_stdin(tmp_path):
+    (file_path,) = write_years(tmp_path, 2024)
+    records = "".join(json.dumps({"date": "2024-03-05", "section": "회사", "item": f"표준 입력 {i}"}) + "\n"
+                      for i in range(3))
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT_PATH), "--vault", str(tmp_path), "add", "--batch", "-"],
+        input=records, capture_output=True, text=True, encoding="utf-8", check=True,
+    )
+
+    assert result.stdout.startswith("3개 항목이 추가되었습니다:")
+    assert [dailylog.split_item(item)[1] for item in section_items(file_path, "2024-03-05")] == [
+        "기존 항목", "표준 입력 0", "표준 입력 1", "표준 입력 2"]
+
+
+def test_parallel_parse_matches_serial_parse(tmp_path, monkeypatch):
+    paths = bench_dailylog.generate_vault(tmp_path, [2021, 2022, 2023, 2024], 4)
+    expected = [dailylog.parse_dailylog(file_path.read_text(encoding="utf-8")) for file_path in paths]
+
+    pools = []
+
+    class RecordingPool(dailylog.ProcessPoolExecutor):
+        def __init__(self, max_workers=None):
+            pools.append(max_workers)
+            super().__init__(max_workers=max_workers)
+
+    monkeypatch.setattr(dailylog, "ProcessPoolExecutor", RecordingPool)
+    monkeypatch.setattr(dailylog, "available_cpu_count", lambda: 3)
+
+    assert dailylog.load_dailylogs(paths, use_cache=False) == expected
+    assert pools == [3]
+
+    # 캐시를 만든 뒤 한 파일만 바뀌면 그 파일만 (현재 프로세스에서) 다시 파싱
+    assert dailylog.load_dailylogs(paths) == expected
+    paths[2].write_text(paths[2].read_text(encoding="utf-8").replace("운동", "수영"), encoding="utf-8")
+    expected[2] = dailylog.parse_dailylog(paths[2].read_text(encoding="utf-8"))
+    before = dict(dailylog.CACHE_STATS)
+    assert dailylog.load_dailylogs(paths) == expected
+    assert dailylog.CACHE_STATS["miss"] - before["miss"] == 1
+    assert dailylog.CACHE_STATS["hit"] - before["hit"] == 3
+    assert pools == [3, 3]
+
+
+def test_rollups_update_incrementally_after_add(tmp_path, monkeypatch):
+    (file_path,) = bench_dailylog.generate_vault(tmp_path, [2024], 4)
+    before = dailylog.load_rollups(file_path)
+    assert before == dailylog.load_rollups(file_path, use_cache=False)
+    month_before = before["buckets"]["M:2024-03"]["sections"]["회사"]
+
+    changed = []
+    apply_day_changes = dailylog.apply_day_changes
+
+    def recording_apply(rollups, old_days, new_days):
+        changed.extend(d for d in set(old_days) | set(new_days) if old_days.get(d) != new_days.get(d))
+        apply_day_changes(rollups, old_days, new_days)
+
+    monkeypatch.setattr(dailylog, "apply_day_changes", recording_apply)
+    existing = max(d for d in before["days"] if d.startswith("2024-03"))
+    dailylog.add_item(tmp_path, dailylog.parse_date(existing), "회사", "집계 확인")
+
+    after = dailylog.load_rollups(file_path)
+    assert changed == [existing]
+    assert after["buckets"]["M:2024-03"]["sections"]["회사"] == month_before + 1
+    assert after == dailylog.load_rollups(file_path, use_cache=False)
+
+    # 기록이 없던 날짜를 추가하면 주/월/연 기록일 수도 늘어남
+    missing = next(d for d in (f"2024-05-{day:02d}" for day in range(1, 32)) if d not in before["days"])
+    week_key = dailylog.rollup_keys(missing)[0]
+    week_days = after["buckets"].get(week_key, {"days": 0})["days"]
+    dailylog.add_item(tmp_path, dailylog.parse_date(missing), "개인", "새 날짜")
+    rollups = dailylog.load_rollups(file_path)
+    assert rollups["buckets"][week_key]["days"] == week_days + 1
+    assert rollups["buckets"]["Y:2024"]["days"] == before["buckets"]["Y:2024"]["days"] + 1
+    assert rollups == dailylog.load_rollups(file_path, use_cache=False)
+    assert f"| 2024-05 | {rollups['buckets']['M:2024-05']['days']} |" in dailylog.generate_year_summary(tmp_path, 2024)
+
+
+def test_day_entry_offsets_round_trip():
+    content = (
+        "# 데일리로그 2024\n\n## 3월\n\n"
+        "#### 2024-03-06 (수)\n\n"
+        "##### 회사\n- 2024-03-06 09:00:00 회의 [[프로젝트 A|A]]\n  - 들여쓴 하위 항목\n\n"
+        "##### 스크랩\n-\n- 이모지 😀 항목\n\n---\n\n"
+        "#### 2024-03-05 (화)\n\n##### 개인\n- 구분선 없는 마지막 날"
+    )
+    entries = dailylog.parse_dailylog(content)
+
+    assert entries["2024-03-06"]["sections"] == {
+        "회사": ["- 2024-03-06 09:00:00 회의 [[프로젝트 A|A]]", "  - 들여쓴 하위 항목"],
+        "개인": [],
+        "스크랩": ["-", "- 이모지 😀 항목"],
+        "아이디어": [],
+    }
+    assert entries["2024-03-06"]["raw"] == content.split("\n---")[0].split("## 3월\n\n")[1]
+    assert entries["2024-03-05"]["sections"]["개인"] == ["- 구분선 없는 마지막 날"]
+    assert entries["2024-03-05"]["raw"] == "#### 2024-03-05 (화)\n\n##### 개인\n- 구분선 없는 마지막 날"
+
+    # 항목은 raw의 오프셋으로만 보관
+    entry = entries["2024-03-06"]
+    assert entry.spans.typecode == "I" and len(entry.spans) == 3 * 4
+    for i in range(0, len(entry.spans), 3):
+        assert entry.raw[entry.spans[i + 1]:entry.spans[i + 2]] in entry["sections"][dailylog.SECTIONS[entry.spans[i]]]
+
+    restored = dailylog.entries_from_json(json.loads(json.dumps(dailylog.entries_to_json(entries))))
+    assert restored == entries
+    assert dict(restored["2024-03-06"]) == {"weekday": "수", "sections": entry["sections"], "raw": entry["raw"]}
+    with pytest.raises(KeyError):
+        entry["date"]
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"], ids=["lf", "crlf"])
+def test_migrate_then_compact_is_byte_identical(tmp_path, newline):
+    (file_path,) = bench_dailylog.generate_vault(tmp_path, [2024], 4)
+    original = file_path.read_bytes().replace(b"\n", newline.encode())
+    file_path.write_bytes(original)
+    dailylog.load_dailylog(file_path)  # 연도 파일 캐시도 정리되는지 확인
+
+    assert dailylog.convert_layout(tmp_path, "migrate") == (
+        f"2024년: 12개 월 파일로 분할했습니다: {dailylog.get_shard_dir(tmp_path, 2024)}")
+    shard_dir = dailylog.get_shard_dir(tmp_path, 2024)
+    manifest = dailylog.load_manifest(shard_dir)
+    assert manifest["shards"] == [f"2024-{month:02d}.md" for month in range(12, 0, -1)]
+    assert manifest["preamble"].encode() == original[:original.index("## 12월".encode())]
+    assert not file_path.exists()
+    assert not list((file_path.parent / dailylog.CACHE_DIR_NAME).glob(f"{file_path.stem}.*"))
+    assert [path.name for _, path in dailylog.find_dailylog_files(tmp_path, 2024, 2024)] == sorted(manifest["shards"])
+
+    assert dailylog.convert_layout(tmp_path, "compact").startswith("2024년: 12개 월 파일을 합쳤습니다")
+    assert file_path.read_bytes() == original
+    assert not shard_dir.exists()
+
+
+def test_sharded_year_reads_and_adds_like_year_file(tmp_path, monkeypatch):
+    paths = bench_dailylog.generate_vault(tmp_path, [2023, 2024], 4)
+    ranges = BOUNDARY_RANGES[:5] + [("2024-01-15", "2024-04-15")]
+    before = [read_both_ways(tmp_path, monkeypatch, start_str, end_str) for start_str, end_str in ranges]
+    assert all(short == full for short, full in before)
+
+    dailylog.convert_layout(tmp_path, "migrate", 2024)
+    # 월 파일 경계를 걸치는 기간도 분할 전과 같게 읽힘 (오프셋 색인/전체 파싱 모두)
+    for (start_str, end_str), (expected, _) in zip(ranges, before):
+        assert read_both_ways(tmp_path, monkeypatch, start_str, end_str) == (expected, expected), (start_str, end_str)
+    assert dailylog.generate_summary(tmp_path, datetime(2023, 12, 1), datetime(2024, 2, 29)) == \
+        dailylog.generate_summary(tmp_path, datetime(2023, 12, 1), datetime(2024, 2, 29), use_cache=False)
+
+    # 추가는 해당 월 파일에만
+    shard_dir = dailylog.get_shard_dir(tmp_path, 2024)
+    march = (shard_dir / "2024-03.md").read_bytes()
+    april = (shard_dir / "2024-04.md").read_bytes()
+    dailylog.add_item(tmp_path, datetime(2024, 3, 31), "회사", "월 파일에 추가")
+    assert (shard_dir / "2024-03.md").read_bytes() != march
+    assert (shard_dir / "2024-04.md").read_bytes() == april
+    assert "월 파일에 추가" in dailylog.read_entries(tmp_path, datetime(2024, 3, 31))
+    assert paths[0].exists()
+
+
+def test_add_to_new_month_registers_shard(tmp_path):
+    (file_path,) = write_years(tmp_path, 2025)
+    dailylog.convert_layout(tmp_path, "migrate", 2025)
+    shard_dir = dailylog.get_shard_dir(tmp_path, 2025)
+
+    dailylog.add_item(tmp_path, datetime(2025, 4, 2), "회사", "새 달")
+    assert dailylog.load_manifest(shard_dir)["shards"] == ["2025-04.md", "2025-03.md"]
+    assert (shard_dir / "2025-04.md").read_text(encoding="utf-8").startswith("## 4월\n\n#### 2025-04-02 (수)")
+
+    dailylog.convert_layout(tmp_path, "compact", 2025)
+    content = file_path.read_text(encoding="utf-8")
+    assert content.index("## 4월") < content.index("## 3월")
+    assert [dailylog.split_item(item)[1] for item in section_items(file_path, "2025-04-02")] == ["", "새 달"]
+    assert section_items(file_path, "2025-03-05") == ["- 기존 항목"]
+
+
+def test_sync_reports_changed_days_on_each_run(tmp_path):
+    path_2023, path_2024 = write_years(tmp_path, 2023, 2024)
+    db_path = dailylog.get_sqlite_path(tmp_path)
+
+    assert run_cli(tmp_path, "sync") == f"동기화 완료: 추가 2일, 갱신 0일, 삭제 0일 (전체 2일) - {db_path}\n"
+    assert run_cli(tmp_path, "sync").startswith("동기화 완료: 추가 0일, 갱신 0일, 삭제 0일 (전체 2일)")
+
+    dailylog.add_item(tmp_path, datetime(2024, 3, 5), "회사", "[[프로젝트 A#일정|A]] 회의")
+    dailylog.add_item(tmp_path, datetime(2024, 3, 6), "회사", "새 날짜")
+    assert run_cli(tmp_path, "sync").startswith("동기화 완료: 추가 1일, 갱신 1일, 삭제 0일 (전체 3일)")
+
+    path_2023.write_text("# 데일리로그 2023\n\n## 3월\n\n", encoding="utf-8")
+    assert run_cli(tmp_path, "sync").startswith("동기화 완료: 추가 0일, 갱신 0일, 삭제 1일 (전체 2일)")
+    assert run_cli(tmp_path, "sync").startswith("동기화 완료: 추가 0일, 갱신 0일, 삭제 0일 (전체 2일)")
+
+    rows = json.loads(run_cli(tmp_path, "query", "SELECT date, section, text FROM items ORDER BY date, position",
+                              "--format", "json"))
+    assert rows == [
+        {"date": "2024-03-05", "section": "회사", "text": "기존 항목"},
+        {"date": "2024-03-05", "section": "회사", "text": "[[프로젝트 A#일정|A]] 회의"},
+        {"date": "2024-03-06", "section": "회사", "text": "새 날짜"},
+    ]
+    links = json.loads(run_cli(tmp_path, "query", "SELECT date, target FROM links", "--format", "json"))
+    assert links == [{"date": "2024-03-05", "target": "프로젝트 A"}]
+    # 사본은 읽기 전용으로 질의
+    assert run_cli(tmp_path, "query", "DELETE FROM items").startswith("오류:")
+    assert len(json.loads(run_cli(tmp_path, "query", "SELECT * FROM items", "--format", "json"))) == 3
+
+
+def test_sync_detects_day_moved_between_files(tmp_path):
+    (file_path,) = write_years(tmp_path, 2024)
+    run_cli(tmp_path, "sync")
+    dailylog.convert_layout(tmp_path, "migrate", 2024)
+
+    # 내용이 같아도 원본 파일이 바뀌면 갱신
+    assert run_cli(tmp_path, "sync").startswith("동기화 완료: 추가 0일, 갱신 1일, 삭제 0일 (전체 1일)")
+    rows = json.loads(run_cli(tmp_path, "query", "SELECT source FROM days", "--format", "json"))
+    assert rows == [{"source": "데일리로그 2024/2024-03.md"}]
+
+
+def test_profiler_excludes_nested_phases():
+    profiler = dailylog.Profiler()
+    with profiler.phase("parse"):
+        time.sleep(0.02)
+        with profiler.phase("read"):
+            time.sleep(0.05)
+    with profiler.phase("read"):
+        pass
+
+    assert profiler.phases["read"]["calls"] == 2
+    assert profiler.phases["read"]["ms"] >= 50
+    assert 20 <= profiler.phases["parse"]["ms"] < 50
+
+
+def test_profile_log_records_phases(tmp_path):
+    paths = bench_dailylog.generate_vault(tmp_path, [2023, 2024], 4)
+    log_path = tmp_path / "profile.jsonl"
+
+    def run(*args, env=None):
+        return subprocess.run([sys.executable, str(SCRIPT_PATH), "--vault", str(tmp_path), *args],
+                              capture_output=True, text=True, encoding="utf-8", check=True, env=env)
+
+    plain = run("--no-server", "summary", "--from", "2023-01-01", "--to", "2024-12-31")
+    profiled = run("--profile", "--profile-log", str(log_path), "summary", "--from", "2023-01-01", "--to", "2024-12-31")
+    # 측정해도 출력은 같고, 요약은 stderr로
+    assert profiled.stdout == plain.stdout
+    assert profiled.stderr.startswith("[profile] 전체 ") and str(log_path) in profiled.stderr
+
+    (record,) = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert record["argv"][-5:] == ["summary", "--from", "2023-01-01", "--to", "2024-12-31"]
+    assert {"read", "parse", "filter", "format"} <= set(record["phases"])
+    assert sorted(f["path"] for f in record["files"]) == sorted(str(p) for p in paths)
+    assert record["file_bytes"] == sum(p.stat().st_size for p in paths)
+    assert record["entries"] == len(parse_vault(paths))
+    measured = sum(phase["ms"] for name, phase in record["phases"].items() if not name.startswith("worker."))
+    assert record["other_ms"] == pytest.approx(record["total_ms"] - measured, abs=0.01)
+
+    # 환경 변수에 경로를 주면 그 파일에 이어 씀
+    run("read", "2024-03-05", env={**dailylog.os.environ, "DAILYLOG_PROFILE": str(log_path)})
+    records = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert len(records) == 2 and records[1]["argv"] == ["--vault", str(tmp_path), "read", "2024-03-05"]
+
+
+def test_diff_new_items_reports_only_added_lines():
+    old = (WEEKLY_YEAR.replace("- a", "- 2024-03-12 09:00:00 같은 내용")).encode("utf-8")
+    doc = dailylog.DailylogDocument(old.decode("utf-8"))
+    dailylog.insert_item(doc, datetime(2024, 3, 12), "회사", "같은 내용", "2024-03-12 09:00:00")
+    dailylog.insert_item(doc, datetime(2024, 3, 12), "회사", "[[문서|별칭]] 정리", "2024-03-12 10:00:00")
+    dailylog.insert_item(doc, datetime(2024, 3, 10), "개인", "새 날짜", "2024-03-12 11:00:00")
+    new = doc.serialize().encode("utf-8")
+
+    records = dailylog.diff_new_items(old, new)
+    assert [(r["date"], r["section"], r["timestamp"], r["text"], r["links"]) for r in records] == [
+        ("2024-03-12", "회사", "2024-03-12 09:00:00", "같은 내용", []),
+        ("2024-03-12", "회사", "2024-03-12 10:00:00", "[[문서|별칭]] 정리", ["문서"]),
+        ("2024-03-10", "개인", "2024-03-12 11:00:00", "새 날짜", []),
+    ]
+    assert all(r["type"] == "item" for r in records)
+    assert dailylog.diff_new_items(new, new) == []
+    # 항목을 지우기만 한 변경은 보고하지 않음
+    assert dailylog.diff_new_items(new, old) == []
+
+
+def test_watch_streams_items_added_today(tmp_path):
+    today = datetime.now()
+    file_path = dailylog.get_dailylog_path(tmp_path, today.year)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(f"# 데일리로그 {today.year}\n\n## {today.month}월\n\n"
+                         + make_day(today.strftime("%Y-%m-%d"), dailylog.WEEKDAYS_KO[today.weekday()], "기존 항목"),
+                         encoding="utf-8")
+
+    watcher = subprocess.Popen([sys.executable, str(SCRIPT_PATH), "--vault", str(tmp_path), "watch"],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding="utf-8")
+    lines = queue.Queue()
+    started = threading.Event()
+
+    def read_stderr():
+        for line in watcher.stderr:
+            if line.startswith("[watch] 감시 중"):
+                started.set()
+
+    threading.Thread(target=read_stderr, daemon=True).start()
+    threading.Thread(target=lambda: [lines.put(line) for line in watcher.stdout], daemon=True).start()
+    try:
+        assert started.wait(10)
+        dailylog.add_item(tmp_path, today, "회사", "감시 중 추가")
+        record = json.loads(lines.get(timeout=10))
+        assert (record["date"], record["section"], record["text"]) == (today.strftime("%Y-%m-%d"), "회사", "감시 중 추가")
+        assert lines.empty()
+    finally:
+        watcher.terminate()
+        watcher.wait(timeout=10)
+
+
+def write_note(vault_path: Path, rel: str, text: str = "") -> Path:
+    note_path = vault_path / rel
+    note_path.parent.mkdir(parents=True, exist_ok=True)
+    note_path.write_text(text, encoding="utf-8")
+    return note_path
+
+
+def test_vault_index_resolves_names_and_aliases(tmp_path, monkeypatch):
+    write_note(tmp_path, "10_Projects/프로젝트 A.md", "---\naliases: [PA, \"에이\"]\ntags: x\n---\n본문")
+    write_note(tmp_path, "10_Projects/목록 별칭.md", "---\naliases:\n  - 목록\n  - '둘째 별칭'\n---\n")
+    write_note(tmp_path, "20_Notes/중복.md")
+    write_note(tmp_path, "30_Other/중복.md")
+    write_note(tmp_path, "첨부/그림.png")
+    write_note(tmp_path, ".obsidian/숨김.md")
+
+    index = dailylog.load_vault_index(tmp_path)
+    assert index.resolve("프로젝트 A") == ("ok", ["10_Projects/프로젝트 A.md"])
+    assert index.resolve("프로젝트 a.md") == ("ok", ["10_Projects/프로젝트 A.md"])
+    assert index.resolve("pa") == ("alias", ["10_Projects/프로젝트 A.md"])
+    assert index.resolve("에이") == ("alias", ["10_Projects/프로젝트 A.md"])
+    assert index.resolve("둘째 별칭") == ("alias", ["10_Projects/목록 별칭.md"])
+    assert index.resolve("중복") == ("ambiguous", ["20_Notes/중복.md", "30_Other/중복.md"])
+    assert index.resolve("20_Notes/중복") == ("ok", ["20_Notes/중복.md"])
+    assert index.resolve("그림.png") == ("ok", ["첨부/그림.png"])
+    assert index.resolve("그림") == ("dead", [])
+    assert index.resolve("숨김") == ("dead", [])
+
+    # 바뀐 폴더만 다시 훑고, 그대로인 문서의 frontmatter는 다시 읽지 않음
+    read_aliases = []
+    read_frontmatter_aliases = dailylog.read_frontmatter_aliases
+    monkeypatch.setattr(dailylog, "read_frontmatter_aliases",
+                        lambda path: read_aliases.append(path.name) or read_frontmatter_aliases(path))
+    assert dailylog.load_vault_index(tmp_path).resolve("없는 문서") == ("dead", [])
+    assert read_aliases == []
+    write_note(tmp_path, "30_Other/없는 문서.md", "---\nalias: 새 별칭\n---\n")
+    index = dailylog.load_vault_index(tmp_path)
+    assert read_aliases == ["없는 문서.md"]
+    assert index.resolve("없는 문서") == ("ok", ["30_Other/없는 문서.md"])
+    assert index.resolve("새 별칭") == ("alias", ["30_Other/없는 문서.md"])
+
+    (tmp_path / "20_Notes/중복.md").unlink()
+    assert dailylog.load_vault_index(tmp_path).resolve("중복") == ("ok", ["30_Other/중복.md"])
+
+
+def test_check_links_reports_dead_and_ambiguous(tmp_path):
+    (file_path,) = write_years(tmp_path, 2024)
+    for item in ["[[프로젝트 A#일정|일정]] 확인", "[[PA]] 회의", "[[중복]] 정리", "[[없는 문서]] 작성", "[[없는 문서]] 다시"]:
+        dailylog.add_item(tmp_path, datetime(2024, 3, 5), "회사", item)
+    write_note(tmp_path, "10_Projects/프로젝트 A.md", "---\naliases: PA\n---\n")
+    write_note(tmp_path, "20_Notes/중복.md")
+    write_note(tmp_path, "30_Other/중복.md")
+
+    records = json.loads(run_cli(tmp_path, "check-links", "--all", "--format", "json"))
+    # 문제 있는 링크 먼저
+    assert [(r["note"], r["status"], r["count"]) for r in records[:2]] == [("없는 문서", "dead", 2), ("중복", "ambiguous", 1)]
+    assert sorted((r["note"], r["status"], r["paths"]) for r in records[2:]) == [
+        ("PA", "alias", ["10_Projects/프로젝트 A.md"]), ("프로젝트 A", "ok", ["10_Projects/프로젝트 A.md"])]
+
+    text = run_cli(tmp_path, "check-links")
+    assert "**링크 대상**: 4개 중 없는 문서 1개, 대상이 여럿인 링크 1개" in text
+    assert "| [[없는 문서]] | 2 | 2024-03-05 |" in text
+    assert "| [[중복]] | 20_Notes/중복.md, 30_Other/중복.md | 2024-03-05 |" in text
+
+
+def test_stats_rejects_start_after_end(tmp_path):
+    pytest.importorskip("numpy")
+    write_years(tmp_path, 2024)
+
+    def stats(*args):
+        return subprocess.run([sys.executable, str(SCRIPT_PATH), "--vault", str(tmp_path), "stats", *args],
+                              capture_output=True, text=True, encoding="utf-8")
+
+    result = stats("--from", "2024-03-10", "--to", "2024-03-01")
+    assert (result.returncode, result.stdout) == (1, "오류: 시작일(2024-03-10)이 종료일(2024-03-01)보다 늦습니다.\n")
+    # 종료일 기본값(오늘)보다 늦은 시작일도 거부
+    result = stats("--from", "2999-01-01")
+    assert result.returncode == 1 and result.stdout.startswith("오류: 시작일(2999-01-01)이 종료일(")
+
+    result = stats("--from", "2024-03-01", "--to", "2024-03-10", "--format", "json")
+    assert result.returncode == 0
+    (record,) = json.loads(result.stdout)
+    assert (record["total_days"], record["active_days"], record["items"]) == (10, 1, 1)
+
+
+def test_search_query_words_use_index_word_pattern(tmp_path):
+    file_path = dailylog.get_dailylog_path(tmp_path, 2024)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(
+        make_day("2024-03-07", "목", "회의록 정리 [[프로젝트 A|A]]")
+        + make_day("2024-03-06", "수", "C++ 스터디"),
+        encoding="utf-8",
+    )
+
+    def search(query):
+        return [hit[4] for hit in dailylog.find_search_hits(tmp_path, query)]
+
+    for query in ["회의록, 정리", "정리!", "#정리", "(회의록)", "[[프로젝트 a]]"]:
+        assert search(query) == ["회의록 정리 [[프로젝트 A|A]]"], query
+    assert search("c++") == ["C++ 스터디"]
+    assert search("정리, 스터디") == []
+    with pytest.raises(ValueError):
+        search("?!")
@@ -5,44 +5,176 @@ VTT 자막 파일을 Obsidian 마크다운 문서로 변환하는 스크립트
 
 사용법:
     PYTHONIOENCODING=utf-8 uv run scripts/vtt_to_markdown.py <VTT파일경로> [--delete-vtt]
+    PYTHONIOENCODING=utf-8 uv run scripts/vtt_to_markdown.py <폴더|글롭> [...] [--delete-vtt] [--jobs N]
 
 옵션:
-    --delete-vtt: 변환 완료 후 원본 VTT 파일 삭제
+    --delete-vtt: 변환 완료 후 원본 VTT 파일 삭제 (일괄 변환에서는 성공한 파일만)
+    --jobs N: 일괄 변환 작업 프로세스 수 (기본값: 사용 가능한 CPU 코어 수)
+    --cache-ttl DAYS: 메타데이터 캐시 유효 기간 (기본값: 7일, 0이면 캐시 사용 안 함)
+    --refresh-metadata: 캐시를 무시하고 메타데이터를 다시 가져와 캐시 갱신
+    --clear-metadata-cache: 메타데이터 캐시 전체 삭제 (경로 없이 단독 실행 가능)
+
+폴더를 주면 그 안의 *.ko.vtt, *.en.vtt 파일을, 글롭("채널/**/*.vtt")을 주면 일치하는 VTT 파일을
+프로세스 풀에서 한꺼번에 변환하고 파일별 결과와 합계를 출력한다.
+
+yt-dlp 메타데이터는 영상 ID별로 캐시한다 ($VTT_TO_MARKDOWN_CACHE_DIR, 없으면
+$XDG_CACHE_HOME/vtt-to-markdown 또는 ~/.cache/vtt-to-markdown). 일괄 변환에서는 캐시에 없는
+영상을 yt-dlp 한 번 호출로 모두 조회한다.
 """
 
 import re
 import sys
 import io
+import os
 import json
+import glob
+import time
+import argparse
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from datetime import datetime
 
 # Windows 콘솔 인코딩 문제 해결
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
+# 메타데이터 캐시 폴더 환경 변수와 기본 유효 기간(일)
+CACHE_DIR_ENV = 'VTT_TO_MARKDOWN_CACHE_DIR'
+DEFAULT_CACHE_TTL_DAYS = 7
 
-def get_video_metadata(video_url):
-    """yt-dlp를 사용하여 YouTube 영상 메타데이터 가져오기"""
+
+def get_cache_dir():
+    """메타데이터 캐시 폴더 (환경 변수 > XDG_CACHE_HOME > ~/.cache)"""
+    if os.environ.get(CACHE_DIR_ENV):
+        return Path(os.environ[CACHE_DIR_ENV])
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'vtt-to-markdown'
+
+
+def get_video_id(video_url):
+    """영상 URL(https://www.youtube.com/watch?v=ID)에서 영상 ID 추출"""
+    return video_url.rsplit('v=', 1)[-1]
+
+
+def get_cache_path(video_id):
+    # 영상 ID는 [A-Za-z0-9_-]이지만 파일명에서 가져온 값이므로 안전한 문자만 남김
+    return get_cache_dir() / f"{re.sub(r'[^A-Za-z0-9_-]', '_', video_id)}.json"
+
+
+def load_cached_metadata(video_id, ttl_days):
+    """캐시된 메타데이터 (없거나 손상되었거나 유효 기간이 지났으면 None)"""
+    if ttl_days <= 0:
+        return None
+    try:
+        cached = json.loads(get_cache_path(video_id).read_text(encoding='utf-8'))
+        if time.time() - cached['fetched_at'] <= ttl_days * 86400:
+            return cached['metadata']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def save_cached_metadata(video_id, metadata):
+    """메타데이터를 캐시에 저장 (임시 파일 + rename, 실패는 무시)"""
+    cache_path = get_cache_path(video_id)
+    tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
     try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps({
+            'video_id': video_id,
+            'fetched_at': time.time(),
+            'metadata': metadata,
+        }, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"[경고] 메타데이터 캐시 저장 실패: {e}")
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def clear_metadata_cache():
+    """메타데이터 캐시 파일 전체 삭제 후 삭제한 개수 반환"""
+    count = 0
+    for cache_path in get_cache_dir().glob('*.json'):
+        try:
+            cache_path.unlink()
+            count += 1
+        except OSError:
+            pass
+    return count
+
+
+def fetch_video_metadata(video_urls):
+    """yt-dlp 한 번 호출로 여러 영상의 메타데이터 가져오기
+
+    반환: {영상 ID: 메타데이터}. 가져오지 못한 영상은 빠진다.
+    """
+    if not video_urls:
+        return {}
+    try:
+        # --ignore-errors: 일부 영상이 실패해도 나머지 결과는 한 줄에 하나씩 출력됨
+        # URL은 명령줄 길이 제한(Windows 약 32K자)을 넘지 않도록 --batch-file로 stdin에 넘김
         result = subprocess.run(
-            ['yt-dlp', '--dump-json', '--skip-download', video_url],
+            ['yt-dlp', '--dump-json', '--skip-download', '--ignore-errors', '--batch-file', '-'],
+            input='\n'.join(video_urls) + '\n',
             capture_output=True,
             text=True,
             encoding='utf-8'
         )
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return {
-                'title': data.get('title', ''),
-                'description': data.get('description', '')[:200] if data.get('description') else '',
-                'thumbnail': data.get('thumbnail', ''),
-                'channel': data.get('channel', ''),
-                'upload_date': data.get('upload_date', '')
-            }
     except Exception as e:
         print(f"[경고] 메타데이터 가져오기 실패: {e}")
-    return None
+        return {}
+
+    found = {}
+    for line in result.stdout.splitlines():
+        try:
+            data = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(data, dict) or not data.get('id'):
+            continue
+        found[data['id']] = {
+            'title': data.get('title', ''),
+            'description': data.get('description', '')[:200] if data.get('description') else '',
+            'thumbnail': data.get('thumbnail', ''),
+            'channel': data.get('channel', ''),
+            'upload_date': data.get('upload_date', '')
+        }
+    return found
+
+
+def resolve_video_metadata(video_urls, ttl_days=DEFAULT_CACHE_TTL_DAYS, refresh=False):
+    """여러 영상의 메타데이터를 캐시에서 찾고, 없는 영상만 yt-dlp 한 번으로 가져와 캐시에 저장
+
+    반환: ({영상 URL: 메타데이터 또는 None}, 캐시 적중 수, yt-dlp로 조회한 수)
+    """
+    resolved = {}
+    missing = []
+    video_urls = list(dict.fromkeys(video_urls))
+    for video_url in video_urls:
+        cached = None if refresh else load_cached_metadata(get_video_id(video_url), ttl_days)
+        if cached is not None:
+            resolved[video_url] = cached
+        else:
+            missing.append(video_url)
+
+    fetched = fetch_video_metadata(missing)
+    for video_url in missing:
+        video_id = get_video_id(video_url)
+        metadata = fetched.get(video_id)
+        if metadata is not None and ttl_days > 0:
+            save_cached_metadata(video_id, metadata)
+        resolved[video_url] = metadata
+
+    return resolved, len(video_urls) - len(missing), len(missing)
+
+
+def get_video_metadata(video_url, ttl_days=DEFAULT_CACHE_TTL_DAYS, refresh=False):
+    """yt-dlp를 사용하여 YouTube 영상 메타데이터 가져오기 (캐시 우선)"""
+    resolved, _, _ = resolve_video_metadata([video_url], ttl_days, refresh)
+    return resolved[video_url]
 
 
 def sanitize_yaml_string(text):
@@ -57,43 +189,64 @@ def sanitize_yaml_string(text):
     return text
 
 
-def parse_vtt_to_markdown(vtt_file_path):
-    """VTT 파일을 읽어서 마크다운 형식으로 변환"""
+def longest_overlap(prev_text, current_text):
+    """prev_text의 접미사이면서 current_text의 접두사인 가장 긴 문자열의 길이
+
+    KMP 실패 함수로 계산하므로 두 문자열 길이에 선형이다.
+    """
+    pattern = current_text
+    # 겹칠 수 있는 길이는 current_text 길이 이하이므로 prev_text의 끝부분만 비교
+    text = prev_text[-len(pattern):]
+
+    failure = [0] * len(pattern)
+    k = 0
+    for i in range(1, len(pattern)):
+        while k and pattern[i] != pattern[k]:
+            k = failure[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        failure[i] = k
+
+    k = 0
+    for char in text:
+        while k and (k == len(pattern) or char != pattern[k]):
+            k = failure[k - 1]
+        if char == pattern[k]:
+            k += 1
+    return k
+
 
+# 인라인 타임스탬프(<00:00:00.880>), <c> 태그, 연속 공백
+INLINE_TIMESTAMP_PATTERN = re.compile(r'<\d{2}:\d{2}:\d{2}\.\d{3}>')
+CUE_TAG_PATTERN = re.compile(r'</?c>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+CUE_TIME_PATTERN = re.compile(r'(\d{2}:\d{2}:\d{2}\.\d{3})')
+
+# 자막 내용으로 취급하지 않는 효과음/추임새
+SKIP_TEXTS = ('[음악]', '[Music]', 'Ah.', '[박수]', '[Applause]')
+
+
+def read_vtt_lines(vtt_file_path):
+    """VTT 파일을 한 줄씩 읽어 앞뒤 공백을 제거해 반환"""
     with open(vtt_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+        for line in f:
+            yield line.strip()
 
-    lines = content.split('\n')
 
-    # 자막 엔트리 파싱
-    entries = []
+def iter_cues(lines):
+    """줄을 자막 큐 단위로 모아 (시작 시각, 텍스트 줄 목록) 반환"""
     current_time = None
     current_text = []
 
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-
+    for line in lines:
         # 타임스탬프 라인 감지
         if ' --> ' in line:
-            # 이전 엔트리 저장
+            # 이전 엔트리 반환
             if current_time and current_text:
-                text = ' '.join(current_text)
-                # 인라인 타임스탬프 제거 (<00:00:00.880> 형태)
-                text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}>', '', text)
-                # <c> 태그 제거
-                text = re.sub(r'</?c>', '', text)
-                # 공백 정리
-                text = re.sub(r'\s+', ' ', text).strip()
-
-                if text and text not in ['[음악]', '[Music]', 'Ah.', '[박수]', '[Applause]']:
-                    entries.append({
-                        'time': current_time,
-                        'text': text
-                    })
+                yield current_time, current_text
 
             # 새로운 타임스탬프 파싱
-            time_match = re.match(r'(\d{2}:\d{2}:\d{2}\.\d{3})', line)
+            time_match = CUE_TIME_PATTERN.match(line)
             if time_match:
                 current_time = time_match.group(1)
                 current_text = []
@@ -102,22 +255,36 @@ def parse_vtt_to_markdown(vtt_file_path):
         elif line and not line.startswith('WEBVTT') and not line.startswith('Kind:') and not line.startswith('Language:') and 'align:start' not in line:
             current_text.append(line)
 
-        i += 1
-
-    # 마지막 엔트리 저장
+    # 마지막 엔트리 반환
     if current_time and current_text:
-        text = ' '.join(current_text)
-        text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}>', '', text)
-        text = re.sub(r'</?c>', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        if text and text not in ['[음악]', '[Music]', 'Ah.', '[박수]', '[Applause]']:
-            entries.append({
-                'time': current_time,
+        yield current_time, current_text
+
+
+def iter_entries(cues):
+    """큐 텍스트에서 태그를 제거하고 효과음 등을 걸러 {'time', 'text'} 엔트리로 반환"""
+    for time, text_lines in cues:
+        text = ' '.join(text_lines)
+        # 인라인 타임스탬프 제거 (<00:00:00.880> 형태)
+        text = INLINE_TIMESTAMP_PATTERN.sub('', text)
+        # <c> 태그 제거
+        text = CUE_TAG_PATTERN.sub('', text)
+        # 공백 정리
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
+
+        if text and text not in SKIP_TEXTS:
+            yield {
+                'time': time,
                 'text': text
-            })
+            }
+
 
-    # 중복 제거 및 텍스트 병합
-    cleaned_entries = []
+def dedup_entries(entries):
+    """롤링 자막의 중복 제거 및 텍스트 병합
+
+    다음 엔트리가 직전 엔트리를 포함하면 직전 엔트리를 대체하므로,
+    마지막 엔트리 하나를 들고 있다가 다음 엔트리가 확정되면 반환한다.
+    """
+    pending = None
     prev_text = None
 
     for entry in entries:
@@ -129,7 +296,7 @@ def parse_vtt_to_markdown(vtt_file_path):
 
         # 이전 텍스트가 현재 텍스트에 완전히 포함되면, 현재 텍스트로 대체
         if prev_text and prev_text in current_text:
-            cleaned_entries[-1] = entry
+            pending = entry
             prev_text = current_text
             continue
 
@@ -137,31 +304,43 @@ def parse_vtt_to_markdown(vtt_file_path):
         if prev_text and current_text in prev_text:
             continue
 
-        # 부분 중복 제거
+        # 부분 중복 제거 (이전 텍스트 끝과 현재 텍스트 앞이 5자 이상 겹치면 겹친 부분 제거)
         if prev_text:
-            max_overlap = min(len(prev_text), len(current_text))
-            overlap_found = False
-
-            for overlap_len in range(max_overlap, 4, -1):
-                if prev_text[-overlap_len:] == current_text[:overlap_len]:
-                    new_text = current_text[overlap_len:].strip()
-                    if new_text:
-                        cleaned_entries.append({
-                            'time': entry['time'],
-                            'text': new_text
-                        })
-                        prev_text = new_text
-                    overlap_found = True
-                    break
-
-            if not overlap_found:
-                cleaned_entries.append(entry)
+            # 5자 이상 겹치려면 현재 텍스트의 앞 5자가 이전 텍스트 끝부분에 있어야 하므로 먼저 확인
+            tail = prev_text[-len(current_text):]
+            overlap_len = longest_overlap(tail, current_text) if current_text[:5] in tail else 0
+
+            if overlap_len >= 5:
+                new_text = current_text[overlap_len:].strip()
+                if new_text:
+                    if pending:
+                        yield pending
+                    pending = {
+                        'time': entry['time'],
+                        'text': new_text
+                    }
+                    prev_text = new_text
+            else:
+                if pending:
+                    yield pending
+                pending = entry
                 prev_text = current_text
         else:
-            cleaned_entries.append(entry)
+            if pending:
+                yield pending
+            pending = entry
             prev_text = current_text
 
-    return cleaned_entries
+    if pending:
+        yield pending
+
+
+def parse_vtt_to_markdown(vtt_file_path):
+    """VTT 파일을 읽어서 중복을 제거한 자막 엔트리를 순서대로 반환 (제너레이터)
+
+    파일 전체를 메모리에 올리지 않고 줄 단위로 읽으며 엔트리가 확정되는 대로 반환한다.
+    """
+    return dedup_entries(iter_entries(iter_cues(read_vtt_lines(vtt_file_path))))
 
 
 def format_timestamp(timestamp):
@@ -213,8 +392,8 @@ image: {thumbnail}
 ```"""
 
 
-def create_markdown(entries, video_url, video_title, metadata=None, lang='ko'):
-    """마크다운 문서 생성"""
+def write_markdown(out, entries, video_url, video_title, metadata=None, lang='ko'):
+    """마크다운 문서를 out에 바로 쓰고 자막 엔트리 수 반환 (entries는 제너레이터여도 됨)"""
 
     now = datetime.now().strftime('%Y-%m-%d')
 
@@ -222,7 +401,7 @@ def create_markdown(entries, video_url, video_title, metadata=None, lang='ko'):
 
     lang_text = "한국어" if lang == 'ko' else "영어 (번역 필요)"
 
-    markdown = f"""---
+    out.write(f"""---
 생성일: {now}
 마지막수정일: {now}
 ---
@@ -237,81 +416,253 @@ def create_markdown(entries, video_url, video_title, metadata=None, lang='ko'):
 
 ## 자막 내용
 
-"""
+""")
 
+    count = 0
     for entry in entries:
         time_formatted = format_timestamp(entry['time'])
-        markdown += f"**[{time_formatted}]** {entry['text']}\n\n"
+        out.write(f"**[{time_formatted}]** {entry['text']}\n\n")
+        count += 1
 
-    markdown += """---
+    out.write("""---
 
 **태그**: #유튜브 #자막
-"""
+""")
 
-    return markdown
+    return count
 
 
-def main():
-    # 커맨드라인 인자 확인
-    if len(sys.argv) < 2:
-        print("[오류] VTT 파일 경로를 지정해주세요.")
-        print("사용법: PYTHONIOENCODING=utf-8 uv run scripts/vtt_to_markdown.py <VTT파일경로> [--delete-vtt]")
-        sys.exit(1)
+def convert_vtt_file(vtt_file_path, delete_vtt=False, verbose=True, metadata_options=None, metadata=None):
+    """VTT 파일 하나를 같은 폴더의 마크다운 파일로 변환하고 결과 요약 반환
 
-    vtt_file_path = Path(sys.argv[1])
-    delete_vtt = '--delete-vtt' in sys.argv
-
-    if not vtt_file_path.exists():
-        print(f"[오류] 파일을 찾을 수 없습니다: {vtt_file_path}")
-        sys.exit(1)
+    verbose=False이면 진행 메시지를 출력하지 않는다 (일괄 변환의 작업 프로세스).
+    metadata_options({'ttl_days', 'refresh'})를 주면 메타데이터를 직접 가져오고,
+    없으면 미리 가져온 metadata를 사용한다.
+    """
+    log = print if verbose else (lambda *args: None)
+    started = time.perf_counter()
 
     # 비디오 정보 추출
     video_url, video_title, lang = extract_video_info(vtt_file_path.name)
 
     if not video_url:
-        print("[경고] 비디오 URL을 추출할 수 없습니다. 파일명을 제목으로 사용합니다.")
+        log("[경고] 비디오 URL을 추출할 수 없습니다. 파일명을 제목으로 사용합니다.")
         video_url = ""
 
-    print(f"[시작] VTT 파일 파싱 중: {vtt_file_path.name}")
-    print(f"       제목: {video_title}")
-    print(f"       URL: {video_url}")
-    print(f"       언어: {lang}")
+    log(f"[시작] VTT 파일 파싱 중: {vtt_file_path.name}")
+    log(f"       제목: {video_title}")
+    log(f"       URL: {video_url}")
+    log(f"       언어: {lang}")
 
     # 메타데이터 가져오기
-    metadata = None
-    if video_url:
-        print("[정보] YouTube 메타데이터 가져오는 중...")
-        metadata = get_video_metadata(video_url)
+    if video_url and metadata_options is not None:
+        log("[정보] YouTube 메타데이터 가져오는 중...")
+        metadata = get_video_metadata(video_url, **metadata_options)
         if metadata:
-            print(f"       채널: {metadata.get('channel', 'N/A')}")
+            log(f"       채널: {metadata.get('channel', 'N/A')}")
 
-    # VTT 파싱
-    entries = parse_vtt_to_markdown(vtt_file_path)
-    print(f"[완료] 총 {len(entries)}개의 자막 엔트리 파싱 완료")
-
-    # 마크다운 생성
-    markdown = create_markdown(entries, video_url, video_title, metadata, lang)
-
-    # 출력 파일 (같은 폴더에 저장)
+    # VTT 파싱과 마크다운 생성을 한 번에 (엔트리를 모아두지 않고 출력 파일에 바로 씀)
+    # 도중에 실패하면 반쪽짜리 문서가 남지 않도록 임시 파일에 쓴 뒤 이름을 바꿈
     output_file = vtt_file_path.parent / f"{video_title}.md"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(markdown)
+    tmp_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            count = write_markdown(f, parse_vtt_to_markdown(vtt_file_path), video_url, video_title, metadata, lang)
+        os.replace(tmp_file, output_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+    log(f"[완료] 총 {count}개의 자막 엔트리 파싱 완료")
 
-    print(f"[완료] 마크다운 파일 생성: {output_file.name}")
-    print(f"       위치: {output_file.parent}")
+    log(f"[완료] 마크다운 파일 생성: {output_file.name}")
+    log(f"       위치: {output_file.parent}")
 
     # VTT 파일 삭제
+    deleted = False
+    delete_error = None
     if delete_vtt:
         try:
             vtt_file_path.unlink()
-            print(f"[삭제] VTT 파일 삭제됨: {vtt_file_path.name}")
+            deleted = True
+            log(f"[삭제] VTT 파일 삭제됨: {vtt_file_path.name}")
         except Exception as e:
-            print(f"[오류] VTT 파일 삭제 실패: {e}")
+            delete_error = str(e)
+            log(f"[오류] VTT 파일 삭제 실패: {e}")
+
+    return {
+        'file': str(vtt_file_path),
+        'output': str(output_file),
+        'lang': lang,
+        'entries': count,
+        'metadata': metadata is not None,
+        'deleted': deleted,
+        'delete_error': delete_error,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def available_cpu_count():
+    """현재 프로세스가 사용할 수 있는 CPU 코어 수 (CPU affinity/cgroup cpuset 반영)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def convert_vtt_task(vtt_file_path, delete_vtt, metadata):
+    """VTT 파일 하나를 변환 (작업 프로세스에서 실행, 실패하면 'error'가 든 결과 반환)"""
+    try:
+        return convert_vtt_file(Path(vtt_file_path), delete_vtt, verbose=False, metadata=metadata)
+    except Exception as e:
+        return {'file': str(vtt_file_path), 'error': str(e)}
+
+
+def expand_vtt_paths(patterns):
+    """폴더/글롭/파일 경로를 VTT 파일 목록으로 확장 (중복 제거, 이름순)"""
+    paths = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            paths.update(path.glob('*.ko.vtt'))
+            paths.update(path.glob('*.en.vtt'))
+        elif path.is_file():
+            paths.add(path)
+        else:
+            # Windows 셸은 글롭을 펼치지 않으므로 직접 확장
+            paths.update(Path(p) for p in glob.glob(pattern, recursive=True) if p.endswith('.vtt'))
+    return sorted(paths)
+
+
+def convert_batch(vtt_file_paths, delete_vtt, jobs, metadata_options):
+    """VTT 파일 여러 개를 프로세스 풀에서 변환하고 파일별 결과와 합계 출력
+
+    메타데이터는 작업 프로세스를 띄우기 전에 캐시와 yt-dlp 한 번 호출로 모두 가져온다.
+    같은 영상의 ko/en 자막처럼 같은 마크다운 파일로 변환되는 VTT가 여럿이면 한국어 자막 하나만
+    변환하고 나머지는 덮어쓰지 않도록 건너뛴다 (VTT 삭제도 하지 않음).
+    반환: 실패한 파일 수
+    """
+    groups = {}
+    for vtt_file_path in vtt_file_paths:
+        video_url, video_title, lang = extract_video_info(vtt_file_path.name)
+        groups.setdefault(vtt_file_path.parent / f"{video_title}.md", []).append((lang != 'ko', vtt_file_path, video_url))
+
+    tasks = {}
+    skipped = []
+    for output_path, group in groups.items():
+        _, vtt_file_path, video_url = min(group)
+        tasks[str(vtt_file_path)] = video_url
+        skipped.extend((path, output_path, vtt_file_path) for _, path, _ in group if path != vtt_file_path)
+
+    jobs = max(1, min(jobs, len(tasks)))
+    print(f"[시작] VTT 파일 {len(vtt_file_paths)}개 변환 (작업 프로세스 {jobs}개)")
+    started = time.perf_counter()
+
+    for path, output_path, kept in sorted(skipped):
+        print(f"[건너뜀] {path.name}: {kept.name}와(과) 같은 파일({output_path.name})로 변환되므로 변환/삭제하지 않음")
+    video_urls = {path: video_url for path, video_url in tasks.items() if video_url}
+
+    resolved, cache_hits, fetched = resolve_video_metadata(list(video_urls.values()), **metadata_options)
+    metadata_by_file = {path: resolved[video_url] for path, video_url in video_urls.items()}
+    if video_urls:
+        print(f"[정보] 메타데이터: 캐시 {cache_hits}개, yt-dlp 조회 {fetched}개"
+              f"{' (1회 호출)' if fetched else ''}, 실패 {sum(1 for m in resolved.values() if m is None)}개")
+
+    # 결과는 입력 순서대로 출력 (앞 파일이 끝나는 대로 차례로 출력)
+    order = {str(path): i for i, path in enumerate(vtt_file_paths)}
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [(path, pool.submit(convert_vtt_task, path, delete_vtt, metadata_by_file.get(path)))
+                   for path in sorted(tasks, key=order.get)]
+        for path, future in futures:
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # 작업 프로세스 하나가 죽으면 풀 전체가 멈추므로 남은 파일은 변환되지 않음 (VTT도 그대로)
+                result = {'file': path, 'error': "작업 프로세스가 비정상 종료되어 변환하지 못함"}
+            results.append(result)
+            name = Path(result['file']).name
+            if 'error' in result:
+                print(f"[실패] {name}: {result['error']}")
+                continue
+            notes = [f"{result['entries']}개 엔트리", f"{result['seconds']:.1f}초"]
+            if not result['metadata']:
+                notes.append("메타데이터 없음")
+            if result['deleted']:
+                notes.append("VTT 삭제")
+            elif result['delete_error']:
+                notes.append(f"VTT 삭제 실패: {result['delete_error']}")
+            print(f"[완료] {name} -> {Path(result['output']).name} ({', '.join(notes)})")
+
+    succeeded = [r for r in results if 'error' not in r]
+    failed = len(results) - len(succeeded)
+    print(f"[합계] {len(vtt_file_paths)}개 파일: 성공 {len(succeeded)}, 실패 {failed}, 건너뜀 {len(skipped)}, "
+          f"자막 엔트리 {sum(r['entries'] for r in succeeded)}개, "
+          f"VTT 삭제 {sum(1 for r in succeeded if r['deleted'])}개 ({time.perf_counter() - started:.1f}초)")
+
+    english = [r for r in succeeded if r['lang'] == 'en']
+    if english:
+        print(f"\n[안내] 영어 자막 {len(english)}개는 Claude에게 번역을 요청하세요:")
+        for result in english:
+            print(f"       '이 문서를 한국어로 번역해줘: {result['output']}'")
+
+    return failed
+
+
+def main():
+    # 커맨드라인 인자 확인
+    if len(sys.argv) < 2:
+        print("[오류] VTT 파일 경로를 지정해주세요.")
+        print("사용법: PYTHONIOENCODING=utf-8 uv run scripts/vtt_to_markdown.py <VTT파일경로> [--delete-vtt]")
+        sys.exit(1)
 
-    # 영어 자막인 경우 번역 안내
-    if lang == 'en':
-        print("\n[안내] 영어 자막입니다. Claude에게 번역을 요청하세요:")
-        print(f"       '이 문서를 한국어로 번역해줘: {output_file}'")
+    parser = argparse.ArgumentParser(description="VTT 자막 파일을 Obsidian 마크다운 문서로 변환")
+    parser.add_argument('paths', nargs='*', help="VTT 파일, 폴더(*.ko.vtt, *.en.vtt) 또는 글롭")
+    parser.add_argument('--delete-vtt', action='store_true', help="변환 완료 후 원본 VTT 파일 삭제")
+    parser.add_argument('--jobs', '-j', type=int, default=available_cpu_count(),
+                        help="일괄 변환 작업 프로세스 수 (기본값: 사용 가능한 CPU 코어 수)")
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_CACHE_TTL_DAYS, metavar='DAYS',
+                        help=f"메타데이터 캐시 유효 기간(일) (기본값: {DEFAULT_CACHE_TTL_DAYS}, 0이면 캐시 사용 안 함)")
+    parser.add_argument('--refresh-metadata', action='store_true',
+                        help="캐시를 무시하고 메타데이터를 다시 가져와 캐시 갱신")
+    parser.add_argument('--clear-metadata-cache', action='store_true',
+                        help=f"메타데이터 캐시 전체 삭제 ({get_cache_dir()})")
+    args = parser.parse_args()
+
+    if args.clear_metadata_cache:
+        print(f"[삭제] 메타데이터 캐시 {clear_metadata_cache()}개 삭제됨: {get_cache_dir()}")
+        if not args.paths:
+            return
+    elif not args.paths:
+        parser.error("VTT 파일 경로를 지정해주세요.")
+
+    metadata_options = {'ttl_days': args.cache_ttl, 'refresh': args.refresh_metadata}
+
+    # 파일 하나: 기존과 같은 상세 출력 (파일명의 "[영상ID]"는 글롭 문자이므로 실제 파일인지 먼저 확인)
+    single = args.paths[0]
+    if len(args.paths) == 1 and (Path(single).is_file() or not (Path(single).is_dir() or glob.has_magic(single))):
+        vtt_file_path = Path(args.paths[0])
+
+        if not vtt_file_path.exists():
+            print(f"[오류] 파일을 찾을 수 없습니다: {vtt_file_path}")
+            sys.exit(1)
+
+        result = convert_vtt_file(vtt_file_path, args.delete_vtt, metadata_options=metadata_options)
+
+        # 영어 자막인 경우 번역 안내
+        if result['lang'] == 'en':
+            print("\n[안내] 영어 자막입니다. Claude에게 번역을 요청하세요:")
+            print(f"       '이 문서를 한국어로 번역해줘: {result['output']}'")
+        return
+
+    vtt_file_paths = expand_vtt_paths(args.paths)
+    if not vtt_file_paths:
+        if len(args.paths) == 1 and single.endswith('.vtt'):
+            print(f"[오류] 파일을 찾을 수 없습니다: {single}")
+        else:
+            print(f"[오류] 변환할 VTT 파일을 찾을 수 없습니다: {' '.join(args.paths)}")
+        sys.exit(1)
+
+    if convert_batch(vtt_file_paths, args.delete_vtt, args.jobs, metadata_options):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
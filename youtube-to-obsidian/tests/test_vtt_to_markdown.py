@@ -0,0 +1,280 @@
+"""vtt_to_markdown.py 테스트 (uv run --with pytest pytest youtube-to-obsidian/tests)
+
+fixtures/*.vtt는 롤링 자막 예제이고, 같은 이름의 .md는 KMP 겹침 계산 도입 전 스크립트의 출력이다.
+yt-dlp는 PATH 앞에 둔 가짜 스크립트로 바꿔 호출 인자와 stdin을 기록한다.
+"""
+
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).resolve().parent.parent / "scripts" / "vtt_to_markdown.py"
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+METADATA = {
+    'title': '테스트 영상',
+    'description': '설명: "따옴표"',
+    'thumbnail': 'https://i.ytimg.com/vi/x/maxresdefault.jpg',
+    'channel': '채널',
+    'upload_date': '20250101',
+}
+
+
+def load_module():
+    # 스크립트가 import 시 sys.stdout을 UTF-8로 다시 감싸므로 임시 stdout으로 바꿔 두고 로드
+    real_stdout = sys.stdout
+    sys.stdout = io.TextIOWrapper(io.BytesIO())
+    try:
+        spec = importlib.util.spec_from_file_location("vtt_to_markdown", SCRIPT_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.stdout = real_stdout
+    return module
+
+
+vtt_to_markdown = load_module()
+convert_vtt_task = vtt_to_markdown.convert_vtt_task
+
+STUB_YT_DLP = f"""#!{sys.executable}
+import json, os, sys
+urls = [line.strip() for line in sys.stdin if line.strip()] if sys.argv[-2:] == ['--batch-file', '-'] else []
+with open(os.environ['STUB_YT_DLP_LOG'], 'a', encoding='utf-8') as f:
+    f.write(json.dumps({{'args': sys.argv[1:], 'urls': urls}}) + '\\n')
+for url in urls:
+    video_id = url.rsplit('v=', 1)[-1]
+    if video_id.startswith('bad'):
+        print(f'ERROR: {{video_id}} unavailable', file=sys.stderr)
+        continue
+    print(json.dumps({{'id': video_id, 'title': 'T ' + video_id, 'description': 'd',
+                      'thumbnail': 'th', 'channel': '채널 ' + video_id, 'upload_date': '20250101'}}))
+"""
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 1, 2, 3, 4, 5)
+
+
+@pytest.mark.parametrize("vtt_path", sorted(FIXTURES_DIR.glob("*.vtt")), ids=lambda p: p.name)
+def test_golden_markdown(vtt_path, monkeypatch):
+    monkeypatch.setattr(vtt_to_markdown, "datetime", FixedDatetime)
+    video_url, video_title, lang = vtt_to_markdown.extract_video_info(vtt_path.name)
+
+    out = io.StringIO()
+    vtt_to_markdown.write_markdown(out, vtt_to_markdown.parse_vtt_to_markdown(vtt_path),
+                                   video_url, video_title, METADATA, lang)
+
+    expected = vtt_path.with_name(vtt_path.name[:-len(".vtt")] + ".md").read_bytes()
+    assert out.getvalue().encode("utf-8") == expected
+
+
+def test_longest_overlap_matches_brute_force():
+    def brute_force(prev_text, current_text):
+        for length in range(min(len(prev_text), len(current_text)), 0, -1):
+            if prev_text.endswith(current_text[:length]):
+                return length
+        return 0
+
+    rnd = random.Random(0)
+    for _ in range(2000):
+        prev_text = "".join(rnd.choice("ab하 ") for _ in range(rnd.randint(0, 30)))
+        current_text = "".join(rnd.choice("ab하 ") for _ in range(rnd.randint(1, 30)))
+        assert vtt_to_markdown.longest_overlap(prev_text, current_text) == brute_force(prev_text, current_text)
+
+
+@pytest.fixture
+def yt_dlp_calls(tmp_path, monkeypatch):
+    """가짜 yt-dlp를 PATH 앞에 두고, 호출 기록({'args', 'urls'} 목록)을 읽는 함수를 반환"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    stub = bin_dir / "yt-dlp"
+    stub.write_text(STUB_YT_DLP, encoding="utf-8")
+    stub.chmod(0o755)
+    log_path = tmp_path / "yt-dlp.log"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("STUB_YT_DLP_LOG", str(log_path))
+    monkeypatch.setenv("VTT_TO_MARKDOWN_CACHE_DIR", str(tmp_path / "cache"))
+
+    def calls():
+        if not log_path.exists():
+            return []
+        return [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    return calls
+
+
+def run_script(*args):
+    return subprocess.run([sys.executable, str(SCRIPT_PATH), *map(str, args)],
+                          capture_output=True, text=True, encoding="utf-8")
+
+
+def copy_fixture(work_dir, name):
+    """롤링 자막 예제를 name(.vtt)으로 복사"""
+    target = work_dir / name
+    target.write_bytes((FIXTURES_DIR / "롤링 자막 [roll0001].ko.vtt").read_bytes())
+    return target
+
+
+def test_expand_vtt_paths(tmp_path):
+    for name in ["a [id1].ko.vtt", "b [id2].en.vtt", "c [id3].vtt", "memo.txt", "sub/d [id4].ko.vtt"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("WEBVTT\n", encoding="utf-8")
+
+    expand = vtt_to_markdown.expand_vtt_paths
+    # 폴더는 바로 아래의 *.ko.vtt, *.en.vtt만
+    assert expand([tmp_path]) == [tmp_path / "a [id1].ko.vtt", tmp_path / "b [id2].en.vtt"]
+    assert expand([str(tmp_path / "**" / "*.vtt")]) == [
+        tmp_path / "a [id1].ko.vtt", tmp_path / "b [id2].en.vtt", tmp_path / "c [id3].vtt",
+        tmp_path / "sub" / "d [id4].ko.vtt"]
+    # 파일과 폴더가 겹쳐도 한 번만
+    assert expand([tmp_path / "a [id1].ko.vtt", tmp_path]) == [tmp_path / "a [id1].ko.vtt", tmp_path / "b [id2].en.vtt"]
+    assert expand([str(tmp_path / "*.md")]) == []
+
+
+def test_batch_skips_english_duplicate_and_deletes_converted(tmp_path, yt_dlp_calls):
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    ko_vtt = copy_fixture(work_dir, "영상 [vid0001].ko.vtt")
+    en_vtt = copy_fixture(work_dir, "영상 [vid0001].en.vtt")
+    other_vtt = copy_fixture(work_dir, "다른 영상 [vid0002].en.vtt")
+
+    result = run_script(work_dir, "--delete-vtt", "--jobs", 2)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert f"[건너뜀] {en_vtt.name}: {ko_vtt.name}와(과) 같은 파일(영상.md)로 변환되므로" in result.stdout
+    assert "성공 2, 실패 0, 건너뜀 1" in result.stdout
+    # 한국어 자막으로 변환하고, 변환한 VTT만 삭제 (건너뛴 영어 자막은 남김)
+    assert "- **언어**: 한국어 (자동 생성 자막)" in (work_dir / "영상.md").read_text(encoding="utf-8")
+    assert (work_dir / "다른 영상.md").exists()
+    assert not ko_vtt.exists() and not other_vtt.exists()
+    assert en_vtt.exists()
+    # 메타데이터는 변환할 영상 두 개만 yt-dlp 한 번 호출로
+    assert [sorted(call["urls"]) for call in yt_dlp_calls()] == [[
+        "https://www.youtube.com/watch?v=vid0001", "https://www.youtube.com/watch?v=vid0002"]]
+
+
+def test_batch_reports_failures_in_input_order(tmp_path, yt_dlp_calls):
+    names = [f"{i:02d} 영상 [vid{i:04d}].ko.vtt" for i in range(8)]
+    for name in names:
+        copy_fixture(tmp_path, name)
+    # UTF-8이 아닌 파일은 그 파일만 실패하고 VTT도 남음
+    (tmp_path / names[3]).write_bytes(b"WEBVTT\n\n00:00:00.000 --> 00:00:01.000\n\xff\xfe\n")
+
+    result = run_script(tmp_path, "--delete-vtt", "--jobs", 4)
+
+    assert result.returncode == 1
+    reported = [line.split(" ", 1)[1].split(":", 1)[0].split(" -> ")[0]
+                for line in result.stdout.splitlines() if line.startswith(("[완료]", "[실패]"))]
+    assert reported == names
+    assert f"[실패] {names[3]}:" in result.stdout
+    assert "성공 7, 실패 1, 건너뜀 0" in result.stdout
+    assert (tmp_path / names[3]).exists()
+    assert not (tmp_path / "03 영상.md").exists()
+    assert all(not (tmp_path / name).exists() for i, name in enumerate(names) if i != 3)
+
+
+def crashing_task(vtt_file_path, delete_vtt, metadata):
+    # 작업 프로세스가 예외 없이 죽는 경우 (OOM kill 등)
+    if "crash" in Path(vtt_file_path).name:
+        os._exit(1)
+    return convert_vtt_task(vtt_file_path, delete_vtt, metadata)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="테스트 모듈의 함수를 작업 프로세스에 넘기려면 fork가 필요")
+def test_batch_survives_crashed_worker(tmp_path, yt_dlp_calls, monkeypatch, capsys):
+    paths = [copy_fixture(tmp_path, name)
+             for name in ["a [vid0001].ko.vtt", "b crash [vid0002].ko.vtt", "c [vid0003].ko.vtt"]]
+    monkeypatch.setattr(vtt_to_markdown, "convert_vtt_task", crashing_task)
+
+    failed = vtt_to_markdown.convert_batch(paths, True, 1, {'ttl_days': 7, 'refresh': False})
+
+    out = capsys.readouterr().out
+    assert "Traceback" not in out
+    assert f"[실패] {paths[1].name}: 작업 프로세스가 비정상 종료되어 변환하지 못함" in out
+    assert f"[실패] {paths[2].name}: 작업 프로세스가 비정상 종료되어 변환하지 못함" in out
+    assert failed >= 2
+    assert "[합계] 3개 파일" in out
+    # 변환하지 못한 파일의 VTT는 그대로
+    assert paths[1].exists() and paths[2].exists()
+
+
+def test_metadata_cache_hit_and_ttl_expiry(tmp_path, yt_dlp_calls):
+    vtt_path = copy_fixture(tmp_path, "영상 [vid0001].ko.vtt")
+    cache_path = tmp_path / "cache" / "vid0001.json"
+
+    assert run_script(vtt_path).returncode == 0
+    assert run_script(vtt_path).returncode == 0
+    # 두 번째 변환은 캐시 사용, URL은 명령줄이 아니라 stdin(--batch-file -)으로
+    assert yt_dlp_calls() == [{
+        'args': ['--dump-json', '--skip-download', '--ignore-errors', '--batch-file', '-'],
+        'urls': ["https://www.youtube.com/watch?v=vid0001"]}]
+    assert "title: T vid0001" in (tmp_path / "영상.md").read_text(encoding="utf-8")
+
+    # 유효 기간(기본 7일)이 지나면 다시 조회해 캐시 갱신
+    cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    cached['fetched_at'] -= 8 * 86400
+    cache_path.write_text(json.dumps(cached), encoding="utf-8")
+    assert run_script(vtt_path, "--cache-ttl", 10).returncode == 0
+    assert len(yt_dlp_calls()) == 1
+    assert run_script(vtt_path).returncode == 0
+    assert len(yt_dlp_calls()) == 2
+    assert json.loads(cache_path.read_text(encoding="utf-8"))['fetched_at'] > cached['fetched_at']
+
+    # --cache-ttl 0이면 캐시를 읽지 않음
+    assert run_script(vtt_path, "--cache-ttl", 0).returncode == 0
+    assert len(yt_dlp_calls()) == 3
+
+
+def test_metadata_cache_invalidation(tmp_path, yt_dlp_calls):
+    vtt_path = copy_fixture(tmp_path, "영상 [vid0001].ko.vtt")
+    assert run_script(vtt_path).returncode == 0
+    assert len(yt_dlp_calls()) == 1
+
+    assert run_script(vtt_path, "--refresh-metadata").returncode == 0
+    assert len(yt_dlp_calls()) == 2
+
+    result = run_script("--clear-metadata-cache")
+    assert result.returncode == 0
+    assert "[삭제] 메타데이터 캐시 1개 삭제됨" in result.stdout
+    assert list((tmp_path / "cache").glob("*.json")) == []
+    assert len(yt_dlp_calls()) == 2
+
+    assert run_script(vtt_path).returncode == 0
+    assert len(yt_dlp_calls()) == 3
+
+
+def test_batch_fetches_missing_metadata_in_one_call(tmp_path, yt_dlp_calls):
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    cached_vtt = copy_fixture(work_dir, "캐시 [vid0001].ko.vtt")
+    assert run_script(cached_vtt).returncode == 0
+    for i in range(2, 40):
+        copy_fixture(work_dir, f"영상 {i} [vid{i:04d}].ko.vtt")
+    copy_fixture(work_dir, "없는 영상 [bad0001].ko.vtt")
+
+    result = run_script(work_dir)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    calls = yt_dlp_calls()
+    assert len(calls) == 2
+    # 캐시에 없는 영상만, 한 번의 호출로 stdin에 한 줄씩
+    assert "--batch-file" in calls[1]['args'] and not any("youtube.com" in arg for arg in calls[1]['args'])
+    assert sorted(calls[1]['urls']) == sorted(
+        [f"https://www.youtube.com/watch?v=vid{i:04d}" for i in range(2, 40)]
+        + ["https://www.youtube.com/watch?v=bad0001"])
+    assert "[정보] 메타데이터: 캐시 1개, yt-dlp 조회 39개 (1회 호출), 실패 1개" in result.stdout
+    assert "[완료] 없는 영상 [bad0001].ko.vtt -> 없는 영상.md (" in result.stdout
+    assert "메타데이터 없음" in result.stdout
+    # 가져오지 못한 영상은 캐시하지 않음
+    assert not (tmp_path / "cache" / "bad0001.json").exists()
+    assert (tmp_path / "cache" / "vid0039.json").exists()